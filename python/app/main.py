@@ -1,23 +1,47 @@
 import asyncio
 import os
+from contextlib import asynccontextmanager
+
+import uvicorn
 from mcp.server.fastmcp import FastMCP
 from dotenv import load_dotenv
 
 from app.tools.market import set_tools as set_upbit_tools
-from app.tools.analyze import set_tools as set_analyze_tools, analyze_blockchain_mareket
+from app.tools.market.lifespan import upstream_lifespan, upstream_resources
+from app.tools.analyze import set_tools as set_analyze_tools
 
 # load .env file
 load_dotenv()
 
-mcp = FastMCP("Bit scope", stateless_http=True)
+mcp = FastMCP("Bit scope", stateless_http=True, lifespan=upstream_lifespan)
 set_upbit_tools(mcp)
 set_analyze_tools(mcp)
 
-if __name__ == "__main__":
-    asyncio.run(analyze_blockchain_mareket(market_code="KRW-ETH"))
-    # mode = os.getenv("MODE", "stdio")
+async def serve(mode: str) -> None:
+    """
+    서버 실행
+
+    업비트 연동 자원은 전송 계층이 떠 있는 동안 유지하고, 종료할 때 정리합니다
+    (stateless HTTP에서는 FastMCP lifespan이 요청마다 실행되어 종료 시점을 알 수 없음).
+    """
+    if mode == "stdio":
+        async with upstream_resources():
+            await mcp.run_stdio_async()
+        return
+
+    app = mcp.streamable_http_app()
+    session_lifespan = app.router.lifespan_context
 
-    # if mode == "stdio":
-    #     mcp.run(transport="stdio")
-    # else:
-    #     mcp.run(transport="streamable-http")
\ No newline at end of file
+    @asynccontextmanager
+    async def lifespan(app):
+        async with upstream_resources(), session_lifespan(app):
+            yield
+
+    app.router.lifespan_context = lifespan
+    config = uvicorn.Config(
+        app, host=mcp.settings.host, port=mcp.settings.port, log_level=mcp.settings.log_level.lower()
+    )
+    await uvicorn.Server(config).serve()
+
+if __name__ == "__main__":
+    asyncio.run(serve(os.getenv("MODE", "stdio")))
@@ -0,0 +1,56 @@
+from dataclasses import fields
+from operator import itemgetter
+from typing import Callable, Dict, Literal, Tuple, Type, TypeVar, get_args, get_origin
+
+S = TypeVar("S", bound="UpbitSchema")
+
+# 스키마 클래스 → (필드 값 추출 함수, 필드별 허용 타입)
+_factories: Dict[type, Tuple[Callable[[dict], tuple], Tuple[tuple, ...]]] = {}
+
+# 필드 타입 → 변환 없이 그대로 쓸 수 있는 값 타입 (JSON 숫자는 소수점이 없으면 int로 옴, bool은 받지 않음)
+_ACCEPTED_TYPES = {float: (float, int), int: (int,), str: (str,)}
+
+class UpbitSchema:
+    """
+    업비트 응답 스키마 공통 기반 (frozen·slots dataclass용)
+
+    slots dataclass는 인스턴스마다 __dict__를 두지 않아 수천 개의 캔들을 보관해도 메모리가 적게 들고,
+    frozen이라 캐시에서 여러 호출자가 같은 객체를 공유해도 안전합니다.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls: Type[S], data: dict) -> S:
+        raise NotImplementedError
+
+    @classmethod
+    def from_upbit(cls: Type[S], data: dict) -> S:
+        """
+        업비트 응답 딕셔너리에서 빠르게 생성
+
+        모든 필드가 있고 값 타입이 필드 타입과 맞으면 (업비트 JSON 응답) 필드별 변환 없이
+        값을 그대로 __init__에 넘기고, 그렇지 않으면 (누락, null, 문자열 숫자 등)
+        from_dict로 필드마다 안전하게 변환합니다.
+        """
+        factory = _factories.get(cls)
+        if factory is None:
+            factory = _factories[cls] = _create_factory(cls)
+        getter, types = factory
+        try:
+            values = getter(data)
+        except KeyError:
+            return cls.from_dict(data)
+        for value, accepted in zip(values, types):
+            if type(value) not in accepted:
+                return cls.from_dict(data)
+        return cls(*values)
+
+def _accepted_types(field_type) -> tuple:
+    """필드 타입 → 빠른 생성에서 그대로 쓸 값 타입 (Literal은 값의 타입, 정해지지 않은 타입은 항상 from_dict)"""
+    if get_origin(field_type) is Literal:
+        return tuple({type(value) for value in get_args(field_type)})
+    return _ACCEPTED_TYPES.get(field_type, ())
+
+def _create_factory(cls: type) -> Tuple[Callable[[dict], tuple], Tuple[tuple, ...]]:
+    names = [field.name for field in fields(cls)]
+    return itemgetter(*names), tuple(_accepted_types(field.type) for field in fields(cls))
@@ -1,6 +1,40 @@
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Union
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from app.schemas.base import UpbitSchema
+
+# 모든 캔들 공통 수치 컬럼
+CANDLE_PRICE_FIELDS = (
+    "opening_price",
+    "high_price",
+    "low_price",
+    "trade_price",
+    "candle_acc_trade_price",
+    "candle_acc_trade_volume",
+)
+# 일봉에만 있는 수치 컬럼
+DAILY_EXTRA_FIELDS = ("prev_closing_price", "change_price", "change_rate")
+
+KST_OFFSET_MS = 9 * 60 * 60 * 1000
+
+@lru_cache(maxsize=4096)
+def parse_candle_datetime(text: str) -> datetime:
+    """캔들 시각 문자열 → datetime (같은 문자열은 한 번만 파싱)"""
+    return datetime.fromisoformat(text)
+
+def is_ascending(times: np.ndarray) -> bool:
+    """시각 배열이 오름차순인지 (O(n) 비교, 정렬 없음)"""
+    return len(times) < 2 or bool((times[1:] >= times[:-1]).all())
+
+def format_epoch_ms(times: np.ndarray, offset_ms: int = 0) -> np.ndarray:
+    """epoch 밀리초 배열 → 업비트 캔들 시각 문자열 배열 ('YYYY-MM-DDTHH:MM:SS')"""
+    return np.datetime_as_string((times + offset_ms).astype("datetime64[ms]"), unit="s")
 
 def safe_float(value: Any, default: float = 0.0) -> float:
     """None이나 빈 값을 안전하게 float로 변환"""
@@ -20,8 +54,8 @@ def safe_int(value: Any, default: int = 0) -> int:
     except (ValueError, TypeError):
         return default
 
-@dataclass
-class MinuteCandleStick:
+@dataclass(frozen=True, slots=True)
+class MinuteCandleStick(UpbitSchema):
     market: str
     candle_date_time_utc: str
     candle_date_time_kst: str
@@ -52,14 +86,14 @@ class MinuteCandleStick:
 
     def get_utc_datetime(self) -> datetime:
         """UTC 시간을 datetime 객체로 반환"""
-        return datetime.fromisoformat(self.candle_date_time_utc.replace('Z', '+00:00'))
+        return parse_candle_datetime(self.candle_date_time_utc)
     
     def get_kst_datetime(self) -> datetime:
         """KST 시간을 datetime 객체로 반환"""
-        return datetime.fromisoformat(self.candle_date_time_kst.replace('Z', '+00:00'))
+        return parse_candle_datetime(self.candle_date_time_kst)
 
-@dataclass
-class DailyCandleStick:
+@dataclass(frozen=True, slots=True)
+class DailyCandleStick(UpbitSchema):
     market: str
     candle_date_time_utc: str
     candle_date_time_kst: str
@@ -94,14 +128,14 @@ class DailyCandleStick:
 
     def get_utc_datetime(self) -> datetime:
         """UTC 시간을 datetime 객체로 반환"""
-        return datetime.fromisoformat(self.candle_date_time_utc.replace('Z', '+00:00'))
+        return parse_candle_datetime(self.candle_date_time_utc)
     
     def get_kst_datetime(self) -> datetime:
         """KST 시간을 datetime 객체로 반환"""
-        return datetime.fromisoformat(self.candle_date_time_kst.replace('Z', '+00:00'))
+        return parse_candle_datetime(self.candle_date_time_kst)
 
-@dataclass
-class WeeklyCandleStick:
+@dataclass(frozen=True, slots=True)
+class WeeklyCandleStick(UpbitSchema):
     market: str
     candle_date_time_utc: str
     candle_date_time_kst: str
@@ -132,12 +166,125 @@ class WeeklyCandleStick:
 
     def get_utc_datetime(self) -> datetime:
         """UTC 시간을 datetime 객체로 반환"""
-        return datetime.fromisoformat(self.candle_date_time_utc.replace('Z', '+00:00'))
+        return parse_candle_datetime(self.candle_date_time_utc)
     
     def get_kst_datetime(self) -> datetime:
         """KST 시간을 datetime 객체로 반환"""
-        return datetime.fromisoformat(self.candle_date_time_kst.replace('Z', '+00:00'))
+        return parse_candle_datetime(self.candle_date_time_kst)
     
     def get_first_day_datetime(self) -> datetime:
         """주 시작일을 datetime 객체로 반환"""
-        return datetime.fromisoformat(self.first_day_of_period)
\ No newline at end of file
+        return parse_candle_datetime(self.first_day_of_period)
+
+@dataclass(frozen=True, slots=True, eq=False)
+class CandleBatch:
+    """
+    캔들 시계열의 열 지향(struct-of-arrays) 표현 (시간순)
+
+    캔들마다 객체를 만들지 않고 컬럼마다 연속된 NumPy 배열 하나를 둡니다.
+    MCP 도구와 분석 파이프라인이 같은 표현을 쓰며, NumPy 컬럼과 pandas DataFrame으로 복사 없이 바꿀 수 있습니다.
+    시간축은 int64 epoch 값이고, KST 시각이나 문자열은 출력에 필요할 때만 만듭니다.
+
+    - candle_time: 캔들 시작 시각 (UTC epoch 밀리초, int64)
+    - opening_price, high_price, low_price, trade_price: 시가, 고가, 저가, 종가 (float64)
+    - candle_acc_trade_price, candle_acc_trade_volume: 누적 거래대금, 누적 거래량 (float64)
+    - extras: 캔들 단위별 추가 컬럼 (일봉의 prev_closing_price, change_price, change_rate)
+    """
+    candle_time: np.ndarray
+    opening_price: np.ndarray
+    high_price: np.ndarray
+    low_price: np.ndarray
+    trade_price: np.ndarray
+    candle_acc_trade_price: np.ndarray
+    candle_acc_trade_volume: np.ndarray
+    extras: Dict[str, np.ndarray] = field(default_factory=dict)
+    market: str = ''
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray], market: str = '') -> 'CandleBatch':
+        """컬럼 딕셔너리(candle_time + 수치 컬럼) → CandleBatch (배열을 그대로 사용)"""
+        known = ("candle_time", *CANDLE_PRICE_FIELDS)
+        return cls(
+            *(columns[name] for name in known),
+            extras={name: values for name, values in columns.items() if name not in known},
+            market=sys.intern(market)
+        )
+
+    @classmethod
+    def from_upbit(cls, data: List[dict], extra_fields: Sequence[str] = (), market: str = '') -> 'CandleBatch':
+        """
+        업비트 캔들 응답(최신순) → CandleBatch
+
+        역순으로 읽어 채우면 정렬 없이 시간순 배열이 됩니다. 순서가 어긋난 입력일 때만 정렬합니다.
+        행마다 dataclass나 딕셔너리를 만들지 않고 필드별로 연속된 배열을 바로 채웁니다.
+        """
+        n = len(data)
+        columns = {
+            # ISO 문자열은 NumPy가 C 레벨에서 일괄 파싱
+            "candle_time": np.fromiter(
+                (row["candle_date_time_utc"] for row in reversed(data)), dtype="datetime64[ms]", count=n
+            ).view(np.int64)
+        }
+        for name in (*CANDLE_PRICE_FIELDS, *extra_fields):
+            columns[name] = np.fromiter((row.get(name) or 0.0 for row in reversed(data)), dtype=np.float64, count=n)
+        if not is_ascending(columns["candle_time"]):
+            order = np.argsort(columns["candle_time"], kind="stable")
+            columns = {name: values[order] for name, values in columns.items()}
+        return cls.from_columns(columns, market or (data[0].get("market", '') if data else ''))
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, market: str = '') -> 'CandleBatch':
+        """to_frame 형식 DataFrame → CandleBatch (가능하면 DataFrame의 배열을 그대로 사용)"""
+        columns = {"candle_time": frame["candle_date_time_utc"].to_numpy(dtype="datetime64[ms]").view(np.int64)}
+        for name in frame.columns:
+            if name not in ("candle_date_time_utc", "candle_date_time_kst"):
+                columns[name] = frame[name].to_numpy()
+        return cls.from_columns(columns, market)
+
+    def __len__(self) -> int:
+        return len(self.candle_time)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """컬럼 이름 → NumPy 배열 (복사 없음)"""
+        columns = {"candle_time": self.candle_time}
+        columns.update((name, getattr(self, name)) for name in CANDLE_PRICE_FIELDS)
+        columns.update(self.extras)
+        return columns
+
+    def tail(self, count: int) -> 'CandleBatch':
+        """최신 캔들 count개 (원본 배열의 뷰)"""
+        start = max(0, len(self) - count)
+        return CandleBatch.from_columns({name: values[start:] for name, values in self.columns().items()}, self.market)
+
+    def kst_times(self) -> np.ndarray:
+        """캔들 시작 시각 (KST, datetime64)"""
+        return (self.candle_time + KST_OFFSET_MS).view("datetime64[ms]")
+
+    def utc_strings(self) -> np.ndarray:
+        """candle_date_time_utc 형식 문자열 배열"""
+        return format_epoch_ms(self.candle_time)
+
+    def kst_strings(self) -> np.ndarray:
+        """candle_date_time_kst 형식 문자열 배열"""
+        return format_epoch_ms(self.candle_time, KST_OFFSET_MS)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        분석용 DataFrame (복사 없음)
+
+        candle_date_time_utc는 candle_time을 datetime64로 본 뷰이고, 수치 컬럼은 배열을 그대로 씁니다.
+        KST 시각은 kst_times()로 필요할 때 만듭니다.
+        """
+        if len(self) == 0:
+            return pd.DataFrame()
+
+        frame = {"candle_date_time_utc": self.candle_time.view("datetime64[ms]")}
+        frame.update((name, values) for name, values in self.columns().items() if name != "candle_time")
+        return pd.DataFrame(frame, copy=False)
+
+    def to_dict(self, count: Optional[int] = None) -> Dict[str, Any]:
+        """MCP 응답용 열 지향 딕셔너리 (컬럼 이름 → 값 리스트, 시간순)"""
+        batch = self.tail(count) if count is not None else self
+        result: Dict[str, Any] = {"market": batch.market}
+        result.update((name, values.tolist()) for name, values in batch.columns().items())
+        return result
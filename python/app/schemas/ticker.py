@@ -1,9 +1,13 @@
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Literal
 
-@dataclass
-class Ticker:
+from app.schemas.base import UpbitSchema
+
+KST = timezone(timedelta(hours=9))
+
+@dataclass(frozen=True, slots=True)
+class Ticker(UpbitSchema):
     market: str
     trade_date: str
     trade_time: str
@@ -64,13 +68,18 @@ class Ticker:
         )
     
     def get_trade_datetime(self) -> datetime:
-        """거래 시간을 datetime 객체로 반환"""
+        """거래 시간을 datetime 객체로 반환 (UTC, tzinfo 없음)"""
+        if self.trade_timestamp:
+            # 문자열을 다시 파싱하지 않고 epoch 밀리초에서 바로 계산 (초 단위)
+            return datetime.fromtimestamp(self.trade_timestamp // 1000, timezone.utc).replace(tzinfo=None)
         date_str = f"{self.trade_date[:4]}-{self.trade_date[4:6]}-{self.trade_date[6:8]}"
         time_str = f"{self.trade_time[:2]}:{self.trade_time[2:4]}:{self.trade_time[4:6]}"
         return datetime.fromisoformat(f"{date_str}T{time_str}")
     
     def get_trade_datetime_kst(self) -> datetime:
         """한국 시간 거래 시간을 datetime 객체로 반환"""
+        if self.trade_timestamp:
+            return datetime.fromtimestamp(self.trade_timestamp // 1000, KST)
         date_str = f"{self.trade_date_kst[:4]}-{self.trade_date_kst[4:6]}-{self.trade_date_kst[6:8]}"
         time_str = f"{self.trade_time_kst[:2]}:{self.trade_time_kst[2:4]}:{self.trade_time_kst[4:6]}"
         return datetime.fromisoformat(f"{date_str}T{time_str}+09:00")
@@ -1,26 +1,47 @@
-import traceback
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 import pandas as pd
 import numpy as np
 import asyncio
+import hashlib
+import json
 import logging
 import math
+import time
 
-from app.tools.market import get_current_ticker, get_candles_for_daily, get_candles_for_minutes, get_candles_for_weekly
+from app.tools.market import get_current_ticker
+from app.tools.market.backend import analysis_cache_key, get_cache_backend
+from app.tools.market.candles import CANDLE_PAGE_SIZE, DAY_INTERVAL, MAX_CANDLE_COUNT, WEEK_INTERVAL, minute_interval
+from app.tools.market.columnar import fetch_candle_batch, upstream_max_age
+from app.tools.market.resample import resample_columns
+from app.tools.market.swr import SWR_FRESH_TTL, SWR_MAX_STALE, get_swr_cache, ticker_key
 from app.schemas.ticker import Ticker
-from app.schemas.candle import MinuteCandleStick, DailyCandleStick, WeeklyCandleStick
+from app.schemas.candle import CandleBatch, MinuteCandleStick, DailyCandleStick, WeeklyCandleStick
+
+# 분석 함수가 직접 참조하는 고정 구간 (캔들 개수)
+VOLUME_CHANGE_WINDOW = 48  # 24시간 거래량 변화율 (30분봉 24개 × 2)
+VOLATILITY_WINDOW = 30     # 30일 변동성, 지지/저항선
+CROSSOVER_LOOKBACK = 30    # 이동평균 교차 탐색 구간
+SHORT_TREND_WINDOW = 4
+MEDIUM_TREND_WINDOW = 7
+LONG_TREND_WINDOW = 8
+
+# EMA 초기값의 영향이 이 비율 아래로 줄어들 때까지를 warm-up 구간으로 봄
+EMA_WARMUP_TOLERANCE = 1e-3
+
+# 분석 결과 캐시 보관 시간(초), 현재가가 담기므로 캔들 캐시의 진행 중인 캔들과 같은 시간만 보관
+ANALYSIS_CACHE_TTL = SWR_FRESH_TTL
 
 @dataclass
 class AnalysisConfig:
     """분석 설정 클래스"""
     
-    # 데이터 수집 설정
-    daily_count: int = 200
-    minute_count: int = 48
+    # 데이터 수집 설정 (None이면 지표 기간에서 필요한 개수를 계산, plan_fetch 참고)
+    daily_count: Optional[int] = None
+    minute_count: Optional[int] = None
     minute_interval: int = 30
-    weekly_count: int = 8
+    weekly_count: Optional[int] = None
     
     # 이동평균 설정
     ma_short: int = 20
@@ -50,6 +71,76 @@ class AnalysisConfig:
     volume_ema_period: int = 20
     volume_trend_period: int = 5
 
+@dataclass(frozen=True)
+class FetchPlan:
+    """시간대별로 조회할 캔들 개수"""
+    daily_count: int
+    minute_count: int
+    weekly_count: int
+    # 주봉을 업비트에서 받지 않고 일봉에서 묶을지 여부
+    derive_weekly: bool
+
+def ema_warmup(span: int) -> int:
+    """span EMA의 초기값 영향이 EMA_WARMUP_TOLERANCE 아래로 줄어드는 데 필요한 캔들 수"""
+    alpha = 2 / (span + 1)
+    if alpha >= 1:
+        return 1
+    return math.ceil(math.log(EMA_WARMUP_TOLERANCE) / math.log(1 - alpha))
+
+def plan_fetch(config: AnalysisConfig) -> FetchPlan:
+    """
+    분석 설정의 지표 기간에서 시간대별 최소 캔들 개수 계산
+
+    - 일봉: 이동평균(최장 기간, 교차 탐색 구간), RSI, MACD(EMA warm-up 포함), 스토캐스틱,
+      볼린저 밴드, ATR, 거래량 EMA, 30일 변동성 중 가장 긴 구간
+    - 분봉: 24시간 거래량 변화율, 단기 추세
+    - 주봉: 장기 추세
+
+    설정에 개수를 직접 지정한 시간대는 그 값을 그대로 씁니다.
+    주봉 구간을 일봉으로 덮어도 일봉 페이지 수가 늘지 않으면 주봉은 일봉에서 묶습니다.
+    """
+    daily_need = max(
+        config.ma_long,
+        max(config.ma_short, config.ma_medium) + CROSSOVER_LOOKBACK,
+        # diff 1개 + 직전 RSI 비교 1개
+        config.rsi_period + 2,
+        # MACD 선 warm-up 뒤 시그널 EMA warm-up, 히스토그램 직전 값 비교
+        ema_warmup(config.macd_slow) + ema_warmup(config.macd_signal) + 1,
+        config.stoch_k_period + config.stoch_d_period,
+        config.bb_period,
+        config.atr_period + 1,
+        ema_warmup(config.volume_ema_period),
+        config.volume_trend_period,
+        VOLATILITY_WINDOW,
+        MEDIUM_TREND_WINDOW,
+    )
+    minute_need = max(VOLUME_CHANGE_WINDOW, SHORT_TREND_WINDOW)
+    weekly_need = LONG_TREND_WINDOW
+
+    daily_count = config.daily_count or daily_need
+    minute_count = config.minute_count or minute_need
+    weekly_count = config.weekly_count or weekly_need
+
+    # 진행 중인 주 + 앞쪽 잘린 주를 위해 1주 여유
+    covering = (weekly_count + 1) * 7
+    pages = math.ceil(daily_count / CANDLE_PAGE_SIZE)
+    derive_weekly = covering <= daily_count or (
+        config.daily_count is None and math.ceil(covering / CANDLE_PAGE_SIZE) <= pages
+    )
+    if derive_weekly:
+        daily_count = max(daily_count, covering)
+
+    return FetchPlan(
+        daily_count=min(daily_count, MAX_CANDLE_COUNT),
+        minute_count=min(minute_count, MAX_CANDLE_COUNT),
+        weekly_count=min(weekly_count, MAX_CANDLE_COUNT),
+        derive_weekly=derive_weekly
+    )
+
+def config_digest(config: AnalysisConfig) -> str:
+    """분석 설정 해시 (분석 결과 캐시 키용)"""
+    return hashlib.sha1(json.dumps(asdict(config), sort_keys=True).encode()).hexdigest()[:16]
+
 @dataclass
 class MarketData:
     """시장 데이터 컨테이너"""
@@ -58,50 +149,8 @@ class MarketData:
     minute_df: pd.DataFrame
     weekly_df: pd.DataFrame
     ticker: Ticker
-
-def safe_dataclass_to_dataframe(data_list: List, dataclass_type=None) -> pd.DataFrame:
-    """
-    안전한 dataclass → DataFrame 변환 (시간순 정렬로 수정)
-    
-    Args:
-        data_list: dataclass 객체들의 리스트
-        dataclass_type: dataclass 타입 (빈 리스트 처리용)
-    
-    Returns:
-        pandas DataFrame (시간순 정렬)
-    """
-    if not data_list:
-        return pd.DataFrame()
-    
-    try:
-        # PR에서 제안한 __dict__ 방식 사용 (성능 최적화)
-        df = pd.DataFrame([item.__dict__ for item in data_list])
-        
-        # 날짜 컬럼 최적화
-        date_columns = ['candle_date_time_utc', 'candle_date_time_kst']
-        for col in date_columns:
-            if col in df.columns:
-                df[col] = pd.to_datetime(df[col], errors='coerce')
-        
-        # ⚠️ 핵심 수정: 기술적 지표 계산을 위해 시간순 정렬 (과거→현재)
-        if 'candle_date_time_utc' in df.columns:
-            df = df.sort_values('candle_date_time_utc', ascending=True)
-        
-        return df.reset_index(drop=True)
-        
-    except Exception as e:
-        logging.error(f"DataFrame 변환 실패 (__dict__ 방식): {e}")
-        # 폴백: asdict 방식
-        try:
-            from dataclasses import asdict
-            df = pd.DataFrame([asdict(item) for item in data_list])
-            if 'candle_date_time_utc' in df.columns:
-                df['candle_date_time_utc'] = pd.to_datetime(df['candle_date_time_utc'], errors='coerce')
-                df = df.sort_values('candle_date_time_utc', ascending=True)
-            return df.reset_index(drop=True)
-        except Exception as e2:
-            logging.error(f"DataFrame 변환 완전 실패: {e2}")
-            return pd.DataFrame()
+    # 가장 오래된 입력 데이터의 나이(초), 업비트 장애 시 마지막 정상 데이터를 쓰면 커짐
+    data_age: float = 0.0
 
 async def load_market_data(config: AnalysisConfig = None, market_code: str = 'KRW-BTC') -> MarketData:
     """
@@ -113,28 +162,39 @@ async def load_market_data(config: AnalysisConfig = None, market_code: str = 'KR
     if config is None:
         config = AnalysisConfig()
     
-    logging.info("시장 데이터 로드 시작 (병렬 처리)")
+    # 지표 기간에서 필요한 만큼만 조회 (200개 초과 시 페이지 병렬 조회)
+    plan = plan_fetch(config)
+    logging.info(f"시장 데이터 로드 시작 (병렬 처리): {plan}")
     start_time = datetime.now()
     
-    # 병렬로 모든 데이터 로드 (핵심 최적화 포인트)
-    daily_task = get_candles_for_daily(count=config.daily_count, market_code=market_code)
-    minute_task = get_candles_for_minutes(
-        minutes=config.minute_interval, 
-        count=config.minute_count,
-        market_code=market_code
-    )
-    weekly_task = get_candles_for_weekly(count=config.weekly_count, market_code=market_code)
-    ticker_task = get_current_ticker(market_code=market_code)
+    # 업비트가 느리거나 장애여도 마지막 정상 데이터로 바로 응답하고 백그라운드에서 갱신
+    swr = get_swr_cache()
     
-    # 4개 API를 동시에 호출
-    daily_candles, minute_candles, weekly_candles, ticker = await asyncio.gather(
-        daily_task, minute_task, weekly_task, ticker_task
-    )
+    def candles(interval, count):
+        return swr.get((market_code, interval.name, count), lambda: fetch_candle_batch(interval, market_code, count))
     
-    # DataFrame 변환 (1번만 수행) - 이제 시간순으로 정렬됨
-    daily_df = safe_dataclass_to_dataframe(daily_candles, DailyCandleStick)
-    minute_df = safe_dataclass_to_dataframe(minute_candles, MinuteCandleStick)
-    weekly_df = safe_dataclass_to_dataframe(weekly_candles, WeeklyCandleStick)
+    # 병렬로 모든 데이터 로드 (핵심 최적화 포인트)
+    daily_task = candles(DAY_INTERVAL, plan.daily_count)
+    minute_task = candles(minute_interval(config.minute_interval), plan.minute_count)
+    ticker_task = swr.get(ticker_key(market_code), lambda: get_current_ticker(market_code=market_code))
+    
+    # 일봉이 주봉 구간을 모두 덮으면 주봉은 일봉에서 직접 묶어 업비트 호출을 줄임
+    if plan.derive_weekly:
+        results = await asyncio.gather(daily_task, minute_task, ticker_task)
+        (daily_batch, _), (minute_batch, _), (ticker, _) = results
+        weekly_batch = CandleBatch.from_columns(
+            resample_columns(daily_batch.columns(), DAY_INTERVAL, WEEK_INTERVAL, plan.weekly_count), market_code
+        )
+    else:
+        weekly_task = candles(WEEK_INTERVAL, plan.weekly_count)
+        results = await asyncio.gather(daily_task, minute_task, weekly_task, ticker_task)
+        (daily_batch, _), (minute_batch, _), (weekly_batch, _), (ticker, _) = results
+    data_age = max(age for _, age in results)
+    
+    # CandleBatch → DataFrame (시간순 배열을 복사 없이 그대로 사용)
+    daily_df = daily_batch.to_frame()
+    minute_df = minute_batch.to_frame()
+    weekly_df = weekly_batch.to_frame()
     
     load_time = (datetime.now() - start_time).total_seconds()
     logging.info(f"데이터 로드 완료: {load_time:.2f}초")
@@ -144,9 +204,31 @@ async def load_market_data(config: AnalysisConfig = None, market_code: str = 'KR
         daily_df=daily_df,
         minute_df=minute_df,
         weekly_df=weekly_df,
-        ticker=ticker
+        ticker=ticker,
+        data_age=data_age
     )
 
+def json_default(value: Any) -> Any:
+    """JSON으로 바로 쓸 수 없는 값 변환 (NumPy 값은 파이썬 값, 그 밖에는 문자열)"""
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    return str(value)
+
+def data_freshness(age: float) -> Dict[str, Any]:
+    """
+    데이터 신선도 정보
+
+    age는 응답 캐시(SWR)에서 본 나이이고, 그 아래 캔들/티커 캐시가 값을 더 보관했을 수 있으므로
+    max_age_seconds에 upstream_max_age()만큼 더해 상한을 함께 알려 줌.
+    SWR_MAX_STALE 이내의 값은 백그라운드 갱신 중인 정상 응답이므로, 그보다 오래된 값
+    (갱신이 실패해 마지막 정상 데이터로 응답한 경우)만 stale로 표시
+    """
+    return {
+        "age_seconds": round(age, 1),
+        "max_age_seconds": round(age + upstream_max_age(), 1),
+        "stale": age > SWR_MAX_STALE
+    }
+
 def calculate_market_info(data: MarketData, config: AnalysisConfig) -> Dict[str, Any]:
     """시장 정보 계산"""
     try:
@@ -177,13 +259,14 @@ def calculate_market_info(data: MarketData, config: AnalysisConfig) -> Dict[str,
 
 def calculate_volume_change(minute_df: pd.DataFrame) -> float:
     """24시간 거래량 변화율 계산 (시간순 정렬 기준으로 수정)"""
-    if len(minute_df) < 48:
+    if len(minute_df) < VOLUME_CHANGE_WINDOW:
         return 0.0
     
     try:
         # 시간순 정렬이므로 최근 24개는 뒤쪽에 있음
-        recent_volume = minute_df['candle_acc_trade_volume'].tail(24).sum()
-        previous_volume = minute_df['candle_acc_trade_volume'].iloc[-48:-24].sum()
+        half = VOLUME_CHANGE_WINDOW // 2
+        recent_volume = minute_df['candle_acc_trade_volume'].tail(half).sum()
+        previous_volume = minute_df['candle_acc_trade_volume'].iloc[-VOLUME_CHANGE_WINDOW:-half].sum()
         
         if previous_volume > 0:
             return round(((recent_volume - previous_volume) / previous_volume) * 100, 2)
@@ -193,13 +276,13 @@ def calculate_volume_change(minute_df: pd.DataFrame) -> float:
 
 def calculate_daily_volatility(daily_df: pd.DataFrame) -> float:
     """30일 연간화 변동성 계산 (시간순 정렬 기준으로 수정)"""
-    if len(daily_df) < 30:
+    if len(daily_df) < VOLATILITY_WINDOW:
         return 0.0
     
     try:
         returns = []
         # 시간순이므로 최근 30일은 뒤쪽에서 가져옴
-        recent_30_days = daily_df.tail(30)
+        recent_30_days = daily_df.tail(VOLATILITY_WINDOW)
         
         for i in range(1, len(recent_30_days)):
             yesterday_price = recent_30_days['trade_price'].iloc[i-1]
@@ -220,9 +303,9 @@ def calculate_trend_analysis(data: MarketData, config: AnalysisConfig) -> Dict[s
     """추세 분석 계산 (시간순 정렬 기준으로 수정)"""
     try:
         # 각 시간대별 추세 분석 (최근 데이터는 tail로 가져옴)
-        short_term = analyze_short_term_trend(data.minute_df.tail(4))
-        medium_term = analyze_medium_term_trend(data.daily_df.tail(7))
-        long_term = analyze_long_term_trend(data.weekly_df.tail(8))
+        short_term = analyze_short_term_trend(data.minute_df.tail(SHORT_TREND_WINDOW))
+        medium_term = analyze_medium_term_trend(data.daily_df.tail(MEDIUM_TREND_WINDOW))
+        long_term = analyze_long_term_trend(data.weekly_df.tail(LONG_TREND_WINDOW))
         
         # 추세 강도 및 지속 기간
         trend_strength = calculate_trend_strength(short_term, medium_term, long_term)
@@ -377,7 +460,7 @@ def calculate_price_levels(data: MarketData, config: AnalysisConfig) -> Dict[str
     """가격 레벨 계산"""
     try:
         current_price = data.ticker.trade_price
-        daily_df = data.daily_df.tail(30)  # 최근 30일
+        daily_df = data.daily_df.tail(VOLATILITY_WINDOW)  # 최근 30일
         
         # 지지선과 저항선 계산
         support_resistance = calculate_support_resistance(daily_df, current_price)
@@ -545,7 +628,7 @@ def calculate_moving_averages(df: pd.DataFrame, config: AnalysisConfig) -> Dict[
 def analyze_ma_crossovers(df: pd.DataFrame, config: AnalysisConfig) -> List[Dict[str, Any]]:
     """이동평균 교차 분석 - 시간순 정렬 기준으로 수정"""
     crossovers = []
-    lookback = min(30, len(df))
+    lookback = min(CROSSOVER_LOOKBACK, len(df))
     
     if lookback < 2:
         return crossovers
@@ -893,9 +976,9 @@ async def analyze_blockchain_mareket(config: Optional[AnalysisConfig] = None, ma
     
     📊 **수집하는 데이터**:
     - 실시간 블로체인 가격 및 거래량
-    - 일봉 데이터 (최대 200개)
-    - 30분봉 데이터 (최대 48개, 24시간)
-    - 주봉 데이터 (최대 8개)
+    - 일봉 데이터 (기본 200개, 설정한 지표 기간에 맞춰 자동 계산)
+    - 30분봉 데이터 (48개, 24시간)
+    - 주봉 데이터 (8개, 가능하면 일봉에서 계산)
     
     🔍 **분석 항목**:
     1. **시장 정보 (market_info)**:
@@ -956,6 +1039,11 @@ async def analyze_blockchain_mareket(config: Optional[AnalysisConfig] = None, ma
                 "momentum": {...},           # 모멘텀 지표 (RSI, MACD, 스토캐스틱)
                 "volatility": {...},         # 변동성 지표 (볼린저밴드, ATR)
                 "volume": {...}              # 거래량 지표 (OBV, 거래량 추세)
+            },
+            "data_freshness": {
+                "age_seconds": float,        # 분석에 쓴 데이터의 나이(초, 응답 캐시 기준)
+                "max_age_seconds": float,    # 업비트에서 받은 뒤 최대 나이(초, 하위 캐시 보관 시간 포함)
+                "stale": bool                # 업비트 장애로 갱신하지 못해 이전 데이터를 사용했는지 여부
             }
         }
     
@@ -985,6 +1073,20 @@ async def analyze_blockchain_mareket(config: Optional[AnalysisConfig] = None, ma
     if config is None:
         config = AnalysisConfig()
     
+    # 같은 설정의 분석은 마지막 확정 분봉이 바뀌기 전까지 캐시 백엔드를 통해 서버 간에 공유
+    backend = get_cache_backend()
+    interval = minute_interval(config.minute_interval)
+    cache_key = analysis_cache_key(
+        market_code, config_digest(config), interval, interval.floor(time.time()) - interval.seconds
+    )
+    cached = await backend.get(cache_key)
+    if cached is not None:
+        entry = json.loads(cached)
+        result = entry["result"]
+        age = result["data_freshness"]["age_seconds"] + max(0.0, time.time() - entry["cached_at"])
+        result["data_freshness"] = data_freshness(age)
+        return result
+    
     try:
         start_time = datetime.now()
         
@@ -1014,17 +1116,25 @@ async def analyze_blockchain_mareket(config: Optional[AnalysisConfig] = None, ma
         analysis_time = (datetime.now() - start_time).total_seconds()
         logging.info(f"전체 분석 완료: {analysis_time:.2f}초")
         
-        return {
+        result = {
             "market_info": market_info,
             "trend_analysis": trend_analysis,
             "price_levels": price_levels,
-            "technical_signals": technical_signals
+            "technical_signals": technical_signals,
+            "data_freshness": data_freshness(market_data.data_age)
         }
         
     except Exception as e:
-        traceback.print_exc()
-        logging.error(f"시장 분석 실패: {e}")
+        logging.exception(f"시장 분석 실패 ({market_code}): {e}")
         raise
+    
+    # 캐시 저장 실패는 다음 호출의 캐시 미스일 뿐이므로 분석 결과는 그대로 반환
+    entry = {"cached_at": time.time(), "result": result}
+    try:
+        await backend.set(cache_key, json.dumps(entry, default=json_default).encode(), ANALYSIS_CACHE_TTL)
+    except Exception as e:
+        logging.warning(f"분석 결과 캐시 저장 실패 ({market_code}): {e!r}")
+    return result
 
 # MCP 도구 등록 함수 (기존 코드와 호환성 유지)
 def set_tools(mcp):
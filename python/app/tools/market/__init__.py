@@ -0,0 +1,162 @@
+import asyncio
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.resources import Resource
+from dataclasses import dataclass
+from typing import List, Optional
+from datetime import datetime
+
+# from app.main import mcp
+from app.schemas.candle import CandleBatch, MinuteCandleStick, DailyCandleStick, WeeklyCandleStick
+from app.schemas.ticker import Ticker
+from app.tools.market.batch import get_ticker_batcher
+from app.tools.market.cache import get_candle_cache
+from app.tools.market.candles import DAY_INTERVAL, WEEK_INTERVAL, interval_by_name, minute_interval
+from app.tools.market.catalog import get_market_catalog
+from app.tools.market.columnar import fetch_candle_batch
+from app.tools.market.resample import base_interval, fetch_resampled_columns, resampled_interval
+from app.tools.market.shared import get_shared_cache
+from app.tools.market.stream import get_ticker_stream
+
+async def get_current_ticker(market_code: str = 'KRW-BTC') -> Ticker:
+    """
+    Get the current ticker of Block chain in KRW from Upbit API.
+
+    Args:
+        market_code: 마켓 코드 (예: 'KRW-BTC')
+    Returns:
+        Ticker object containing the current ticker information.
+    """
+    get_market_catalog().validate(market_code)
+    # 웹소켓으로 수집 중인 마켓은 메모리에서 바로 응답
+    stream = get_ticker_stream()
+    ticker = stream.latest(market_code) if stream is not None else None
+    if ticker is not None:
+        return ticker
+    # 여러 워커가 공유 메모리 캐시를 쓰면 쓰기 프로세스가 갱신한 값으로 응답
+    shared = get_shared_cache()
+    data = shared.read_ticker(market_code) if shared is not None else None
+    if data is not None:
+        return Ticker.from_upbit(data)
+    # 동시에 들어온 다른 마켓 요청과 합쳐 한 번에 조회
+    return await get_ticker_batcher().get(market_code)
+
+async def get_tickers(market_codes: List[str]) -> List[Ticker]:
+    """
+    Get the current tickers of several Block chain markets in KRW from Upbit API.
+
+    Args:
+        market_codes: 마켓 코드 리스트 (예: ['KRW-BTC', 'KRW-ETH'])
+    Returns:
+        List of Ticker objects in the same order as market_codes.
+    """
+    return list(await asyncio.gather(*(get_current_ticker(market_code) for market_code in market_codes)))
+
+async def get_candles_for_minutes(minutes: int = 30, count: int = 10, market_code: str = 'KRW-BTC') -> List[MinuteCandleStick]:
+    """
+    Get a list of minute candlesticks for Block chain in KRW from Upbit API.
+    This function fetches the candlestick data for the specified minute interval and count.
+    
+    Args:
+        minutes: 캔들 단위(분) (1, 3, 5, 15, 10, 30, 60, 240)
+        count: 가져올 캔들 개수 (200개 초과 시 페이지 병렬 조회, 최대 20000)
+        market_code: 마켓 코드 (예: 'KRW-BTC')
+        
+    Returns:
+        캔들스틱 데이터 리스트
+    """
+    get_market_catalog().validate(market_code)
+    data = await get_candle_cache().get(minute_interval(minutes), market_code, count)
+    
+    return [MinuteCandleStick.from_upbit(item) for item in data]
+
+async def get_candles_for_daily(count: int = 10, market_code: str = 'KRW-BTC') -> List[DailyCandleStick]:
+    """
+    Get a list of daily candlesticks for Block chain in KRW from Upbit API.
+    Get daily candlestick data until today.
+    
+    Args:
+        count: 가져올 캔들 개수 (200개 초과 시 페이지 병렬 조회, 최대 20000)
+        market_code: 마켓 코드 (예: 'KRW-BTC')
+        
+    Returns:
+        캔들스틱 데이터 리스트
+    """
+    get_market_catalog().validate(market_code)
+    data = await get_candle_cache().get(DAY_INTERVAL, market_code, count)
+
+    print(f"Retrieved {len(data)} daily candles for market {market_code}")
+    print("data:", data[:5])  # Print first 5 items for debugging
+    
+    return [DailyCandleStick.from_upbit(item) for item in data]
+
+async def get_candles_for_weekly(count: int = 10, market_code: str = 'KRW-BTC') -> List[WeeklyCandleStick]:
+    """
+    Get a list of weekly candlesticks for Block chain in KRW from Upbit API.
+    Get weekly candlestick data until today.
+    
+    Args:
+        count: 가져올 캔들 개수 (200개 초과 시 페이지 병렬 조회, 최대 20000)
+        market_code: 마켓 코드 (예: 'KRW-BTC')
+        
+    Returns:
+        캔들스틱 데이터 리스트
+    """
+    get_market_catalog().validate(market_code)
+    data = await get_candle_cache().get(WEEK_INTERVAL, market_code, count)
+    
+    return [WeeklyCandleStick.from_upbit(item) for item in data]
+
+async def get_candle_columns(unit: str = 'days', count: int = 10, market_code: str = 'KRW-BTC') -> dict:
+    """
+    Get candlesticks for Block chain in KRW from Upbit API as columns.
+    캔들 객체 리스트 대신 컬럼별 값 리스트로 응답하므로 많은 캔들을 받을 때 응답이 작습니다.
+    
+    Args:
+        unit: 캔들 단위
+            - 업비트 캔들: 'days', 'weeks', 'minutes/1', 'minutes/30' 등
+            - 업비트에 없는 캔들 (분봉·일봉·주봉 하나를 받아 서버에서 묶음): 'custom/2h', 'custom/3d' (UTC 경계),
+              'kst/4h', 'kst/days', 'kst/weeks' (KST 자정·월요일 경계). 숫자 + 단위(m, h, d, w)
+        count: 가져올 캔들 개수 (200개 초과 시 페이지 병렬 조회, 최대 20000)
+        market_code: 마켓 코드 (예: 'KRW-BTC')
+        
+    Returns:
+        열 지향 캔들 데이터 (시간순)
+        - market: 마켓 코드
+        - candle_time: 캔들 시작 시각 (UTC epoch 밀리초)
+        - opening_price, high_price, low_price, trade_price, candle_acc_trade_price, candle_acc_trade_volume
+        - 일봉은 prev_closing_price, change_price, change_rate 추가
+    """
+    target = resampled_interval(unit)
+    if target is not None:
+        columns = await fetch_resampled_columns(base_interval(target), target, market_code, count)
+        return CandleBatch.from_columns(columns, market_code).to_dict()
+    batch = await fetch_candle_batch(interval_by_name(unit), market_code, count)
+    return batch.to_dict()
+
+async def get_blockchain_markets() -> List[dict[str, str]]:
+    """
+    Get a list of blockchain markets.
+    
+    Returns:
+        List of blockchain markets.
+        - Each market is represented as a dictionary with 'market', 'korean_name' and 'english_name'.
+    """
+    # 메모리에 보관 중인 마켓 목록으로 응답 (최초 1회만 업비트 조회)
+    catalog = get_market_catalog()
+    await catalog.ensure_loaded()
+    return [info.to_dict() for info in catalog.markets("KRW")]
+
+def set_tools(mcp: FastMCP):
+    """
+    Set tools for FastMCP.
+    
+    Args:
+        mcp: FastMCP instance
+    """
+    mcp.add_tool(get_current_ticker, "get_current_ticker")
+    mcp.add_tool(get_tickers, "get_tickers")
+    mcp.add_tool(get_candles_for_daily, "get_candles_for_daily")
+    mcp.add_tool(get_candles_for_weekly, "get_candles_for_weekly")
+    mcp.add_tool(get_candles_for_minutes, "get_candles_for_minutes")
+    mcp.add_tool(get_candle_columns, "get_candle_columns")
+    mcp.add_tool(get_blockchain_markets, "get_blockchain_markets")
\ No newline at end of file
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from app.tools.market.candles import (
+    CANDLE_PRICE_FIELDS, MAX_CANDLE_COUNT, CandleInterval, extra_fields, fetch_candle_history
+)
+from app.tools.market.client import loop_local
+from app.tools.market.columnar import decode_candles
+
+# 컬럼 아카이브 디렉터리 (빈 값이면 사용 안 함)
+DEFAULT_ARCHIVE_PATH = "data/archive"
+
+TIME_COLUMN = "candle_time"
+
+def archive_fields(interval: CandleInterval) -> Sequence[str]:
+    return (*CANDLE_PRICE_FIELDS, *extra_fields(interval))
+
+class CandleArchive:
+    """
+    (마켓, 캔들 단위)별 추가 전용 컬럼 아카이브
+
+    컬럼마다 하나의 원시 바이너리 파일(candle_time.i8, trade_price.f8 ...)에 시간순으로 이어 씁니다.
+    읽을 때는 파일을 메모리 매핑하므로 행 파싱이나 캔들별 할당 없이
+    시각 범위로 자른 NumPy 뷰를 바로 돌려줍니다.
+    MCP 도구나 분석 경로에 연결되어 있지 않은 라이브러리 API이며, 필요한 작업에서 sync/read를 직접 호출합니다.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _dir(self, interval: CandleInterval, market_code: str) -> str:
+        return os.path.join(self.root, market_code, interval.name.replace("/", "-"))
+
+    def _path(self, interval: CandleInterval, market_code: str, field: str) -> str:
+        suffix = "i8" if field == TIME_COLUMN else "f8"
+        return os.path.join(self._dir(interval, market_code), f"{field}.{suffix}")
+
+    def length(self, interval: CandleInterval, market_code: str) -> int:
+        """저장된 캔들 수 (쓰기 도중 중단되었어도 모든 컬럼에 있는 행만 셈)"""
+        lengths = []
+        for field in (TIME_COLUMN, *archive_fields(interval)):
+            path = self._path(interval, market_code, field)
+            lengths.append(os.path.getsize(path) // 8 if os.path.exists(path) else 0)
+        return min(lengths)
+
+    def _map(self, interval: CandleInterval, market_code: str, field: str, length: int) -> np.ndarray:
+        dtype = np.int64 if field == TIME_COLUMN else np.float64
+        if length == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self._path(interval, market_code, field), dtype=dtype, mode="r", shape=(length,))
+
+    def read(self, interval: CandleInterval, market_code: str,
+             start: Optional[int] = None, end: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        [start, end) 범위(캔들 시작 시각, epoch 밀리초)의 캔들을 메모리 매핑된 뷰로 반환
+
+        Returns:
+            decode_candles()와 같은 형식의 컬럼 딕셔너리 (읽기 전용 뷰)
+        """
+        length = self.length(interval, market_code)
+        times = self._map(interval, market_code, TIME_COLUMN, length)
+        lo = 0 if start is None else int(np.searchsorted(times, start, side="left"))
+        hi = length if end is None else int(np.searchsorted(times, end, side="left"))
+
+        columns = {TIME_COLUMN: times[lo:hi]}
+        for field in archive_fields(interval):
+            columns[field] = self._map(interval, market_code, field, length)[lo:hi]
+        return columns
+
+    def last_time(self, interval: CandleInterval, market_code: str) -> Optional[int]:
+        length = self.length(interval, market_code)
+        if length == 0:
+            return None
+        return int(self._map(interval, market_code, TIME_COLUMN, length)[-1])
+
+    def append(self, interval: CandleInterval, market_code: str, columns: Dict[str, np.ndarray]) -> int:
+        """
+        시간순 컬럼을 아카이브 끝에 추가
+
+        마지막 저장 캔들과 같은 시각의 캔들은 (진행 중이던 캔들이 마감된 경우) 덮어쓰고,
+        그보다 오래된 캔들은 무시합니다.
+
+        Returns:
+            추가된 캔들 수
+        """
+        length = self.length(interval, market_code)
+        last = self.last_time(interval, market_code)
+        times = columns[TIME_COLUMN]
+
+        # 마지막 캔들 덮어쓰기 위치부터 씀
+        first = 0 if last is None else int(np.searchsorted(times, last, side="left"))
+        offset = length
+        if last is not None and first < len(times) and times[first] == last:
+            offset = length - 1
+        if first >= len(times):
+            return 0
+
+        os.makedirs(self._dir(interval, market_code), exist_ok=True)
+        # 시각 컬럼을 마지막에 써서 중단되더라도 length()가 온전한 행만 세도록 함
+        for field in (*archive_fields(interval), TIME_COLUMN):
+            dtype = np.int64 if field == TIME_COLUMN else np.float64
+            values = np.ascontiguousarray(columns[field][first:], dtype=dtype)
+            path = self._path(interval, market_code, field)
+            with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                # 읽는 쪽이 매핑 중일 수 있으므로 파일을 줄이지 않고 제자리에 덮어씀
+                f.seek(offset * 8)
+                f.write(values.tobytes())
+        return len(times) - first - (length - offset)
+
+    async def sync(self, interval: CandleInterval, market_code: str, count: int) -> int:
+        """
+        업비트에서 새 캔들을 받아 아카이브에 추가
+
+        비어 있으면 최신 count개로 시작하고, 이후에는 마지막 저장 캔들부터 현재 캔들까지를
+        (count와 관계없이) 모두 받아 이어 씁니다.
+
+        Raises:
+            ValueError: 마지막 저장 캔들 이후 구간이 MAX_CANDLE_COUNT개보다 길어 한 번에 받을 수 없음
+                (아카이브 디렉터리를 지우고 다시 시작해야 함)
+        """
+        last = await asyncio.to_thread(self.last_time, interval, market_code)
+        if last is not None:
+            current_start = interval.floor(time.time())
+            # 가장 최근 count개만 받으면 마지막 저장 캔들과의 사이가 영구히 빠지므로 구간 전체를 받음
+            count = (current_start - last // 1000) // interval.seconds + 1
+            if count > MAX_CANDLE_COUNT:
+                raise ValueError(
+                    f"아카이브가 너무 오래되어 이어 쓸 수 없습니다: {market_code} {interval.name} "
+                    f"({count}개 > {MAX_CANDLE_COUNT}개, {self._dir(interval, market_code)}를 지우고 다시 시작하세요)"
+                )
+
+        data = await fetch_candle_history(interval, market_code, count)
+        added = await asyncio.to_thread(self.append, interval, market_code, decode_candles(data, extra_fields(interval)))
+        logging.debug(f"아카이브 갱신: {market_code} {interval.name} {added}개 추가")
+        return added
+
+def create_candle_archive() -> Optional[CandleArchive]:
+    """CANDLE_ARCHIVE_PATH 환경 변수 경로로 아카이브 생성 (빈 값이면 None)"""
+    path = os.getenv("CANDLE_ARCHIVE_PATH", DEFAULT_ARCHIVE_PATH)
+    return CandleArchive(path) if path else None
+
+def get_candle_archive() -> Optional[CandleArchive]:
+    """프로세스 전역 캔들 아카이브 반환 (사용하지 않으면 None)"""
+    return loop_local("candle_archive", create_candle_archive)
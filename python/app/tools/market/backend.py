@@ -0,0 +1,325 @@
+import asyncio
+import json
+import logging
+import os
+import struct
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.parse import unquote, urlparse
+
+import numpy as np
+
+from app.tools.market.candles import CandleInterval
+from app.tools.market.client import loop_local
+from app.tools.market.shared import HEADER_SIZE, SEQLOCK_RETRIES, SharedSegment
+
+# 캐시 백엔드 주소 (memory, shm://이름, redis://호스트:포트/DB)
+DEFAULT_CACHE_BACKEND_URL = "memory"
+# 모든 캐시 키 앞에 붙는 접두사 (값 형식이 바뀌면 버전을 올림)
+CACHE_KEY_PREFIX = "bitscope:v1"
+# 메모리 백엔드 최대 항목 수
+MAX_MEMORY_ENTRIES = 1024
+# 공유 메모리 백엔드 슬롯 수와 슬롯당 최대 값 크기 (바이트)
+SHM_SLOTS = 256
+SHM_VALUE_SIZE = 128 * 1024
+# RESP 서버 응답 대기(초)
+RESP_TIMEOUT = 1.0
+# RESP 서버 오류 후 다시 연결을 시도하기까지 대기(초)
+RESP_RETRY_DELAY = 5.0
+
+def candle_cache_key(interval: CandleInterval, market_code: str, candle_start: int, suffix: Union[int, str]) -> str:
+    """
+    캔들 캐시 키
+
+    candle_start는 마지막 확정 캔들(또는 진행 중인 캔들)의 시작 시각(epoch 초)이므로,
+    캔들 경계를 넘으면 키가 바뀌어 이전 값은 더 이상 읽히지 않습니다.
+    """
+    return f"{CACHE_KEY_PREFIX}:candles:{market_code}:{interval.name}:{candle_start * 1000}:{suffix}"
+
+def analysis_cache_key(market_code: str, config_digest: str, interval: CandleInterval, candle_start: int) -> str:
+    """분석 결과 캐시 키 (마켓, 분석 설정, 분봉 단위, 마지막 확정 분봉 시작 시각)"""
+    return f"{CACHE_KEY_PREFIX}:analysis:{market_code}:{config_digest}:{interval.name}:{candle_start * 1000}"
+
+def encode_columns(columns: Dict[str, np.ndarray]) -> bytes:
+    """NumPy 컬럼 → 바이트 (헤더 길이 4바이트 + JSON 헤더 + 컬럼 원본 바이트)"""
+    arrays = {name: np.ascontiguousarray(values) for name, values in columns.items()}
+    header = json.dumps([[name, values.dtype.str, len(values)] for name, values in arrays.items()]).encode()
+    return b"".join((struct.pack("<I", len(header)), header, *(values.tobytes() for values in arrays.values())))
+
+def decode_columns(payload: bytes) -> Dict[str, np.ndarray]:
+    """encode_columns 결과 → NumPy 컬럼 (payload를 그대로 가리키는 읽기 전용 배열)"""
+    (header_size,) = struct.unpack_from("<I", payload)
+    offset = 4 + header_size
+    columns = {}
+    for name, dtype, length in json.loads(payload[4:offset]):
+        columns[name] = np.frombuffer(payload, dtype=dtype, count=length, offset=offset)
+        offset += columns[name].nbytes
+    return columns
+
+class CacheBackend:
+    """
+    캔들·분석 결과 캐시 저장소 인터페이스
+
+    값은 바이트로 주고받으므로 프로세스 안, 공유 메모리, 외부 서버 어디에 두어도 같은 방식으로 씁니다.
+    캐시는 있으면 좋은 것이므로 저장소 오류는 예외 대신 조회 실패(None)로 처리합니다.
+    """
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+class MemoryBackend(CacheBackend):
+    """프로세스 안 LRU 캐시 (기본값)"""
+
+    def __init__(self, max_entries: int = MAX_MEMORY_ENTRIES):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.entries[key] = (value, time.monotonic() + ttl)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+class SharedMemoryBackend(CacheBackend):
+    """
+    같은 호스트의 여러 프로세스가 함께 쓰는 공유 메모리 캐시
+
+    키의 해시로 정한 슬롯 세그먼트에 [키 길이, 키, 값]을 씁니다 (충돌하면 나중 값이 덮어씀).
+    세그먼트 헤더의 reserved 칸에 만료 시각(epoch 밀리초)을 두고, 읽기는 seqlock으로 잠금 없이 합니다.
+    """
+
+    def __init__(self, name: str, slots: int = SHM_SLOTS, value_size: int = SHM_VALUE_SIZE):
+        self.name = name
+        self.slots = slots
+        self.value_size = value_size
+        self.segments: Dict[int, SharedSegment] = {}
+
+    def _segment(self, key: bytes, create: bool) -> Optional[SharedSegment]:
+        slot = zlib.crc32(key) % self.slots
+        segment = self.segments.get(slot)
+        if segment is None:
+            segment = SharedSegment.open(f"{self.name}-kv-{slot}", HEADER_SIZE + self.value_size, create=create)
+            if segment is not None:
+                self.segments[slot] = segment
+        return segment
+
+    async def get(self, key: str) -> Optional[bytes]:
+        encoded = key.encode()
+        segment = self._segment(encoded, create=False)
+        if segment is None:
+            return None
+        for _ in range(SEQLOCK_RETRIES):
+            seq = int(segment.header[0])
+            if seq % 2:
+                continue
+            length, expires_at = int(segment.header[1]), int(segment.header[3])
+            payload = bytes(segment.shm.buf[HEADER_SIZE:HEADER_SIZE + length])
+            if int(segment.header[0]) != seq:
+                continue
+            if expires_at <= time.time() * 1000 or len(payload) < 2:
+                return None
+            key_size = int.from_bytes(payload[:2], "little")
+            if payload[2:2 + key_size] != encoded:
+                return None
+            return payload[2 + key_size:]
+        return None
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        encoded = key.encode()
+        payload = len(encoded).to_bytes(2, "little") + encoded + value
+        if len(payload) > self.value_size:
+            logging.debug(f"공유 메모리 캐시 값 크기 초과로 저장하지 않음: {key} ({len(payload)} bytes)")
+            return
+        segment = self._segment(encoded, create=True)
+        segment.begin_write()
+        segment.shm.buf[HEADER_SIZE:HEADER_SIZE + len(payload)] = payload
+        segment.header[3] = int((time.time() + ttl) * 1000)
+        segment.end_write(len(payload))
+
+    async def close(self) -> None:
+        """세그먼트 매핑 해제 (세그먼트는 다른 프로세스를 위해 남겨 둠)"""
+        for segment in self.segments.values():
+            segment.close()
+        self.segments.clear()
+
+class RespError(Exception):
+    """RESP 서버 오류 응답"""
+
+def encode_command(*args: Union[str, bytes, int]) -> bytes:
+    """명령 → RESP 배열"""
+    parts = [f"*{len(args)}\r\n".encode()]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """
+    RESP 응답 1개 읽기
+
+    Raises:
+        ConnectionError: 연결이 끊김
+        RespError: 오류 응답
+    """
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("RESP 연결이 끊겼습니다")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode()
+    if kind == b"-":
+        raise RespError(payload.decode())
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        size = int(payload)
+        return None if size < 0 else (await reader.readexactly(size + 2))[:-2]
+    if kind == b"*":
+        size = int(payload)
+        return None if size < 0 else [await read_reply(reader) for _ in range(size)]
+    raise RespError(f"알 수 없는 RESP 응답: {line!r}")
+
+class RespBackend(CacheBackend):
+    """
+    Redis 프로토콜(RESP) 서버 캐시
+
+    여러 호스트의 서버 인스턴스가 한 캐시를 함께 씁니다. Redis, Valkey, 또는 로컬 대체 서버
+    (python -m app.tools.market.respserver)를 쓸 수 있습니다.
+    연결 1개로 명령을 차례로 보내며, 서버 오류 후 RESP_RETRY_DELAY 동안은 캐시를 건너뜁니다.
+    """
+
+    def __init__(self, host: str, port: int, db: int = 0, password: Optional[str] = None,
+                 timeout: float = RESP_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+        self._down_until = 0.0
+
+    @classmethod
+    def from_url(cls, url: str) -> "RespBackend":
+        parsed = urlparse(url)
+        db = int(parsed.path.lstrip("/") or 0)
+        password = unquote(parsed.password) if parsed.password else None
+        return cls(parsed.hostname or "localhost", parsed.port or 6379, db, password)
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            await self._call("AUTH", self.password)
+        if self.db:
+            await self._call("SELECT", self.db)
+
+    async def _call(self, *args: Union[str, bytes, int]) -> Any:
+        self._writer.write(encode_command(*args))
+        await self._writer.drain()
+        return await read_reply(self._reader)
+
+    async def execute(self, *args: Union[str, bytes, int]) -> Any:
+        """
+        명령 1개 실행
+
+        Raises:
+            OSError, ConnectionError, TimeoutError: 연결 실패 (연결을 닫음)
+            RespError: 오류 응답
+        """
+        async with self._lock:
+            try:
+                async with asyncio.timeout(self.timeout):
+                    if self._writer is None:
+                        await self._connect()
+                    return await self._call(*args)
+            except (OSError, EOFError, TimeoutError, asyncio.CancelledError):
+                # 응답을 읽다 멈춘 연결은 다음 명령의 응답과 섞이므로 버림
+                await self._disconnect()
+                raise
+
+    async def _command(self, *args: Union[str, bytes, int]) -> Any:
+        if time.monotonic() < self._down_until:
+            return None
+        try:
+            return await self.execute(*args)
+        except (OSError, EOFError, TimeoutError, RespError) as e:
+            self._down_until = time.monotonic() + RESP_RETRY_DELAY
+            logging.warning(f"캐시 서버 오류 ({self.host}:{self.port}), {RESP_RETRY_DELAY:.0f}초 동안 건너뜀: {e!r}")
+            return None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._command("GET", key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._command("SET", key, value, "PX", max(1, int(ttl * 1000)))
+
+    async def _disconnect(self) -> None:
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._disconnect()
+
+def create_cache_backend() -> CacheBackend:
+    """
+    CACHE_BACKEND_URL 환경 변수로 캐시 백엔드 생성
+
+    - memory (기본값): 프로세스 안 캐시
+    - shm://이름: 같은 호스트의 워커가 함께 쓰는 공유 메모리
+    - redis://[:비밀번호@]호스트[:포트][/DB]: 여러 호스트가 함께 쓰는 RESP 서버
+    """
+    url = os.getenv("CACHE_BACKEND_URL", DEFAULT_CACHE_BACKEND_URL) or DEFAULT_CACHE_BACKEND_URL
+    scheme = urlparse(url).scheme
+    if scheme in ("redis", "resp"):
+        return RespBackend.from_url(url)
+    if scheme == "shm":
+        return SharedMemoryBackend(urlparse(url).netloc)
+    if url != DEFAULT_CACHE_BACKEND_URL:
+        logging.warning(f"알 수 없는 캐시 백엔드, 메모리 캐시 사용: {url}")
+    return MemoryBackend()
+
+def get_cache_backend() -> CacheBackend:
+    """프로세스 전역 캐시 백엔드 반환 (이벤트 루프별로 1개)"""
+    return loop_local("cache_backend", create_cache_backend)
+
+def split_live(columns: Dict[str, np.ndarray], live_start: int) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """시간순 캔들 컬럼 → (확정 캔들, live_start(epoch 초) 이후 진행 중인 캔들)"""
+    position = int(np.searchsorted(columns["candle_time"], live_start * 1000))
+    return (
+        {name: values[:position] for name, values in columns.items()},
+        {name: values[position:] for name, values in columns.items()},
+    )
+
+def join_live(closed: Dict[str, np.ndarray], live: Dict[str, np.ndarray], count: int) -> Dict[str, np.ndarray]:
+    """확정 캔들 + 진행 중인 캔들 → 최신 count개 (새 배열)"""
+    result = {}
+    for name, values in closed.items():
+        joined = np.concatenate((values, live[name])) if name in live else values
+        result[name] = joined[max(0, len(joined) - count):].copy()
+    return result
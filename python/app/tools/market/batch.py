@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Set
+
+from httpx import HTTPStatusError
+
+from app.schemas.ticker import Ticker
+from app.tools.market.client import fetch_json, loop_local
+
+# 첫 요청 이후 다른 요청을 모으는 시간(초)
+TICKER_BATCH_WINDOW = 0.01
+# 한 번에 요청할 최대 마켓 수 (URL 길이 제한 고려)
+TICKER_BATCH_SIZE = 100
+
+async def fetch_tickers(market_codes: List[str]) -> Dict[str, Ticker]:
+    """
+    여러 마켓의 티커를 한 번의 요청으로 조회
+
+    Args:
+        market_codes: 마켓 코드 리스트 (최대 TICKER_BATCH_SIZE개)
+
+    Returns:
+        마켓 코드 → Ticker 딕셔너리 (업비트가 돌려주지 않은 마켓은 제외)
+    """
+    data = await fetch_json("ticker", "/v1/ticker", params={"markets": ",".join(market_codes)})
+    return {item["market"]: Ticker.from_upbit(item) for item in data or []}
+
+class TickerBatcher:
+    """
+    동시에 들어온 티커 요청을 하나의 업비트 요청으로 병합
+
+    첫 요청이 도착하면 TICKER_BATCH_WINDOW 동안 다른 요청을 모은 뒤
+    마켓 목록을 콤마로 이어 한 번에 조회하고, 결과를 각 호출자에게 나눠줍니다.
+    """
+
+    def __init__(self, window: float = TICKER_BATCH_WINDOW, batch_size: int = TICKER_BATCH_SIZE):
+        self.window = window
+        self.batch_size = batch_size
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def get(self, market_code: str) -> Ticker:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(market_code, []).append(future)
+
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+        return await future
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.window)
+        self._flush_task = None
+        self._flush()
+
+    def _flush(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        pending, self._pending = self._pending, {}
+        if pending:
+            task = asyncio.create_task(self._resolve(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, pending: Dict[str, List[asyncio.Future]]) -> None:
+        try:
+            tickers = await fetch_tickers(list(pending))
+        except HTTPStatusError as e:
+            # 잘못된 마켓 코드가 하나라도 섞이면 업비트가 배치 전체를 거부하므로 개별 조회로 재시도
+            if len(pending) > 1 and e.response.status_code == 404:
+                await asyncio.gather(*(self._resolve({market: futures}) for market, futures in pending.items()))
+                return
+            self._fail(pending, e)
+            return
+        except Exception as e:
+            self._fail(pending, e)
+            return
+
+        for market, futures in pending.items():
+            ticker = tickers.get(market)
+            for future in futures:
+                if future.done():
+                    continue
+                if ticker is None:
+                    future.set_exception(ValueError(f"{market}의 티커 정보를 가져올 수 없습니다"))
+                else:
+                    future.set_result(ticker)
+
+    @staticmethod
+    def _fail(pending: Dict[str, List[asyncio.Future]], error: Exception) -> None:
+        logging.error(f"티커 배치 조회 실패 ({len(pending)}개 마켓): {error}")
+        for futures in pending.values():
+            for future in futures:
+                if not future.done():
+                    future.set_exception(error)
+
+def get_ticker_batcher() -> TickerBatcher:
+    """프로세스 전역 티커 배처 반환 (이벤트 루프별로 1개)"""
+    return loop_local("ticker_batcher", TickerBatcher)
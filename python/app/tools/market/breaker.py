@@ -0,0 +1,58 @@
+import logging
+import time
+
+# 연속 실패가 이 횟수에 도달하면 차단
+BREAKER_FAILURE_THRESHOLD = 5
+# 차단 후 시험 요청을 보내기까지 대기(초)
+BREAKER_RESET_TIMEOUT = 30.0
+
+class UpstreamUnavailable(Exception):
+    """회로 차단기가 열려 있어 업비트 호출을 보내지 않음"""
+
+class CircuitBreaker:
+    """
+    업비트 장애 시 요청을 잠시 멈추는 회로 차단기
+
+    - closed: 정상. 재시도까지 실패한 호출이 연속 failure_threshold번이면 open으로 전환
+    - open: 호출을 보내지 않고 즉시 UpstreamUnavailable. reset_timeout이 지나면 half_open
+    - half_open: 시험 요청 1개만 허용. 성공하면 closed, 실패하면 다시 open
+      (시험 요청이 결과 없이 끝나도 reset_timeout마다 다시 시험)
+    """
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD, reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+
+    @property
+    def retry_after(self) -> float:
+        """다음 시험 요청까지 남은 시간(초)"""
+        if self.state == "closed":
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """요청을 보내도 되는지 여부 (half_open 전환 시 시험 요청 1개 허용)"""
+        if self.state == "closed":
+            return True
+        if self.retry_after > 0:
+            return False
+        self.state = "half_open"
+        self.opened_at = time.monotonic()
+        return True
+
+    def record_success(self) -> None:
+        if self.state != "closed":
+            logging.info("업비트 응답 복구, 회로 차단 해제")
+        self.state = "closed"
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logging.warning(f"업비트 연속 실패 {self.failures}회, {self.reset_timeout:.0f}초 동안 요청 차단")
+            self.state = "open"
+            self.opened_at = time.monotonic()
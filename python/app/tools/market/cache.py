@@ -0,0 +1,187 @@
+import asyncio
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
+
+from app.tools.market.candles import MAX_CANDLE_COUNT, CandleInterval, fetch_candle_history
+from app.tools.market.client import loop_local
+
+# 진행 중인 캔들의 최대 보관 시간(초)
+LIVE_CANDLE_TTL = 5.0
+# 캐시할 (마켓, 캔들 단위) 조합 최대 개수
+MAX_CACHE_ENTRIES = 256
+
+@dataclass
+class CandleSeries:
+    """
+    (마켓, 캔들 단위) 하나의 캐시 항목
+
+    - candles: candle_date_time_utc → 업비트 캔들 딕셔너리 (시간순으로 삽입되어 정렬 없이 최신 구간을 꺼냄)
+    - final_before: 이 시각(epoch 초) 이전에 시작한 캔들은 마감 후 조회된 확정 캔들
+    - live_expires_at: 진행 중인 캔들의 만료 시각 (monotonic)
+    - covered_from: 이 시각 이후의 캔들은 빠짐없이 캐시에 있음
+    - exhausted: 상장 시점까지 모두 조회함
+    """
+    candles: Dict[str, dict] = field(default_factory=dict)
+    final_before: int = 0
+    live_expires_at: float = 0.0
+    covered_from: Optional[str] = None
+    exhausted: bool = False
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def newest(self, count: int) -> List[dict]:
+        return list(islice(reversed(self.candles.values()), count))
+
+    def merge(self, data: List[dict]) -> None:
+        """
+        업비트 캔들(최신순)을 역순으로 읽어 끝에 이어 붙임
+
+        이미 있는 캔들(진행 중이던 캔들)은 자리를 지킨 채 값만 바뀝니다.
+        보관 중인 최신 캔들보다 오래된 새 캔들이 섞이면 (정상 응답에서는 없음) 한 번 정렬해 순서를 복구합니다.
+        """
+        candles = self.candles
+        newest = next(reversed(candles), None)
+        ordered = True
+        for item in reversed(data):
+            key = item["candle_date_time_utc"]
+            # 캔들마다 따로 만들어진 마켓 코드 문자열을 하나로 공유
+            # (응답 딕셔너리는 fetch_json 캐시·중복 요청 합치기로 다른 호출자와 공유되므로 복사본에 씀)
+            if "market" in item:
+                item = {**item, "market": sys.intern(item["market"])}
+            if newest is None or key > newest:
+                newest = key
+            elif key not in candles:
+                ordered = False
+            candles[key] = item
+        if not ordered:
+            self.candles = dict(sorted(candles.items()))
+
+    def covered(self) -> int:
+        if self.covered_from is None:
+            return 0
+        return sum(1 for key in self.candles if key >= self.covered_from)
+
+class CandleCache:
+    """
+    캔들 경계를 이해하는 캔들 캐시
+
+    마감된 캔들은 바뀌지 않으므로 계속 보관하고, 진행 중인 캔들만 LIVE_CANDLE_TTL 또는
+    캔들 경계 중 먼저 오는 시점에 만료됩니다. 경계를 넘으면 직전 캔들이 마감되므로
+    마지막 확정 캔들 이후 구간만 다시 조회합니다.
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHE_ENTRIES, live_ttl: float = LIVE_CANDLE_TTL):
+        self.max_entries = max_entries
+        self.live_ttl = live_ttl
+        self._entries: "OrderedDict[Tuple[str, str], CandleSeries]" = OrderedDict()
+
+    def _entry(self, interval: CandleInterval, market_code: str) -> CandleSeries:
+        key = (market_code, interval.name)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = CandleSeries()
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self._entries.move_to_end(key)
+        return entry
+
+    async def get(self, interval: CandleInterval, market_code: str, count: int) -> List[dict]:
+        """
+        최신순 캔들 count개 반환 (필요한 구간만 업비트에서 조회)
+
+        Returns:
+            업비트 캔들 응답 딕셔너리 리스트 (최신순, 공유 객체이므로 수정 금지)
+        """
+        count = max(0, min(count, MAX_CANDLE_COUNT))
+        entry = self._entry(interval, market_code)
+
+        async with entry.lock:
+            now = time.time()
+            current_start = interval.floor(now)
+
+            # 마지막 확정 캔들 이후 경계를 넘은 캔들 + 진행 중인 캔들 수
+            missing = (current_start - entry.final_before) // interval.seconds + 1
+
+            covered = entry.covered()
+            if entry.covered_from is None or missing > max(count, covered) or (covered < count and not entry.exhausted):
+                # 보관 중인 구간이 모자라거나 너무 오래되었으면 전체를 다시 조회
+                # (보관분보다 적게 벌어졌으면 count가 작아도 이력을 버리지 않고 아래에서 이어 붙임)
+                data = await fetch_candle_history(interval, market_code, count)
+                entry.candles = {}
+                entry.merge(data)
+                entry.covered_from = data[-1]["candle_date_time_utc"] if data else None
+                entry.exhausted = len(data) < count
+                self._mark_fresh(entry, interval, current_start)
+            elif missing > 1 or time.monotonic() >= entry.live_expires_at:
+                # 새로 바뀐 구간만 조회해 병합
+                entry.merge(await fetch_candle_history(interval, market_code, missing))
+                self._mark_fresh(entry, interval, current_start)
+
+            return entry.newest(count)
+
+    def _mark_fresh(self, entry: CandleSeries, interval: CandleInterval, current_start: int) -> None:
+        entry.final_before = current_start
+        # 진행 중인 캔들은 TTL과 캔들 경계 중 먼저 오는 시점에 만료
+        until_boundary = current_start + interval.seconds - time.time()
+        entry.live_expires_at = time.monotonic() + max(0.0, min(self.live_ttl, until_boundary))
+        excess = len(entry.candles) - MAX_CANDLE_COUNT
+        if excess > 0:
+            # 시간순이므로 앞쪽(가장 오래된 캔들)부터 버림
+            for key in list(islice(entry.candles, excess)):
+                del entry.candles[key]
+            entry.covered_from = next(iter(entry.candles))
+            entry.exhausted = False
+
+    def export(self) -> List[dict]:
+        """
+        스냅샷용 캐시 내용 (오래 쓰이지 않은 항목부터)
+
+        스냅샷 스레드에서 호출되므로 이벤트 루프가 고치는 딕셔너리는 list()로 한 번에 복사한 뒤 읽음
+        """
+        items = []
+        for (market_code, interval_name), entry in list(self._entries.items()):
+            candles = list(entry.candles.values())
+            candles.reverse()
+            items.append({
+                "market": market_code,
+                "interval": interval_name,
+                "candles": candles,
+                "final_before": entry.final_before,
+                "covered_from": entry.covered_from,
+                "exhausted": entry.exhausted,
+            })
+        return items
+
+    def restore(self, items: List[dict]) -> None:
+        """
+        스냅샷으로 캐시 채우기
+
+        진행 중이던 캔들은 만료된 것으로 두므로, 다음 조회 때 마지막 확정 캔들 이후 구간만 받아옵니다.
+        """
+        for item in items:
+            key = (item["market"], item["interval"])
+            if key in self._entries:
+                continue
+            series = self._entries[key] = CandleSeries(
+                final_before=item["final_before"],
+                covered_from=item["covered_from"],
+                exhausted=item["exhausted"],
+            )
+            series.merge(item["candles"])
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, market_code: Optional[str] = None) -> None:
+        """캐시 비우기 (market_code 지정 시 해당 마켓만)"""
+        if market_code is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if key[0] == market_code]:
+            del self._entries[key]
+
+def get_candle_cache() -> CandleCache:
+    """프로세스 전역 캔들 캐시 반환 (이벤트 루프별로 1개)"""
+    return loop_local("candle_cache", CandleCache)
@@ -0,0 +1,145 @@
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from app.schemas.candle import CANDLE_PRICE_FIELDS, DAILY_EXTRA_FIELDS
+from app.tools.market.client import fetch_json
+
+# 업비트 캔들 API 1회 요청 최대 개수
+CANDLE_PAGE_SIZE = 200
+# 한 번의 호출로 가져올 수 있는 최대 캔들 개수 (100페이지)
+MAX_CANDLE_COUNT = 20000
+
+MINUTE_UNITS = (1, 3, 5, 10, 15, 30, 60, 240)
+
+@dataclass(frozen=True)
+class CandleInterval:
+    """
+    캔들 시간 단위
+
+    업비트 캔들은 UTC epoch 기준으로 정렬됩니다 (일봉: 00:00 UTC = 09:00 KST, 주봉: 월요일 00:00 UTC).
+    offset은 epoch(1970-01-01, 목요일)에서 첫 캔들 경계까지의 초입니다.
+    """
+    name: str
+    seconds: int
+    offset: int = 0
+
+    @property
+    def url(self) -> str:
+        return f"/v1/candles/{self.name}"
+
+    def floor(self, ts: float) -> int:
+        """ts(epoch 초)가 속한 캔들의 시작 시각"""
+        return int((ts - self.offset) // self.seconds) * self.seconds + self.offset
+
+def minute_interval(minutes: int) -> CandleInterval:
+    if minutes not in MINUTE_UNITS:
+        raise ValueError(f"지원하지 않는 분 단위입니다: {minutes} (가능: {MINUTE_UNITS})")
+    return CandleInterval(f"minutes/{minutes}", minutes * 60)
+
+DAY_INTERVAL = CandleInterval("days", 86400)
+WEEK_INTERVAL = CandleInterval("weeks", 7 * 86400, 4 * 86400)
+
+def interval_by_name(name: str) -> CandleInterval:
+    """캔들 단위 이름(CandleInterval.name) → CandleInterval"""
+    if name == DAY_INTERVAL.name:
+        return DAY_INTERVAL
+    if name == WEEK_INTERVAL.name:
+        return WEEK_INTERVAL
+    if name.startswith("minutes/") and name[len("minutes/"):].isdigit():
+        return minute_interval(int(name[len("minutes/"):]))
+    raise ValueError(f"지원하지 않는 캔들 단위입니다: {name}")
+
+def extra_fields(interval: CandleInterval) -> Tuple[str, ...]:
+    """캔들 단위별 추가 수치 컬럼"""
+    return DAILY_EXTRA_FIELDS if interval == DAY_INTERVAL else ()
+
+def format_to(ts: int) -> str:
+    """캔들 API의 to 파라미터 형식 (UTC)"""
+    return datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def parse_utc(candle_date_time_utc: str) -> int:
+    """candle_date_time_utc 문자열 → epoch 초"""
+    return int(datetime.fromisoformat(candle_date_time_utc).replace(tzinfo=timezone.utc).timestamp())
+
+def extend_descending(series: List[dict], page: List[dict]) -> bool:
+    """
+    최신순 시계열 뒤에 더 오래된 최신순 페이지를 이어 붙임 (정렬 없이 페이지 길이에 비례)
+
+    페이지 앞부분 중 시계열의 가장 오래된 캔들보다 늦은 캔들은 페이지 경계 중복이므로 건너뜁니다.
+    나머지가 최신순이 아니면 아무것도 붙이지 않고 False를 반환합니다.
+    """
+    start = 0
+    if series:
+        oldest = series[-1]["candle_date_time_utc"]
+        while start < len(page) and page[start]["candle_date_time_utc"] >= oldest:
+            start += 1
+    keys = [item["candle_date_time_utc"] for item in page[start:]]
+    if any(newer <= older for newer, older in zip(keys, keys[1:])):
+        return False
+    series.extend(page[start:])
+    return True
+
+async def fetch_candle_page(interval: CandleInterval, market_code: str, count: int, to: Optional[int] = None) -> List[dict]:
+    """캔들 1페이지 조회 (최신순, 최대 200개)"""
+    params = {
+        "market": market_code,
+        "count": min(count, CANDLE_PAGE_SIZE)
+    }
+    if to is not None:
+        params["to"] = format_to(to)
+    return await fetch_json("candles", interval.url, params=params)
+
+async def fetch_candle_history(interval: CandleInterval, market_code: str, count: int) -> List[dict]:
+    """
+    200개 제한을 넘는 캔들 조회
+
+    필요한 페이지 수만큼 to 시각을 미리 계산해 요청 제한 안에서 병렬로 조회하고,
+    페이지 경계의 중복을 제거한 뒤 하나의 시계열(최신순)로 합칩니다.
+    거래가 없는 구간이 있어 개수가 모자라면 가장 오래된 캔들부터 이어서 조회합니다.
+
+    Args:
+        interval: 캔들 시간 단위
+        market_code: 마켓 코드 (예: 'KRW-BTC')
+        count: 가져올 캔들 개수 (최대 MAX_CANDLE_COUNT)
+
+    Returns:
+        업비트 캔들 응답 딕셔너리 리스트 (최신순)
+    """
+    count = max(0, min(count, MAX_CANDLE_COUNT))
+    if count <= CANDLE_PAGE_SIZE:
+        return await fetch_candle_page(interval, market_code, count)
+
+    # 진행 중인 캔들이 끝나는 시각부터 페이지 폭만큼 거슬러 올라가며 to 계산
+    anchor = interval.floor(time.time()) + interval.seconds
+    page_span = CANDLE_PAGE_SIZE * interval.seconds
+    pages = await asyncio.gather(*(
+        fetch_candle_page(interval, market_code, CANDLE_PAGE_SIZE, anchor - i * page_span)
+        for i in range(math.ceil(count / CANDLE_PAGE_SIZE))
+    ))
+
+    # 페이지는 최신 구간부터 순서대로이고 각 페이지도 최신순이므로 경계 중복만 건너뛰며 이어 붙임
+    candles: List[dict] = []
+    ordered = all(extend_descending(candles, page) for page in pages)
+    exhausted = any(len(page) < CANDLE_PAGE_SIZE for page in pages)
+
+    while ordered and len(candles) < count and not exhausted:
+        page = await fetch_candle_page(
+            interval, market_code, CANDLE_PAGE_SIZE, parse_utc(candles[-1]["candle_date_time_utc"])
+        )
+        pages.append(page)
+        before = len(candles)
+        ordered = extend_descending(candles, page)
+        exhausted = len(page) < CANDLE_PAGE_SIZE or len(candles) == before
+
+    if not ordered:
+        # 순서가 어긋난 응답 (정상 응답에서는 없음): 중복 제거 후 정렬
+        merged: Dict[str, dict] = {}
+        for item in (item for page in pages for item in page):
+            merged.setdefault(item["candle_date_time_utc"], item)
+        return [merged[key] for key in sorted(merged, reverse=True)[:count]]
+
+    return candles[:count]
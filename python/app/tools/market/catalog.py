@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from app.tools.market.client import fetch_json, loop_local
+
+# 마켓 목록 갱신 주기(초)
+CATALOG_REFRESH_INTERVAL = 6 * 60 * 60
+# 갱신 실패 시 재시도 간격(초)
+CATALOG_RETRY_INTERVAL = 60
+
+@dataclass(frozen=True)
+class MarketInfo:
+    market: str
+    korean_name: str
+    english_name: str
+
+    def to_dict(self) -> Dict[str, str]:
+        return {
+            "market": self.market,
+            "korean_name": self.korean_name,
+            "english_name": self.english_name
+        }
+
+class MarketCatalog:
+    """
+    업비트 마켓 목록 메모리 캐시
+
+    시작 시 한 번 불러온 뒤 백그라운드에서 주기적으로 갱신합니다.
+    마켓 코드, 한글명, 영문명으로 O(1) 조회가 가능합니다.
+    """
+
+    def __init__(self, refresh_interval: float = CATALOG_REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self.by_code: Dict[str, MarketInfo] = {}
+        self.by_korean_name: Dict[str, List[MarketInfo]] = {}
+        self.by_english_name: Dict[str, List[MarketInfo]] = {}
+        self.loaded_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._load_lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    async def load(self) -> None:
+        """업비트에서 전체 마켓 목록을 불러와 인덱스 교체"""
+        self.index(await fetch_json("market", "/v1/market/all"))
+        logging.info(f"마켓 목록 갱신 완료: {len(self.by_code)}개")
+
+    def index(self, data: List[dict], loaded_at: Optional[float] = None) -> None:
+        """마켓 목록(업비트 응답 형식)으로 인덱스 교체"""
+        by_code: Dict[str, MarketInfo] = {}
+        by_korean_name: Dict[str, List[MarketInfo]] = {}
+        by_english_name: Dict[str, List[MarketInfo]] = {}
+        for item in data:
+            info = MarketInfo(item["market"], item["korean_name"], item["english_name"])
+            by_code[info.market] = info
+            by_korean_name.setdefault(info.korean_name, []).append(info)
+            by_english_name.setdefault(info.english_name.lower(), []).append(info)
+
+        # 조회 중인 호출자가 중간 상태를 보지 않도록 한 번에 교체
+        self.by_code, self.by_korean_name, self.by_english_name = by_code, by_korean_name, by_english_name
+        self.loaded_at = time.time() if loaded_at is None else loaded_at
+
+    def export(self) -> List[dict]:
+        """마켓 목록 (업비트 응답 형식)"""
+        return [info.to_dict() for info in list(self.by_code.values())]
+
+    async def ensure_loaded(self) -> None:
+        if self.loaded:
+            return
+        async with self._load_lock:
+            if not self.loaded:
+                await self.load()
+
+    def get(self, market_code: str) -> Optional[MarketInfo]:
+        return self.by_code.get(market_code)
+
+    def find_by_name(self, name: str) -> List[MarketInfo]:
+        """한글명 또는 영문명(대소문자 무시)으로 마켓 조회"""
+        return self.by_korean_name.get(name) or self.by_english_name.get(name.lower(), [])
+
+    def markets(self, quote: str = "KRW") -> List[MarketInfo]:
+        """호가 화폐(예: 'KRW') 기준 마켓 목록"""
+        prefix = f"{quote}-"
+        return [info for info in self.by_code.values() if info.market.startswith(prefix)]
+
+    def validate(self, market_code: str) -> None:
+        """
+        마켓 코드 검증 (네트워크 I/O 없음)
+
+        목록을 아직 불러오지 않았으면 검증을 건너뜁니다.
+
+        Raises:
+            ValueError: 목록에 없는 마켓 코드
+        """
+        if self.loaded and market_code not in self.by_code:
+            raise ValueError(f"존재하지 않는 마켓 코드입니다: {market_code}")
+
+    def start(self) -> None:
+        """백그라운드 갱신 시작 (이미 실행 중이면 무시)"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        task, self._refresh_task = self._refresh_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.load()
+                delay = self.refresh_interval
+            except Exception as e:
+                logging.error(f"마켓 목록 갱신 실패: {e}")
+                delay = CATALOG_RETRY_INTERVAL
+            await asyncio.sleep(delay)
+
+def get_market_catalog() -> MarketCatalog:
+    """프로세스 전역 마켓 목록 반환 (이벤트 루프별로 1개)"""
+    return loop_local("market_catalog", MarketCatalog)
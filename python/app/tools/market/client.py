@@ -0,0 +1,235 @@
+import asyncio
+import logging
+import random
+import time
+import weakref
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from httpx import AsyncClient, HTTPStatusError, Limits, Response, Timeout, TransportError
+
+from app.tools.market.breaker import CircuitBreaker, UpstreamUnavailable
+from app.tools.market.hedging import HedgePolicy, LatencyTracker
+from app.tools.market.ratelimit import RateLimitScheduler
+from app.tools.market.singleflight import SingleFlight, request_key
+
+UPBIT_API_URL = "https://api.upbit.com"
+
+# 커넥션 풀 설정 (keep-alive 유지로 TCP+TLS 핸드셰이크 재사용)
+HTTP_LIMITS = Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0)
+HTTP_TIMEOUT = Timeout(10.0, connect=5.0)
+
+# 일시적 오류(429, 5xx, 네트워크 오류) 재시도 설정
+MAX_RETRIES = 4
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+RETRY_BASE_DELAY = 0.2
+RETRY_MAX_DELAY = 3.0
+
+# 헤지 요청 설정 (enabled=False로 끌 수 있음)
+HEDGE_POLICY = HedgePolicy()
+
+# 백그라운드 요청이 대화형 요청 몫으로 남겨 두는 그룹별 토큰 수
+BACKGROUND_RESERVE = 5.0
+
+T = TypeVar("T")
+
+_client: Optional[AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# 이벤트 루프에 묶이는 객체(락, Future 등)를 루프별로 보관
+_loop_locals: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+
+def get_http_client() -> AsyncClient:
+    """
+    프로세스 전역 업비트 HTTP 클라이언트 반환
+
+    최초 호출 시 커넥션 풀이 설정된 클라이언트를 생성하고 이후 호출에서는 재사용합니다.
+    다른 이벤트 루프에서 호출되면 (예: asyncio.run 재실행) 새 클라이언트를 생성합니다.
+    """
+    global _client, _client_loop
+
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = AsyncClient(
+            base_url=UPBIT_API_URL,
+            headers={"Accept": "application/json"},
+            limits=HTTP_LIMITS,
+            timeout=HTTP_TIMEOUT,
+        )
+        _client_loop = loop
+    return _client
+
+def loop_local(name: str, factory: Callable[[], T]) -> T:
+    """현재 이벤트 루프에 속한 싱글턴 반환 (없으면 factory로 생성)"""
+    state = _loop_locals.setdefault(asyncio.get_running_loop(), {})
+    if name not in state:
+        state[name] = factory()
+    return state[name]
+
+def get_scheduler() -> RateLimitScheduler:
+    """프로세스 전역 요청 스케줄러 반환 (이벤트 루프별로 1개)"""
+    return loop_local("scheduler", RateLimitScheduler)
+
+def get_latency_tracker() -> LatencyTracker:
+    """프로세스 전역 응답 지연 기록기 반환 (이벤트 루프별로 1개)"""
+    return loop_local("latency_tracker", LatencyTracker)
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """프로세스 전역 업비트 회로 차단기 반환 (이벤트 루프별로 1개)"""
+    return loop_local("circuit_breaker", CircuitBreaker)
+
+def get_singleflight() -> SingleFlight:
+    """프로세스 전역 중복 요청 병합기 반환 (이벤트 루프별로 1개)"""
+    return loop_local("singleflight", SingleFlight)
+
+async def fetch_json(group: str, url: str, params: Optional[dict] = None) -> Any:
+    """
+    요청 제한을 지키며 업비트 API 호출 후 JSON 반환
+
+    같은 엔드포인트·파라미터로 진행 중인 요청이 있으면 그 응답을 공유합니다.
+    반환된 JSON은 다른 호출자와 공유될 수 있으므로 수정하지 않아야 합니다.
+    일시적 오류는 지터를 준 지수 백오프로 재시도하고, 응답이 늦으면 헤지 요청을 보냅니다.
+    재시도까지 실패한 호출이 이어지면 회로 차단기가 열려 한동안 요청을 보내지 않습니다.
+
+    Args:
+        group: 업비트 요청 제한 그룹 ('candles', 'ticker', 'market')
+        url: API 경로 (예: '/v1/candles/days')
+        params: 쿼리 파라미터
+
+    Returns:
+        응답 JSON
+
+    Raises:
+        httpx.HTTPStatusError: 재시도 초과 또는 재시도하지 않는 오류 응답
+        httpx.TransportError: 재시도 초과 네트워크 오류
+        UpstreamUnavailable: 회로 차단기가 열려 있음
+    """
+    return await get_singleflight().do(request_key(url, params), lambda: _request_json(group, url, params))
+
+async def fetch_json_if_idle(group: str, url: str, params: Optional[dict] = None,
+                             reserve: float = BACKGROUND_RESERVE) -> Optional[Any]:
+    """
+    남는 요청 예산이 있을 때만 업비트 API를 1회 호출 (백그라운드 작업용)
+
+    그룹 토큰을 reserve개 넘게 남길 수 있을 때만 보내고, 재시도나 헤지 요청은 하지 않습니다.
+    대화형 요청이 토큰을 기다리는 중이면 보내지 않습니다.
+
+    Returns:
+        응답 JSON (예산이 없으면 None)
+
+    Raises:
+        httpx.HTTPStatusError: 오류 응답
+        httpx.TransportError: 네트워크 오류
+    """
+    scheduler = get_scheduler()
+    if get_circuit_breaker().state != "closed" or not scheduler.try_acquire(group, reserve):
+        return None
+    response = await _send(group, url, params, acquired=True)
+    if response.status_code == 429:
+        scheduler.throttle(group)
+    response.raise_for_status()
+    return response.json()
+
+def backoff_delay(attempt: int) -> float:
+    """재시도 대기 시간 (full jitter 지수 백오프)"""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+
+async def _request_json(group: str, url: str, params: Optional[dict]) -> Any:
+    breaker = get_circuit_breaker()
+    if not breaker.allow():
+        raise UpstreamUnavailable(f"업비트 장애로 요청 차단 중 ({breaker.retry_after:.0f}초 후 재시도)")
+
+    try:
+        result = await _request_with_retries(group, url, params, breaker)
+    except HTTPStatusError as e:
+        # 5xx는 장애, 4xx(요청 제한 제외)는 업비트가 정상 응답한 것으로 봄
+        # 429는 요청 제한 스케줄러가 속도를 줄여 처리하므로 차단기 상태를 바꾸지 않음
+        status = e.response.status_code
+        if status >= 500:
+            breaker.record_failure()
+        elif status != 429:
+            breaker.record_success()
+        raise
+    except TransportError:
+        breaker.record_failure()
+        raise
+    breaker.record_success()
+    return result
+
+async def _request_with_retries(group: str, url: str, params: Optional[dict], breaker: CircuitBreaker) -> Any:
+    scheduler = get_scheduler()
+
+    for attempt in range(MAX_RETRIES + 1):
+        last_attempt = attempt == MAX_RETRIES
+        # 다른 호출이 실패해 차단기가 열렸으면 남은 재시도를 포기
+        if attempt and breaker.state == "open":
+            raise UpstreamUnavailable("업비트 장애로 재시도 중단")
+        try:
+            response = await _hedged_get(group, url, params)
+        except TransportError as e:
+            if last_attempt:
+                raise
+            logging.warning(f"업비트 요청 실패 ({url}): {e!r}, 재시도 {attempt + 1}/{MAX_RETRIES}")
+            await asyncio.sleep(backoff_delay(attempt))
+            continue
+
+        if response.status_code in RETRY_STATUS_CODES and not last_attempt:
+            if response.status_code == 429:
+                scheduler.throttle(group)
+            logging.warning(f"업비트 응답 {response.status_code} ({url}), 재시도 {attempt + 1}/{MAX_RETRIES}")
+            await asyncio.sleep(backoff_delay(attempt))
+            continue
+
+        response.raise_for_status()
+        return response.json()
+
+async def _send(group: str, url: str, params: Optional[dict], acquired: bool = False) -> Response:
+    """요청 1회 전송 (토큰 획득 → 전송 → 요청 제한/지연 시간 기록)"""
+    scheduler = get_scheduler()
+    if not acquired:
+        await scheduler.acquire(group)
+
+    started = time.monotonic()
+    response = await get_http_client().get(url, params=params)
+    scheduler.observe(group, response.headers.get("Remaining-Req"))
+    if response.is_success:
+        get_latency_tracker().record(group, time.monotonic() - started)
+    return response
+
+async def _hedged_get(group: str, url: str, params: Optional[dict]) -> Response:
+    """
+    헤지 요청
+
+    첫 요청이 최근 지연 시간의 percentile 안에 끝나지 않으면 같은 요청을 한 번 더 보내고
+    먼저 성공한 응답을 사용합니다. 헤지 요청은 남은 토큰이 있을 때만 보내므로 요청 제한을 넘지 않습니다.
+    """
+    delay = get_latency_tracker().hedge_delay(group, HEDGE_POLICY)
+    primary = asyncio.create_task(_send(group, url, params))
+    if delay is None:
+        return await primary
+
+    tasks = {primary}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done and get_scheduler().try_acquire(group):
+            tasks.add(asyncio.create_task(_send(group, url, params, acquired=True)))
+
+        while True:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            succeeded = [task for task in done if task.exception() is None]
+            if succeeded:
+                return succeeded[0].result()
+            # 먼저 끝난 쪽이 실패했으면 나머지 요청의 결과를 기다림
+            if not tasks:
+                return done.pop().result()
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+async def close_http_client() -> None:
+    """전역 HTTP 클라이언트 종료 (커넥션 풀 정리)"""
+    global _client, _client_loop
+
+    client, _client, _client_loop = _client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
@@ -0,0 +1,144 @@
+import asyncio
+import time
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from app.schemas.candle import CandleBatch
+from app.tools.market.backend import (
+    candle_cache_key, decode_columns, encode_columns, get_cache_backend, join_live, split_live
+)
+from app.tools.market.candles import CandleInterval, extra_fields, fetch_candle_history
+from app.tools.market.cache import LIVE_CANDLE_TTL, get_candle_cache
+from app.tools.market.catalog import get_market_catalog
+from app.tools.market.compact import get_compact_cache
+from app.tools.market.ringbuffer import get_ring_registry
+from app.tools.market.shared import SHARED_MAX_AGE, get_shared_cache
+from app.tools.market.store import get_candle_store
+from app.tools.market.stream import get_ticker_stream
+
+def decode_candles(data: List[dict], extra_fields: Sequence[str] = ()) -> Dict[str, np.ndarray]:
+    """
+    업비트 캔들 응답 → NumPy 컬럼 (시간순, CandleBatch.from_upbit 참고)
+
+    Returns:
+        컬럼명 → 배열 딕셔너리
+        - candle_time: 캔들 시작 시각 (UTC epoch 밀리초, int64)
+        - 그 밖의 수치 컬럼 (float64)
+    """
+    return CandleBatch.from_upbit(data, extra_fields).columns()
+
+def columns_to_dataframe(columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """NumPy 컬럼 → 분석용 DataFrame (분석에서 쓰던 캔들 DataFrame과 같은 컬럼명)"""
+    return CandleBatch.from_columns(columns).to_frame()
+
+async def fetch_candle_batch(interval: CandleInterval, market_code: str, count: int) -> CandleBatch:
+    """캔들을 조회해 CandleBatch(시간순)로 반환 (fetch_candle_columns 참고)"""
+    return CandleBatch.from_columns(await fetch_candle_columns(interval, market_code, count), market_code)
+
+async def fetch_candle_columns(interval: CandleInterval, market_code: str, count: int) -> Dict[str, np.ndarray]:
+    """
+    캔들을 조회해 NumPy 컬럼(시간순)으로 반환
+
+    웹소켓으로 수집 중인 마켓의 분봉은 체결로 갱신되는 링 버퍼에서 바로 읽습니다.
+    여러 워커가 공유 메모리 캐시를 함께 쓰면 쓰기 프로세스가 갱신해 둔 배열을 읽습니다.
+    그 밖에는 캐시 백엔드를 거치고, 백엔드에 없는 구간은 로컬 캔들 저장소(없으면 메모리 캐시)에서 읽습니다.
+    """
+    get_market_catalog().validate(market_code)
+    fields = extra_fields(interval)
+
+    stream = get_ticker_stream()
+    streamed = stream is not None and market_code in stream.markets and interval.name.startswith("minutes/")
+    if streamed:
+        ring = get_ring_registry().get(interval, market_code)
+        # 스트림 연결 이후 채워진 버퍼만 신뢰 (끊긴 동안의 체결은 빠져 있음)
+        if ring is not None and stream.connected and ring.seeded_at >= stream.connected_at and len(ring) >= count:
+            return {name: values.copy() for name, values in ring.view(count).items()}
+
+    shared = get_shared_cache()
+    if shared is not None:
+        columns = shared.read_candles(interval, market_code, count)
+        if columns is not None:
+            return columns
+
+    if not (streamed and stream.connected):
+        return await fetch_backend_columns(interval, market_code, count, fields)
+
+    # 조회하는 동안 들어온 체결은 모아 두었다가 버퍼를 채운 뒤 반영
+    ring = get_ring_registry().track(interval, market_code, count)
+    trades = ring.begin_seed()
+    try:
+        columns = await fetch_backend_columns(interval, market_code, count, fields)
+    except BaseException:
+        ring.end_seed(trades)
+        raise
+    if stream.connected:
+        ring.load(columns, trades)
+    else:
+        ring.end_seed(trades)
+    return columns
+
+def upstream_max_age() -> float:
+    """
+    fetch_candle_columns/get_current_ticker 결과가 업비트에서 받은 뒤 최대 몇 초 지났을 수 있는지
+
+    진행 중인 캔들은 캐시 백엔드, 압축 캐시, 로컬 저장소(없으면 메모리 캐시)가 각각 최대 LIVE_CANDLE_TTL 동안
+    보관하고, 공유 메모리 캐시는 SHARED_MAX_AGE까지 씁니다. 웹소켓 값은 체결마다 갱신되므로 더하지 않습니다.
+    """
+    max_age = LIVE_CANDLE_TTL * (3 if get_compact_cache() is not None else 2)
+    if get_shared_cache() is not None:
+        max_age = max(max_age, SHARED_MAX_AGE + LIVE_CANDLE_TTL)
+    return max_age
+
+async def load_candle_columns(interval: CandleInterval, market_code: str, count: int,
+                              fields: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    압축 캐시를 쓰면 압축 캐시에서, 아니면 로컬 캔들 저장소가 있으면 증분 동기화 후 저장소에서,
+    없으면 메모리 캔들 캐시에서 읽기
+    """
+    compact = get_compact_cache()
+    if compact is not None:
+        return await compact.get(interval, market_code, count, fields, load_source_columns)
+    store = get_candle_store()
+    if store is not None:
+        return await store.load_columns(interval, market_code, count, fields)
+    return decode_candles(await get_candle_cache().get(interval, market_code, count), fields)
+
+async def load_source_columns(interval: CandleInterval, market_code: str, count: int,
+                              fields: Sequence[str]) -> Dict[str, np.ndarray]:
+    """압축 캐시가 모자란 구간을 받아 올 때: 로컬 캔들 저장소 또는 업비트 (딕셔너리 캔들 캐시에 담지 않음)"""
+    store = get_candle_store()
+    if store is not None:
+        return await store.load_columns(interval, market_code, count, fields)
+    return decode_candles(await fetch_candle_history(interval, market_code, count), fields)
+
+async def fetch_backend_columns(interval: CandleInterval, market_code: str, count: int,
+                                fields: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    캐시 백엔드를 거쳐 캔들 컬럼 조회
+
+    확정 캔들은 마지막 확정 캔들 시작 시각을 키에 담아 다음 캔들 경계까지 보관하고,
+    진행 중인 캔들만 LIVE_CANDLE_TTL 동안 따로 보관합니다. 확정 캔들이 백엔드에 있으면
+    진행 중인 캔들만 새로 받으므로, 여러 서버가 한 백엔드를 쓰면 긴 이력은 한 서버만 업비트에서 받습니다.
+    """
+    backend = get_cache_backend()
+    now = time.time()
+    live_start = interval.floor(now)
+    until_boundary = max(1.0, live_start + interval.seconds - now)
+    closed_key = candle_cache_key(interval, market_code, live_start - interval.seconds, count)
+    live_key = candle_cache_key(interval, market_code, live_start, "live")
+
+    closed_payload, live_payload = await asyncio.gather(backend.get(closed_key), backend.get(live_key))
+    if closed_payload is not None and live_payload is not None:
+        return join_live(decode_columns(closed_payload), decode_columns(live_payload), count)
+
+    if closed_payload is not None:
+        _, live = split_live(await load_candle_columns(interval, market_code, 1, fields), live_start)
+        columns = join_live(decode_columns(closed_payload), live, count)
+    else:
+        columns = await load_candle_columns(interval, market_code, count, fields)
+        closed, live = split_live(columns, live_start)
+        await backend.set(closed_key, encode_columns(closed), until_boundary)
+    await backend.set(live_key, encode_columns(live), min(LIVE_CANDLE_TTL, until_boundary))
+    return columns
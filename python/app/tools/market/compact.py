@@ -0,0 +1,276 @@
+import asyncio
+import logging
+import os
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.tools.market.cache import LIVE_CANDLE_TTL, MAX_CACHE_ENTRIES
+from app.tools.market.candles import CandleInterval
+from app.tools.market.client import loop_local
+
+# 가격 배율을 함께 쓰는 컬럼 (일봉의 전일 종가·변화액도 같은 호가 단위)
+PRICE_FIELDS = ("opening_price", "high_price", "low_price", "trade_price", "prev_closing_price", "change_price")
+# float32 가수부(24비트)로 정확히 표현되는 정수 범위
+FLOAT32_EXACT_LIMIT = 2 ** 24
+# float64로 정확히 표현되는 정수 범위
+FLOAT64_EXACT_LIMIT = 2 ** 53
+# 가격 배율 10^e의 지수 탐색 범위 (큰 값부터)
+PRICE_EXPONENTS = range(9, -9, -1)
+# 정수로 저장할 컬럼의 소수 자릿수 탐색 범위 (업비트 수량은 소수 8자리)
+INTEGER_DECIMALS = range(0, 9)
+
+# 컬럼 저장 방식: ("price", e) float32 정수 × 10^e, ("lossy", None) float32 그대로,
+# ("int32" | "int64", d) 정수 × 10^-d, ("float64", None) 원본
+Codec = Tuple[str, Optional[int]]
+CandleLoader = Callable[[CandleInterval, str, int, Sequence[str]], Awaitable[Dict[str, np.ndarray]]]
+
+def _scale_down(values: np.ndarray, exponent: int) -> np.ndarray:
+    # 10^e는 e >= 0일 때만 정확하므로 음수 지수는 10^-e를 곱하고 나눔
+    return values / 10.0 ** exponent if exponent >= 0 else values * 10.0 ** -exponent
+
+def _scale_up(values: np.ndarray, exponent: int) -> np.ndarray:
+    return values * 10.0 ** exponent if exponent >= 0 else values / 10.0 ** -exponent
+
+def encode_column(values: np.ndarray, codec: Codec) -> np.ndarray:
+    kind, exponent = codec
+    if kind == "price":
+        return np.round(_scale_down(values, exponent)).astype(np.float32)
+    if kind == "lossy":
+        return values.astype(np.float32)
+    if kind in ("int32", "int64"):
+        return np.round(_scale_up(values, exponent)).astype(kind)
+    return np.asarray(values, dtype=np.float64)
+
+def decode_column(stored: np.ndarray, codec: Codec) -> np.ndarray:
+    """저장된 컬럼 → float64 (분석에 넘기는 구간만 변환)"""
+    kind, exponent = codec
+    if kind == "price":
+        return _scale_up(stored.astype(np.float64), exponent)
+    if kind in ("int32", "int64"):
+        return _scale_down(stored.astype(np.float64), exponent)
+    return stored.astype(np.float64)
+
+def fits(values: np.ndarray, codec: Codec) -> bool:
+    """값을 이 방식으로 저장해도 되는지 (정확한 방식은 되돌렸을 때 원래 값과 같아야 함)"""
+    kind, exponent = codec
+    if kind in ("lossy", "float64") or not len(values):
+        return True
+    limit = FLOAT32_EXACT_LIMIT if kind == "price" else np.iinfo(kind).max if kind == "int32" else FLOAT64_EXACT_LIMIT
+    scaled = _scale_down(values, exponent) if kind == "price" else _scale_up(values, exponent)
+    if not np.isfinite(scaled).all() or np.abs(scaled).max() > limit:
+        return False
+    return bool(np.array_equal(decode_column(encode_column(values, codec), codec), values))
+
+def price_codec(values: np.ndarray) -> Codec:
+    """
+    마켓의 가격 배율 선택
+
+    업비트 가격은 호가 단위의 정수배이므로 모든 가격이 q × 10^e (|q| <= 2^24인 정수)가 되는
+    가장 큰 e를 찾습니다. 없으면 float32로 반올림해 저장합니다 (상대 오차 2^-24 이하).
+    """
+    for exponent in PRICE_EXPONENTS:
+        codec = ("price", exponent)
+        if fits(values, codec):
+            return codec
+        if len(values) and np.abs(_scale_down(values, exponent)).max() > FLOAT32_EXACT_LIMIT:
+            # 지수를 더 줄이면 q만 커지므로 중단
+            break
+    return ("lossy", None)
+
+def integer_codec(values: np.ndarray) -> Codec:
+    """소수 d자리 고정소수점 정수로 정확히 표현되면 정수 컬럼, 아니면 float64 그대로"""
+    for decimals in INTEGER_DECIMALS:
+        for kind in ("int32", "int64"):
+            if fits(values, (kind, decimals)):
+                return (kind, decimals)
+    return ("float64", None)
+
+class CompactSeries:
+    """
+    캔들 시계열 1개의 압축 컬럼 (시간순)
+
+    - 가격: 마켓별 배율 10^e로 나눈 정수를 float32로 저장. 호가 단위 위의 가격은 되돌리면
+      원래 float64 값과 비트 단위로 같고, 배율을 찾지 못한 마켓만 상대 오차 2^-24 이하로 반올림됩니다.
+    - 거래량 등 그 밖의 수치: 소수 8자리 안에서 정확한 고정소수점 정수면 int32/int64, 아니면 float64 그대로.
+    - candle_time: int64 그대로
+
+    분봉 1개가 float64 컬럼으로 56바이트, 업비트 응답 딕셔너리로는 1KB 이상인 데 비해 32~40바이트입니다.
+    """
+
+    def __init__(self, times: np.ndarray, columns: Dict[str, np.ndarray], codecs: Dict[str, Codec]):
+        self.times = times
+        self.columns = columns
+        self.codecs = codecs
+
+    @classmethod
+    def encode(cls, columns: Dict[str, np.ndarray]) -> "CompactSeries":
+        """float64 컬럼(candle_time 포함) → 압축 시계열 (저장 방식 새로 선택)"""
+        prices = [values for name, values in columns.items() if name in PRICE_FIELDS]
+        shared = price_codec(np.concatenate(prices)) if prices else ("lossy", None)
+        codecs = {
+            name: shared if name in PRICE_FIELDS else integer_codec(values)
+            for name, values in columns.items() if name != "candle_time"
+        }
+        return cls(
+            np.ascontiguousarray(columns["candle_time"], dtype=np.int64),
+            {name: encode_column(columns[name], codec) for name, codec in codecs.items()},
+            codecs
+        )
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @property
+    def nbytes(self) -> int:
+        return self.times.nbytes + sum(values.nbytes for values in self.columns.values())
+
+    def decode(self, count: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """최근 count개(없으면 전체)만 float64 컬럼으로 복원"""
+        return self.decode_range(0 if count is None else max(0, len(self) - count), len(self))
+
+    def decode_range(self, start: int, stop: int) -> Dict[str, np.ndarray]:
+        decoded = {"candle_time": self.times[start:stop].copy()}
+        for name, codec in self.codecs.items():
+            decoded[name] = decode_column(self.columns[name][start:stop], codec)
+        return decoded
+
+    def merge(self, columns: Dict[str, np.ndarray], limit: int) -> "CompactSeries":
+        """
+        새로 받은 최근 구간(float64, 시간순)을 이어 붙이고 최근 limit개만 남김
+
+        새 구간 첫 캔들 이전의 보관분은 그대로 두고 그 이후(진행 중이던 캔들 포함)는 새 값으로 바꿉니다.
+        새 값이 지금 저장 방식에 맞지 않으면 (호가 단위 변경 등) 전체를 다시 인코딩합니다.
+        """
+        size = len(columns["candle_time"])
+        if not size:
+            return self
+        if set(columns) - {"candle_time"} != set(self.codecs):
+            return CompactSeries.encode({name: values[-limit:] for name, values in columns.items()})
+
+        keep = int(np.searchsorted(self.times, columns["candle_time"][0]))
+        # 보관분 [old_start:keep] + 새 구간 [new_start:] 이 limit개를 넘지 않도록 앞쪽부터 버림
+        drop = max(0, keep + size - limit)
+        old_start, new_start = min(drop, keep), max(0, drop - keep)
+        if not all(fits(columns[name], codec) for name, codec in self.codecs.items()):
+            old = self.decode_range(old_start, keep)
+            return CompactSeries.encode({
+                name: np.concatenate((old[name], values[new_start:])) for name, values in columns.items()
+            })
+        return CompactSeries(
+            np.concatenate((self.times[old_start:keep], columns["candle_time"][new_start:])),
+            {
+                name: np.concatenate((stored[old_start:keep], encode_column(columns[name][new_start:], self.codecs[name])))
+                for name, stored in self.columns.items()
+            },
+            self.codecs
+        )
+
+@dataclass
+class CompactEntry:
+    """(마켓, 캔들 단위) 하나의 압축 캐시 항목 (final_before 등은 CandleSeries와 같은 의미)"""
+    series: Optional[CompactSeries] = None
+    final_before: int = 0
+    live_expires_at: float = 0.0
+    exhausted: bool = False
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+class CompactCandleCache:
+    """
+    메모리에 긴 캔들 이력을 보관하는 압축 캐시 (선택)
+
+    CandleCache와 같은 캔들 경계 규칙으로 마지막 확정 캔들 이후 구간만 받아 이어 붙이므로,
+    서버가 떠 있는 동안 마켓마다 최대 max_candles개까지 이력이 쌓입니다.
+    분석에는 요청한 개수만 float64로 복원해 넘기므로 지표 계산 정밀도는 그대로입니다.
+    """
+
+    def __init__(self, max_candles: int, max_entries: int = MAX_CACHE_ENTRIES, live_ttl: float = LIVE_CANDLE_TTL):
+        self.max_candles = max_candles
+        self.max_entries = max_entries
+        self.live_ttl = live_ttl
+        self._entries: "OrderedDict[Tuple[str, str], CompactEntry]" = OrderedDict()
+
+    def _entry(self, interval: CandleInterval, market_code: str) -> CompactEntry:
+        # 마켓 코드는 캐시 키와 로그에 계속 쓰이므로 하나의 문자열 객체로 공유
+        key = (sys.intern(market_code), interval.name)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = CompactEntry()
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self._entries.move_to_end(key)
+        return entry
+
+    async def get(self, interval: CandleInterval, market_code: str, count: int, fields: Sequence[str],
+                  loader: CandleLoader) -> Dict[str, np.ndarray]:
+        """
+        최신 캔들 count개를 float64 컬럼(시간순)으로 반환
+
+        Args:
+            loader: 모자란 구간을 (interval, market_code, 개수, fields)로 받아 오는 함수
+        """
+        entry = self._entry(interval, market_code)
+        limit = max(self.max_candles, count)
+
+        async with entry.lock:
+            now = time.time()
+            current_start = interval.floor(now)
+            missing = (current_start - entry.final_before) // interval.seconds + 1
+
+            if entry.series is None or missing > max(count, len(entry.series)):
+                # 처음이거나 마지막 확정 캔들과 지금 사이가 보관분보다 벌어졌으면 새로 채움
+                columns = await loader(interval, market_code, count, fields)
+                entry.series = CompactSeries.encode(columns)
+                entry.exhausted = len(columns["candle_time"]) < count
+                self._mark_fresh(entry, interval, current_start)
+            elif (len(entry.series) < count and not entry.exhausted) or missing > 1 or \
+                    time.monotonic() >= entry.live_expires_at:
+                # 새로 바뀐 구간(보관분이 모자라면 count개)만 받아 이어 붙임
+                fetch = count if len(entry.series) < count and not entry.exhausted else missing
+                columns = await loader(interval, market_code, fetch, fields)
+                if fetch == count:
+                    entry.exhausted = len(columns["candle_time"]) < count
+                entry.series = entry.series.merge(columns, limit)
+                self._mark_fresh(entry, interval, current_start)
+
+            return entry.series.decode(count)
+
+    def _mark_fresh(self, entry: CompactEntry, interval: CandleInterval, current_start: int) -> None:
+        entry.final_before = current_start
+        until_boundary = current_start + interval.seconds - time.time()
+        entry.live_expires_at = time.monotonic() + max(0.0, min(self.live_ttl, until_boundary))
+
+    def stats(self) -> Dict[str, int]:
+        """보관 중인 시리즈 수, 캔들 수, 바이트 수"""
+        series = [entry.series for entry in self._entries.values() if entry.series is not None]
+        return {
+            "series": len(series),
+            "candles": sum(len(item) for item in series),
+            "bytes": sum(item.nbytes for item in series),
+        }
+
+    def invalidate(self, market_code: Optional[str] = None) -> None:
+        """캐시 비우기 (market_code 지정 시 해당 마켓만)"""
+        if market_code is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if key[0] == market_code]:
+            del self._entries[key]
+
+def create_compact_cache() -> Optional[CompactCandleCache]:
+    """CANDLE_COMPACT_CANDLES 환경 변수 개수로 압축 캐시 생성 (빈 값이나 0이면 None)"""
+    value = os.getenv("CANDLE_COMPACT_CANDLES", "")
+    try:
+        max_candles = int(value) if value else 0
+    except ValueError:
+        logging.error(f"CANDLE_COMPACT_CANDLES 값이 올바르지 않음: {value}")
+        return None
+    return CompactCandleCache(max_candles) if max_candles > 0 else None
+
+def get_compact_cache() -> Optional[CompactCandleCache]:
+    """프로세스 전역 압축 캔들 캐시 반환 (사용하지 않으면 None)"""
+    return loop_local("compact_cache", create_compact_cache)
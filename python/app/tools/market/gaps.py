@@ -0,0 +1,156 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.tools.market.candles import CANDLE_PAGE_SIZE, CandleInterval, format_to, interval_by_name
+from app.tools.market.client import fetch_json_if_idle, loop_local
+from app.tools.market.store import CandleStore, get_candle_store
+
+# 저장소 전체 구멍 검사 주기(초)
+BACKFILL_SCAN_INTERVAL = 60.0
+
+@dataclass(frozen=True)
+class CandleGap:
+    """저장된 시계열의 구멍 [start, end) (캔들 시작 시각, epoch 밀리초)"""
+    start: int
+    end: int
+    step: int
+
+    @property
+    def missing(self) -> int:
+        """빠진 캔들 수 (거래가 없어 원래 없는 캔들 포함)"""
+        return (self.end - self.start) // self.step
+
+def find_gaps(times: np.ndarray, interval: CandleInterval,
+              verified: Sequence[Tuple[int, int]] = ()) -> List[CandleGap]:
+    """
+    시간순 캔들 시각 배열에서 구멍 찾기
+
+    이웃한 캔들의 간격이 캔들 단위보다 크면 구멍으로 봅니다.
+    업비트는 거래가 없던 캔들을 돌려주지 않으므로, 이미 업비트에 확인한 구간(verified, 시작 시각순)은 구멍에서 뺍니다.
+    """
+    step = interval.seconds * 1000
+    positions = np.flatnonzero(np.diff(times) > step)
+    gaps = []
+    for position in positions:
+        start, end = int(times[position]) + step, int(times[position + 1])
+        # 확인한 구간은 구멍 끝에서부터 채워 나가므로 끝을 당겨 남은 부분만 남김
+        for verified_start, verified_end in reversed(verified):
+            if verified_start < end <= verified_end:
+                end = max(start, verified_start)
+        if end > start:
+            gaps.append(CandleGap(start, end, step))
+    return gaps
+
+class GapBackfiller:
+    """
+    저장소 시계열의 구멍을 채우는 저우선순위 백그라운드 작업
+
+    장애나 재시작으로 생긴 구멍은 이동평균, 볼린저 밴드, ATR 같은 구간 지표를 조용히 왜곡합니다.
+    주기적으로 저장된 모든 시계열을 검사해, 구멍 끝 시각을 to로 삼아 최신 쪽부터 거슬러 채웁니다.
+    요청은 남는 요청 예산이 있을 때만 보내므로 대화형 분석 요청을 기다리게 하지 않습니다.
+    """
+
+    def __init__(self, store: CandleStore, scan_interval: float = BACKFILL_SCAN_INTERVAL):
+        self.store = store
+        self.scan_interval = scan_interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def gaps(self, interval: CandleInterval, market_code: str) -> List[CandleGap]:
+        times = await asyncio.to_thread(self.store.read_times, interval, market_code)
+        verified = await asyncio.to_thread(self.store.verified_ranges, interval, market_code)
+        return find_gaps(times, interval, verified)
+
+    async def fill(self, interval: CandleInterval, market_code: str, gap: CandleGap) -> bool:
+        """
+        구멍 1페이지 채우기
+
+        Returns:
+            요청을 보냈으면 True, 남는 요청 예산이 없어 보내지 않았으면 False
+        """
+        count = min(gap.missing, CANDLE_PAGE_SIZE)
+        page = await fetch_json_if_idle("candles", interval.url, {
+            "market": market_code,
+            "count": count,
+            "to": format_to(gap.end // 1000)
+        })
+        if page is None:
+            return False
+
+        await asyncio.to_thread(self.store.upsert, interval, market_code, page)
+        # 받은 페이지는 [가장 오래된 캔들, gap.end) 구간을 빠짐없이 담고 있음
+        # (페이지가 요청보다 짧으면 상장 시점까지 더 이상 캔들이 없음)
+        covered_from = gap.start
+        if len(page) == count:
+            oldest = np.datetime64(page[-1]["candle_date_time_utc"], "ms").astype(np.int64)
+            covered_from = max(gap.start, int(oldest))
+        await asyncio.to_thread(self.store.mark_verified, interval, market_code, covered_from, gap.end)
+        logging.debug(f"캔들 구멍 채움: {market_code} {interval.name} {format_to(covered_from // 1000)} ~ {format_to(gap.end // 1000)}")
+        return True
+
+    async def run_once(self) -> int:
+        """
+        저장된 모든 시계열의 구멍을 채움 (보낸 요청 수 반환)
+
+        한 시계열이 실패해도 (상장 폐지된 마켓, 업비트 장애 등) 기록만 하고 다음 시계열로 넘어가고,
+        남는 요청 예산이 없으면 그 시계열은 다음 검사 때 이어서 채웁니다.
+        """
+        requests = 0
+        for market_code, interval_name in await asyncio.to_thread(self.store.series):
+            try:
+                interval = interval_by_name(interval_name)
+            except ValueError:
+                continue
+            try:
+                requests += await self.fill_series(interval, market_code)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"캔들 구멍 채우기 실패 ({market_code} {interval_name}): {e!r}")
+        return requests
+
+    async def fill_series(self, interval: CandleInterval, market_code: str) -> int:
+        """시계열 하나의 구멍을 예산이 허락하는 만큼 채움 (보낸 요청 수 반환)"""
+        requests = 0
+        gaps = await self.gaps(interval, market_code)
+        while gaps and await self.fill(interval, market_code, gaps[-1]):
+            requests += 1
+            gaps = await self.gaps(interval, market_code)
+        return requests
+
+    def start(self) -> None:
+        """백그라운드 채우기 시작 (이미 실행 중이면 무시)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                requests = await self.run_once()
+                if requests:
+                    logging.info(f"캔들 구멍 채우기 완료: 요청 {requests}회")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"캔들 구멍 채우기 실패: {e}")
+            await asyncio.sleep(self.scan_interval)
+
+def create_gap_backfiller() -> Optional[GapBackfiller]:
+    store = get_candle_store()
+    return GapBackfiller(store) if store is not None else None
+
+def get_gap_backfiller() -> Optional[GapBackfiller]:
+    """프로세스 전역 구멍 채우기 작업 반환 (캔들 저장소를 쓰지 않으면 None)"""
+    return loop_local("gap_backfiller", create_gap_backfiller)
@@ -0,0 +1,45 @@
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional
+
+@dataclass
+class HedgePolicy:
+    """
+    헤지 요청 설정
+
+    응답이 최근 지연 시간의 percentile 값을 넘도록 오지 않으면 같은 요청을 한 번 더 보내고,
+    먼저 도착한 응답을 사용합니다.
+    """
+    enabled: bool = True
+    percentile: float = 0.95
+    # 지연 분포를 신뢰하기 위한 최소 표본 수
+    min_samples: int = 20
+    # 헤지 대기 시간 하한/상한(초)
+    min_delay: float = 0.05
+    max_delay: float = 2.0
+
+class LatencyTracker:
+    """엔드포인트 그룹별 최근 응답 지연 시간 기록"""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self.samples: Dict[str, Deque[float]] = {}
+
+    def record(self, group: str, seconds: float) -> None:
+        self.samples.setdefault(group, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, group: str, q: float) -> Optional[float]:
+        samples = self.samples.get(group)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[index]
+
+    def hedge_delay(self, group: str, policy: HedgePolicy) -> Optional[float]:
+        """헤지 요청을 보내기까지 기다릴 시간 (헤지하지 않으면 None)"""
+        if not policy.enabled or len(self.samples.get(group, ())) < policy.min_samples:
+            return None
+        delay = self.percentile(group, policy.percentile)
+        return min(policy.max_delay, max(policy.min_delay, delay))
@@ -0,0 +1,84 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from mcp.server.fastmcp import FastMCP
+
+from app.tools.market.backend import get_cache_backend
+from app.tools.market.catalog import get_market_catalog
+from app.tools.market.client import close_http_client, get_http_client
+from app.tools.market.gaps import get_gap_backfiller
+from app.tools.market.shared import get_shared_cache
+from app.tools.market.snapshot import get_cache_snapshotter
+from app.tools.market.store import get_candle_store
+from app.tools.market.stream import get_ticker_stream
+
+async def start_upstream() -> None:
+    """
+    업비트 연동 자원 시작 (여러 번 호출해도 한 번만 시작)
+
+    - HTTP 클라이언트(커넥션 풀)
+    - 마켓 목록 백그라운드 갱신
+    - 웹소켓 티커 수집 (UPBIT_STREAM_MARKETS 설정 시)
+    - 워커 간 공유 메모리 캐시 갱신 (SHARED_CACHE_NAME 설정 시)
+    - 캔들 저장소 구멍 채우기 (저장소 사용 시)
+    - 메모리 캐시 스냅샷 복원과 주기적 저장 (CACHE_SNAPSHOT_PATH)
+    """
+    get_http_client()
+    snapshotter = get_cache_snapshotter()
+    if snapshotter is not None:
+        # 마켓 목록 갱신을 시작하기 전에 복원해 첫 요청부터 캐시로 응답
+        await snapshotter.restore()
+        snapshotter.start()
+    get_market_catalog().start()
+    stream = get_ticker_stream()
+    if stream is not None:
+        stream.start()
+    shared = get_shared_cache()
+    if shared is not None:
+        shared.start()
+    backfiller = get_gap_backfiller()
+    if backfiller is not None:
+        backfiller.start()
+
+async def stop_upstream() -> None:
+    """업비트 연동 자원 정리 (마지막 캐시 스냅샷 저장 포함)"""
+    stream = get_ticker_stream()
+    if stream is not None:
+        await stream.stop()
+    shared = get_shared_cache()
+    if shared is not None:
+        await shared.stop()
+        shared.close()
+    backfiller = get_gap_backfiller()
+    if backfiller is not None:
+        await backfiller.stop()
+    snapshotter = get_cache_snapshotter()
+    if snapshotter is not None:
+        await snapshotter.stop()
+        await snapshotter.save()
+    await get_market_catalog().stop()
+    await get_cache_backend().close()
+    await close_http_client()
+    store = get_candle_store()
+    if store is not None:
+        store.close()
+
+@asynccontextmanager
+async def upstream_resources() -> AsyncIterator[None]:
+    """전송 계층(stdio, HTTP 서버)이 떠 있는 동안 업비트 연동 자원 유지, 끝나면 정리"""
+    await start_upstream()
+    try:
+        yield
+    finally:
+        await stop_upstream()
+
+@asynccontextmanager
+async def upstream_lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """
+    FastMCP 서버 lifespan에서 업비트 연동 자원 시작
+
+    stateless HTTP 모드에서는 lifespan이 요청마다 실행되므로 여기서는 시작만 보장하고,
+    정리는 전송 계층 수명에 묶인 upstream_resources가 맡습니다 (app.main 참고).
+    """
+    await start_upstream()
+    yield
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+# 업비트 Quotation API 그룹별 초당 요청 제한
+DEFAULT_GROUP_RATES: Dict[str, int] = {
+    "market": 10,
+    "candles": 10,
+    "ticker": 10,
+}
+DEFAULT_RATE = 10
+
+# 429 응답 시 그룹 전체를 쉬게 하는 시간(초)
+THROTTLE_PENALTY = 1.0
+
+@dataclass
+class RemainingReq:
+    """Remaining-Req 헤더 파싱 결과 (예: 'group=candles; min=1800; sec=9')"""
+    group: str
+    sec: int
+    min: Optional[int] = None
+
+def parse_remaining_req(header: Optional[str]) -> Optional[RemainingReq]:
+    """Remaining-Req 헤더 파싱 (형식이 맞지 않으면 None)"""
+    if not header:
+        return None
+
+    fields = {}
+    for part in header.split(';'):
+        key, sep, value = part.partition('=')
+        if sep:
+            fields[key.strip()] = value.strip()
+
+    try:
+        return RemainingReq(
+            group=fields['group'],
+            sec=int(fields['sec']),
+            min=int(fields['min']) if 'min' in fields else None
+        )
+    except (KeyError, ValueError):
+        return None
+
+class TokenBucket:
+    """
+    엔드포인트 그룹 하나의 초당 요청 예산
+
+    acquire()는 토큰이 생길 때까지 대기하며, 대기자는 도착 순서대로 처리됩니다.
+    서버가 알려준 잔여 요청 수(Remaining-Req)로 로컬 토큰 수를 보정합니다.
+    """
+
+    def __init__(self, rate: int):
+        self.rate = rate
+        self.tokens = float(rate)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated_at
+        self.tokens = min(float(self.rate), self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    async def acquire(self) -> None:
+        """토큰 1개 획득 (부족하면 큐에서 대기)"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def try_acquire(self, reserve: float = 0.0) -> bool:
+        """
+        대기 없이 토큰 1개 획득 시도 (대기 중인 호출자가 있으면 실패)
+
+        reserve를 주면 획득 후에도 그만큼의 토큰이 남을 때만 성공합니다 (백그라운드 작업용).
+        """
+        if self._lock.locked():
+            return False
+        now = time.monotonic()
+        self._refill(now)
+        if now < self.blocked_until or self.tokens < 1 + reserve:
+            return False
+        self.tokens -= 1
+        return True
+
+    def observe(self, remaining: int) -> None:
+        """서버 기준 잔여 요청 수 반영"""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = min(self.tokens, float(remaining))
+        if remaining <= 0:
+            self.blocked_until = max(self.blocked_until, now + THROTTLE_PENALTY)
+
+    def throttle(self, delay: float = THROTTLE_PENALTY) -> None:
+        """429 응답 후 지정 시간 동안 그룹 요청 중단"""
+        now = time.monotonic()
+        self.tokens = 0.0
+        self.updated_at = now
+        self.blocked_until = max(self.blocked_until, now + delay)
+
+class RateLimitScheduler:
+    """엔드포인트 그룹별 토큰 버킷을 관리하는 중앙 스케줄러"""
+
+    def __init__(self, rates: Optional[Dict[str, int]] = None):
+        self.rates = dict(DEFAULT_GROUP_RATES if rates is None else rates)
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, group: str) -> TokenBucket:
+        if group not in self.buckets:
+            self.buckets[group] = TokenBucket(self.rates.get(group, DEFAULT_RATE))
+        return self.buckets[group]
+
+    async def acquire(self, group: str) -> None:
+        await self.bucket(group).acquire()
+
+    def try_acquire(self, group: str, reserve: float = 0.0) -> bool:
+        return self.bucket(group).try_acquire(reserve)
+
+    def observe(self, group: str, header: Optional[str]) -> None:
+        """응답의 Remaining-Req 헤더로 버킷 보정"""
+        remaining = parse_remaining_req(header)
+        if remaining is None:
+            return
+        # 서버가 알려준 그룹명이 호출 시 지정한 그룹과 다를 수 있으므로 서버 기준을 따름
+        self.bucket(remaining.group).observe(remaining.sec)
+        if remaining.group != group:
+            logging.debug(f"Remaining-Req 그룹 불일치: 요청={group}, 응답={remaining.group}")
+
+    def throttle(self, group: str, delay: float = THROTTLE_PENALTY) -> None:
+        logging.warning(f"업비트 요청 제한 도달 ({group}), {delay:.1f}초 대기")
+        self.bucket(group).throttle(delay)
@@ -0,0 +1,147 @@
+import re
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.tools.market.candles import (
+    DAY_INTERVAL, MAX_CANDLE_COUNT, MINUTE_UNITS, WEEK_INTERVAL, CandleInterval, extra_fields, minute_interval
+)
+from app.tools.market.columnar import fetch_candle_columns
+
+KST_OFFSET = 9 * 60 * 60
+
+# KST 자정 기준 일/주 경계 (업비트 일봉·주봉은 UTC 자정 = 09:00 KST 기준)
+KST_DAY_INTERVAL = CandleInterval("kst/days", 86400, -KST_OFFSET % 86400)
+KST_WEEK_INTERVAL = CandleInterval("kst/weeks", 7 * 86400, 4 * 86400 - KST_OFFSET)
+
+INTERVAL_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+# 재표본 기본 캔들 후보 (큰 단위부터, 적은 캔들로 묶을 수 있는 것을 먼저 고름)
+BASE_INTERVALS = (WEEK_INTERVAL, DAY_INTERVAL, *(minute_interval(minutes) for minutes in reversed(MINUTE_UNITS)))
+
+def custom_interval(spec: str, kst: bool = False) -> CandleInterval:
+    """
+    '2h', '3d', '1w' 같은 표기 → 재표본 전용 캔들 단위
+
+    Args:
+        spec: 숫자 + 단위(m, h, d, w)
+        kst: True면 KST 자정(주 단위는 월요일 00:00 KST) 경계, False면 UTC 경계
+    """
+    match = re.fullmatch(r"(\d+)([mhdw])", spec.strip().lower())
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"잘못된 캔들 단위 표기입니다: {spec} (예: 2h, 3d, 1w)")
+    unit = match.group(2)
+    seconds = int(match.group(1)) * INTERVAL_UNITS[unit]
+    # 주 단위는 월요일 경계 (epoch는 목요일)
+    offset = 4 * 86400 if unit == "w" else 0
+    if kst:
+        offset -= KST_OFFSET
+    return CandleInterval(f"{'kst' if kst else 'custom'}/{spec}", seconds, offset % seconds)
+
+def resampled_interval(name: str) -> Optional[CandleInterval]:
+    """
+    재표본 캔들 단위 이름 → CandleInterval (업비트 기본 단위 이름이면 None)
+
+    - 'custom/2h', 'custom/3d': UTC 경계
+    - 'kst/4h', 'kst/days', 'kst/weeks': KST 자정(주 단위는 월요일 00:00 KST) 경계
+    """
+    if name == KST_DAY_INTERVAL.name:
+        return KST_DAY_INTERVAL
+    if name == KST_WEEK_INTERVAL.name:
+        return KST_WEEK_INTERVAL
+    prefix, _, spec = name.partition("/")
+    if prefix in ("custom", "kst"):
+        return custom_interval(spec, kst=prefix == "kst")
+    return None
+
+def base_interval(target: CandleInterval) -> CandleInterval:
+    """
+    target 단위로 묶을 수 있는 가장 큰 업비트 캔들 단위
+
+    Raises:
+        ValueError: 나누어떨어지는 업비트 캔들 단위가 없을 때
+    """
+    for base in BASE_INTERVALS:
+        if not target.seconds % base.seconds and not (target.offset - base.offset) % base.seconds:
+            return base
+    raise ValueError(f"{target.name} 캔들을 만들 수 있는 업비트 캔들 단위가 없습니다")
+
+def resample_columns(columns: Dict[str, np.ndarray], base: CandleInterval, target: CandleInterval,
+                     count: Optional[int] = None, drop_partial_head: bool = True) -> Dict[str, np.ndarray]:
+    """
+    기본 캔들 컬럼(decode_candles 형식, 시간순)을 더 큰 캔들 단위로 묶기
+
+    - 시가: 구간 첫 캔들의 시가, 종가: 마지막 캔들의 종가
+    - 고가/저가: 구간 최대/최소
+    - 누적 거래대금·거래량: 구간 합계
+    - 업비트 일봉으로 묶을 때는 전일 종가, 변화액, 변화율도 계산
+
+    입력이 이미 시간순이므로 경계가 바뀌는 위치만 찾아 reduceat으로 한 번에 집계합니다 (정렬 없음).
+
+    Args:
+        base: 입력 캔들 단위
+        target: 묶을 캔들 단위 (base의 정수 배이고 경계가 맞아야 함)
+        count: 최신 캔들 count개만 반환 (None이면 전부)
+        drop_partial_head: 입력이 구간 중간부터 시작하면 첫 구간을 버림
+
+    Raises:
+        ValueError: target이 base로 나누어떨어지지 않을 때
+    """
+    if target.seconds % base.seconds or (target.offset - base.offset) % base.seconds:
+        raise ValueError(f"{base.name} 캔들을 {target.name} 단위로 묶을 수 없습니다")
+
+    times = columns["candle_time"]
+    fields = [name for name in columns if name != "candle_time" and name not in extra_fields(base)]
+    starts = ((times // 1000 - target.offset) // target.seconds) * target.seconds + target.offset
+
+    first = np.flatnonzero(np.diff(starts, prepend=starts[:1] - 1))
+    if drop_partial_head and len(first) and times[0] // 1000 > starts[0]:
+        first = first[1:]
+    last = np.append(first[1:], len(times)) - 1 if len(first) else first
+    begin = first[0] if len(first) else len(times)
+
+    result = {"candle_time": starts[first] * 1000}
+    for name in fields:
+        values = columns[name]
+        if name == "opening_price":
+            result[name] = values[first]
+        elif name == "trade_price":
+            result[name] = values[last]
+        elif not len(first):
+            result[name] = values[:0].copy()
+        elif name == "high_price":
+            result[name] = np.maximum.reduceat(values[begin:], first - begin)
+        elif name == "low_price":
+            result[name] = np.minimum.reduceat(values[begin:], first - begin)
+        else:
+            result[name] = np.add.reduceat(values[begin:], first - begin)
+
+    if "prev_closing_price" in extra_fields(target):
+        close = result["trade_price"]
+        if begin > 0:
+            head = columns["trade_price"][begin - 1]
+        elif "prev_closing_price" in columns and len(times):
+            head = columns["prev_closing_price"][0]
+        else:
+            head = result["opening_price"][0] if len(close) else 0.0
+        prev = np.concatenate(([head], close[:-1])) if len(close) else close.copy()
+        result["prev_closing_price"] = prev
+        result["change_price"] = close - prev
+        result["change_rate"] = np.divide(close - prev, prev, out=np.zeros_like(close), where=prev != 0)
+
+    if count is not None:
+        result = {name: values[max(0, len(values) - count):] for name, values in result.items()}
+    return {name: np.ascontiguousarray(values) for name, values in result.items()}
+
+async def fetch_resampled_columns(base: CandleInterval, target: CandleInterval,
+                                  market_code: str, count: int) -> Dict[str, np.ndarray]:
+    """
+    base 캔들 1개 시계열만 조회해 target 단위 캔들 count개 만들기
+
+    2시간봉, 3일봉처럼 업비트에 없는 캔들 단위도 같은 방식으로 얻을 수 있습니다 (get_candle_columns의 custom/, kst/ 단위).
+    base 캔들은 최대 MAX_CANDLE_COUNT개까지만 조회하므로 target 캔들이 count개보다 적을 수 있습니다.
+    """
+    ratio = target.seconds // base.seconds
+    base_count = min((count + 1) * ratio, MAX_CANDLE_COUNT)
+    columns = await fetch_candle_columns(base, market_code, base_count)
+    return resample_columns(columns, base, target, count)
@@ -0,0 +1,127 @@
+import argparse
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.tools.market.backend import RespError, read_reply
+
+DEFAULT_RESP_HOST = "127.0.0.1"
+DEFAULT_RESP_PORT = 6380
+
+OK = b"+OK\r\n"
+
+def _bulk(value: Optional[bytes]) -> bytes:
+    return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+def _error(message: str) -> bytes:
+    return f"-ERR {message}\r\n".encode()
+
+class RespServer:
+    """
+    Redis 프로토콜(RESP) 캐시 서버 로컬 대체
+
+    Redis 없이 개발·테스트 환경에서 여러 서버 인스턴스가 캐시를 공유하도록 캐시 백엔드가 쓰는
+    명령(GET, SET EX/PX/NX/XX, DEL, EXISTS, PING 등)만 메모리 딕셔너리로 구현합니다.
+    만료된 키는 조회할 때 지우며, 데이터는 저장하지 않습니다.
+    """
+
+    def __init__(self):
+        # 키 → (값, 만료 시각(monotonic) 또는 None)
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self.data[key]
+            return None
+        return value
+
+    def _set(self, args: List[bytes]) -> bytes:
+        key, value, options = args[0], args[1], [arg.upper() for arg in args[2:]]
+        expires_at = None
+        if b"NX" in options and self._get(key) is not None:
+            return _bulk(None)
+        if b"XX" in options and self._get(key) is None:
+            return _bulk(None)
+        for unit, scale in ((b"EX", 1.0), (b"PX", 0.001)):
+            if unit in options:
+                position = options.index(unit) + 1
+                if position >= len(options) or not options[position].isdigit():
+                    return _error("syntax error")
+                expires_at = time.monotonic() + int(options[position]) * scale
+        self.data[key] = (value, expires_at)
+        return OK
+
+    def execute(self, args: List[bytes]) -> bytes:
+        """명령 1개 실행 → RESP 응답"""
+        command = args[0].upper().decode(errors="replace")
+        args = args[1:]
+        if command == "PING":
+            return _bulk(args[0]) if args else b"+PONG\r\n"
+        if command == "ECHO" and len(args) == 1:
+            return _bulk(args[0])
+        if command == "GET" and len(args) == 1:
+            return _bulk(self._get(args[0]))
+        if command == "SET" and len(args) >= 2:
+            return self._set(args)
+        if command == "DEL" and args:
+            removed = [key for key in args if self._get(key) is not None]
+            for key in removed:
+                self.data.pop(key, None)
+            return b":%d\r\n" % len(removed)
+        if command == "EXISTS" and args:
+            return b":%d\r\n" % sum(self._get(key) is not None for key in args)
+        if command == "DBSIZE":
+            return b":%d\r\n" % sum(self._get(key) is not None for key in list(self.data))
+        if command in ("FLUSHDB", "FLUSHALL"):
+            self.data.clear()
+            return OK
+        if command in ("SELECT", "AUTH", "CLIENT"):
+            # DB 구분·인증 없이 모두 허용
+            return OK
+        return _error(f"unknown command '{command}' or wrong number of arguments")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    args = await read_reply(reader)
+                except (ConnectionError, EOFError):
+                    break
+                except (RespError, ValueError) as e:
+                    writer.write(_error(f"protocol error: {e}"))
+                    break
+                if not isinstance(args, list) or not args or not all(isinstance(arg, bytes) for arg in args):
+                    writer.write(_error("protocol error: expected array of bulk strings"))
+                    break
+                if args[0].upper() == b"QUIT":
+                    writer.write(OK)
+                    break
+                writer.write(self.execute(args))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = DEFAULT_RESP_HOST, port: int = DEFAULT_RESP_PORT) -> asyncio.Server:
+        """서버 시작 (반환된 asyncio.Server로 종료)"""
+        server = await asyncio.start_server(self.handle, host, port)
+        logging.info(f"RESP 캐시 서버 시작: {host}:{port}")
+        return server
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="캐시 백엔드용 로컬 RESP 서버")
+    parser.add_argument("--host", default=DEFAULT_RESP_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_RESP_PORT)
+    options = parser.parse_args()
+
+    server = await RespServer().serve(options.host, options.port)
+    async with server:
+        await server.serve_forever()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
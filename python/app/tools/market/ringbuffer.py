@@ -0,0 +1,175 @@
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.tools.market.candles import CANDLE_PRICE_FIELDS, CandleInterval
+from app.tools.market.client import loop_local
+
+# 마켓별 링 버퍼 기본 크기 (30분봉 48개 = 24시간)
+DEFAULT_RING_CAPACITY = 48
+
+class CandleRing:
+    """
+    고정 크기 NumPy 링 버퍼 (마켓 1개, 캔들 단위 1개)
+
+    각 값을 i와 i + capacity 두 위치에 함께 써 두면, 최근 n개 캔들이 항상
+    배열의 연속 구간에 놓이므로 복사 없이 연속된 뷰를 돌려줄 수 있습니다.
+    진행 중인 캔들 갱신과 새 캔들로 넘어가기 모두 O(1)이며 메모리 사용량은 고정입니다.
+
+    REST로 버퍼를 채우는 동안 들어온 체결은 begin_seed()가 돌려준 목록에 모아 두었다가
+    load()가 조회 결과를 채운 뒤 다시 반영하므로, 조회와 적재 사이의 체결이 빠지지 않습니다.
+    """
+
+    def __init__(self, interval: CandleInterval, capacity: int = DEFAULT_RING_CAPACITY,
+                 fields: Sequence[str] = CANDLE_PRICE_FIELDS):
+        self.interval = interval
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self.times = np.zeros(2 * capacity, dtype=np.int64)
+        self.values = {field: np.zeros(2 * capacity, dtype=np.float64) for field in self.fields}
+        self.size = 0
+        # 다음에 쓸 위치 (0 <= head < capacity)
+        self.head = 0
+        self.seeded_at = 0.0
+        self.updated_at = 0.0
+        # 진행 중인 REST 적재별로 그동안 들어온 체결 (체결 시각, 가격, 수량)
+        self._seeding: List[List[Tuple[int, float, float]]] = []
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def last_time(self) -> Optional[int]:
+        if self.size == 0:
+            return None
+        return int(self.times[self.head - 1 + self.capacity])
+
+    def _write(self, index: int, candle_time: int, values: Dict[str, float]) -> None:
+        for position in (index, index + self.capacity):
+            self.times[position] = candle_time
+            for field, value in values.items():
+                self.values[field][position] = value
+
+    def update(self, candle_time: int, values: Dict[str, float]) -> None:
+        """
+        캔들 1개 반영
+
+        - 마지막 캔들과 같은 시각: 제자리 덮어쓰기
+        - 더 최근 시각: 가장 오래된 칸을 재사용해 새 캔들로 넘어감
+        - 더 오래된 시각: 무시
+        """
+        last = self.last_time
+        if last is not None and candle_time < last:
+            return
+        if last is None or candle_time > last:
+            self.head = (self.head + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+        self._write((self.head - 1) % self.capacity, candle_time, values)
+        self.updated_at = time.monotonic()
+
+    def apply_trade(self, trade_timestamp: int, price: float, volume: float) -> None:
+        """체결 1건을 해당 캔들에 누적 (epoch 밀리초)"""
+        for trades in self._seeding:
+            trades.append((trade_timestamp, price, volume))
+        self._accumulate(trade_timestamp, price, volume)
+
+    def _accumulate(self, trade_timestamp: int, price: float, volume: float) -> None:
+        candle_time = self.interval.floor(trade_timestamp / 1000) * 1000
+        last = self.last_time
+        if last is not None and candle_time < last:
+            return
+        if candle_time == last:
+            index = (self.head - 1) % self.capacity + self.capacity
+            values = {
+                "high_price": max(self.values["high_price"][index], price),
+                "low_price": min(self.values["low_price"][index], price),
+                "trade_price": price,
+                "candle_acc_trade_price": self.values["candle_acc_trade_price"][index] + price * volume,
+                "candle_acc_trade_volume": self.values["candle_acc_trade_volume"][index] + volume,
+            }
+        else:
+            values = {
+                "opening_price": price,
+                "high_price": price,
+                "low_price": price,
+                "trade_price": price,
+                "candle_acc_trade_price": price * volume,
+                "candle_acc_trade_volume": volume,
+            }
+        self.update(candle_time, values)
+
+    def begin_seed(self) -> List[Tuple[int, float, float]]:
+        """REST 조회 직전에 호출: load()/end_seed()까지 들어오는 체결을 모을 목록 반환"""
+        trades: List[Tuple[int, float, float]] = []
+        self._seeding.append(trades)
+        return trades
+
+    def end_seed(self, trades: List[Tuple[int, float, float]]) -> None:
+        """적재를 포기했을 때 체결 모으기 중단"""
+        self._seeding = [pending for pending in self._seeding if pending is not trades]
+
+    def load(self, columns: Dict[str, np.ndarray], trades: Optional[List[Tuple[int, float, float]]] = None) -> None:
+        """
+        시간순 컬럼(decode_candles 형식)으로 버퍼 전체를 다시 채움
+
+        trades(begin_seed()의 반환값)를 주면 조회를 시작한 뒤 들어온 체결을 이어서 반영합니다.
+        조회 결과에 이미 담긴 체결이 다시 더해질 수 있는 구간은 조회 요청 왕복 시간 정도입니다.
+        """
+        times = columns["candle_time"][-self.capacity:]
+        n = len(times)
+        self.times[:n] = times
+        self.times[self.capacity:self.capacity + n] = times
+        for field in self.fields:
+            values = columns[field][-self.capacity:]
+            self.values[field][:n] = values
+            self.values[field][self.capacity:self.capacity + n] = values
+        self.size = n
+        self.head = n % self.capacity
+        self.seeded_at = self.updated_at = time.monotonic()
+        if trades is not None:
+            self.end_seed(trades)
+            for trade in trades:
+                self._accumulate(*trade)
+
+    def view(self, count: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        최근 count개 캔들의 연속된 뷰 (시간순, decode_candles 형식)
+
+        뷰는 버퍼와 메모리를 공유하므로 이후 갱신이 반영됩니다. 보관하려면 복사해야 합니다.
+        """
+        count = self.size if count is None else min(count, self.size)
+        # 두 번째 사본의 [head, head + capacity) 구간에 최근 캔들이 시간순으로 놓여 있음
+        end = self.head + self.capacity
+        start = end - count
+        columns = {"candle_time": self.times[start:end]}
+        for field in self.fields:
+            columns[field] = self.values[field][start:end]
+        return columns
+
+class RingRegistry:
+    """(마켓, 캔들 단위)별 링 버퍼 모음"""
+
+    def __init__(self):
+        self.rings: Dict[Tuple[str, str], CandleRing] = {}
+
+    def get(self, interval: CandleInterval, market_code: str) -> Optional[CandleRing]:
+        return self.rings.get((market_code, interval.name))
+
+    def track(self, interval: CandleInterval, market_code: str, capacity: int = DEFAULT_RING_CAPACITY) -> CandleRing:
+        """링 버퍼 반환 (없거나 요청보다 작으면 새로 할당)"""
+        key = (market_code, interval.name)
+        ring = self.rings.get(key)
+        if ring is None or ring.capacity < capacity:
+            ring = self.rings[key] = CandleRing(interval, max(capacity, DEFAULT_RING_CAPACITY))
+        return ring
+
+    def feed_trade(self, market_code: str, trade_timestamp: int, price: float, volume: float) -> None:
+        """마켓의 모든 링 버퍼에 체결 1건 반영"""
+        for (market, _), ring in self.rings.items():
+            if market == market_code:
+                ring.apply_trade(trade_timestamp, price, volume)
+
+def get_ring_registry() -> RingRegistry:
+    """프로세스 전역 링 버퍼 모음 반환 (이벤트 루프별로 1개)"""
+    return loop_local("ring_registry", RingRegistry)
@@ -0,0 +1,371 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import zlib
+from dataclasses import asdict
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.tools.market.batch import fetch_tickers
+from app.tools.market.cache import LIVE_CANDLE_TTL, get_candle_cache
+from app.tools.market.candles import (
+    CANDLE_PRICE_FIELDS, DAILY_EXTRA_FIELDS, CandleInterval, extra_fields, interval_by_name
+)
+from app.tools.market.client import loop_local
+
+# 인덱스 슬롯 수 (공유할 수 있는 캔들 시리즈·티커 수)
+INDEX_SLOTS = 256
+# 인덱스 키 최대 길이 (바이트)
+KEY_SIZE = 40
+# 시리즈당 최대 캔들 수 (이보다 많이 요청하면 공유 캐시를 거치지 않음)
+SHARED_SERIES_CAPACITY = 1000
+# 티커 JSON 최대 크기 (바이트)
+TICKER_PAYLOAD_SIZE = 2048
+# 쓰기 프로세스 갱신 주기(초)
+SHARED_REFRESH_INTERVAL = 1.0
+# 이 시간(초)보다 오래된 데이터는 읽지 않음 (쓰기 프로세스가 멈춘 경우)
+SHARED_MAX_AGE = 30.0
+# 쓰기 프로세스 heartbeat가 이 시간(초) 동안 없으면 다른 프로세스가 넘겨받음
+WRITER_TIMEOUT = 10.0
+# 읽는 도중 쓰기가 겹쳤을 때 다시 읽는 횟수
+SEQLOCK_RETRIES = 8
+
+SHARED_FIELDS = (*CANDLE_PRICE_FIELDS, *DAILY_EXTRA_FIELDS)
+
+INDEX_DTYPE = np.dtype([("key", f"S{KEY_SIZE}"), ("count", np.int64)])
+# 세그먼트 헤더: [seq, length, updated_at(epoch 밀리초), reserved]
+HEADER_SIZE = 4 * 8
+
+def candle_key(interval: CandleInterval, market_code: str) -> bytes:
+    return f"candles|{market_code}|{interval.name}".encode()
+
+def ticker_key(market_code: str) -> bytes:
+    return f"ticker|{market_code}".encode()
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+class SharedSegment:
+    """
+    공유 메모리 세그먼트 1개 (헤더 + 데이터)
+
+    쓰기 프로세스는 seq를 홀수로 올린 뒤 데이터를 쓰고 다시 짝수로 올립니다 (seqlock).
+    읽는 쪽은 읽기 전후의 seq가 같은 짝수일 때만 결과를 사용하므로 잠금 없이 읽습니다.
+    """
+
+    def __init__(self, shm: SharedMemory):
+        self.shm = shm
+        self.header = np.ndarray(4, dtype=np.int64, buffer=shm.buf)
+
+    @classmethod
+    def open(cls, name: str, size: int, create: bool = False) -> Optional["SharedSegment"]:
+        """세그먼트 연결 (create면 없을 때 생성, 연결할 수 없으면 None)"""
+        try:
+            return cls(SharedMemory(name, track=False))
+        except FileNotFoundError:
+            if not create:
+                return None
+        try:
+            return cls(SharedMemory(name, create=True, size=size, track=False))
+        except FileExistsError:
+            return cls(SharedMemory(name, track=False))
+
+    @property
+    def length(self) -> int:
+        return int(self.header[1])
+
+    @property
+    def age(self) -> float:
+        """마지막 갱신 후 지난 시간(초)"""
+        return (_now_ms() - int(self.header[2])) / 1000
+
+    def begin_write(self) -> None:
+        self.header[0] += 1
+
+    def end_write(self, length: int) -> None:
+        self.header[1] = length
+        self.header[2] = _now_ms()
+        self.header[0] += 1
+
+    def close(self) -> None:
+        del self.header
+        self.shm.close()
+
+class CandleSegment(SharedSegment):
+    """캔들 시리즈 1개 (candle_time + SHARED_FIELDS 컬럼, 시간순)"""
+
+    SIZE = HEADER_SIZE + (1 + len(SHARED_FIELDS)) * SHARED_SERIES_CAPACITY * 8
+
+    def __init__(self, shm: SharedMemory):
+        super().__init__(shm)
+        self.columns: Dict[str, np.ndarray] = {
+            "candle_time": np.ndarray(SHARED_SERIES_CAPACITY, dtype=np.int64, buffer=shm.buf, offset=HEADER_SIZE)
+        }
+        for index, field in enumerate(SHARED_FIELDS, start=1):
+            self.columns[field] = np.ndarray(
+                SHARED_SERIES_CAPACITY, dtype=np.float64, buffer=shm.buf,
+                offset=HEADER_SIZE + index * SHARED_SERIES_CAPACITY * 8
+            )
+
+    def view(self) -> Dict[str, np.ndarray]:
+        """저장된 전체 구간의 공유 메모리 뷰 (복사 없음, 이후 갱신으로 바뀔 수 있음)"""
+        length = self.length
+        return {name: values[:length] for name, values in self.columns.items()}
+
+    def read(self, count: int, fields: Sequence[str]) -> Optional[Dict[str, np.ndarray]]:
+        """최신 캔들 count개를 일관된 복사본으로 읽기 (모자라거나 갱신 중이면 None)"""
+        for _ in range(SEQLOCK_RETRIES):
+            seq = int(self.header[0])
+            if seq % 2:
+                continue
+            length = self.length
+            if length < count:
+                return None
+            result = {
+                name: self.columns[name][length - count:length].copy()
+                for name in ("candle_time", *fields)
+            }
+            if int(self.header[0]) == seq:
+                return result
+        return None
+
+    def write(self, columns: Dict[str, np.ndarray]) -> None:
+        times = columns["candle_time"][-SHARED_SERIES_CAPACITY:]
+        n = len(times)
+        self.begin_write()
+        self.columns["candle_time"][:n] = times
+        for field in SHARED_FIELDS:
+            if field in columns:
+                self.columns[field][:n] = columns[field][len(columns[field]) - n:]
+            else:
+                self.columns[field][:n] = 0.0
+        self.end_write(n)
+
+    def close(self) -> None:
+        del self.columns
+        super().close()
+
+class TickerSegment(SharedSegment):
+    """티커 1개 (JSON)"""
+
+    SIZE = HEADER_SIZE + TICKER_PAYLOAD_SIZE
+
+    def read(self) -> Optional[dict]:
+        for _ in range(SEQLOCK_RETRIES):
+            seq = int(self.header[0])
+            if seq % 2:
+                continue
+            payload = bytes(self.shm.buf[HEADER_SIZE:HEADER_SIZE + self.length])
+            if int(self.header[0]) == seq:
+                return json.loads(payload) if payload else None
+        return None
+
+    def write(self, data: dict) -> None:
+        payload = json.dumps(data).encode()
+        if len(payload) > TICKER_PAYLOAD_SIZE:
+            logging.warning(f"티커 크기 초과로 공유하지 않음: {data.get('market')} ({len(payload)} bytes)")
+            return
+        self.begin_write()
+        self.shm.buf[HEADER_SIZE:HEADER_SIZE + len(payload)] = payload
+        self.end_write(len(payload))
+
+class SharedCache:
+    """
+    여러 워커 프로세스가 함께 쓰는 공유 메모리 캔들·티커 캐시
+
+    - 인덱스 세그먼트: 키(캔들 시리즈·티커) → 슬롯 번호, 요청된 캔들 수, 쓰기 프로세스 pid와 heartbeat
+    - 슬롯 세그먼트: 슬롯마다 캔들 컬럼 배열 또는 티커 JSON
+
+    가장 먼저 heartbeat를 남긴 프로세스가 유일한 쓰기 프로세스가 되어 인덱스에 등록된 키를 주기적으로 갱신하고,
+    나머지 워커는 세그먼트를 매핑해 읽기만 합니다. 캐시에 없는 키는 읽는 쪽이 인덱스에 등록한 뒤
+    직접 조회하므로, 다음 갱신부터는 모든 워커가 같은 배열을 읽습니다.
+    쓰기 프로세스가 멈추면 heartbeat가 끊기고 다른 워커가 쓰기를 넘겨받습니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.index_segment = SharedSegment.open(
+            f"{name}-index", HEADER_SIZE + INDEX_SLOTS * INDEX_DTYPE.itemsize, create=True
+        )
+        self.index = np.ndarray(INDEX_SLOTS, dtype=INDEX_DTYPE, buffer=self.index_segment.shm.buf, offset=HEADER_SIZE)
+        self.segments: Dict[int, SharedSegment] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_writer(self) -> bool:
+        return int(self.index_segment.header[0]) == os.getpid()
+
+    def _slot(self, key: bytes, claim: bool = False) -> Optional[int]:
+        """키의 슬롯 번호 (claim이면 없을 때 빈 슬롯에 등록)"""
+        start = zlib.crc32(key) % INDEX_SLOTS
+        for i in range(INDEX_SLOTS):
+            slot = (start + i) % INDEX_SLOTS
+            current = self.index["key"][slot]
+            if current == key:
+                return slot
+            if not current:
+                if not claim:
+                    return None
+                # 동시에 등록하다 덮어써져도 다음 조회 때 다시 등록되므로 잠금을 쓰지 않음
+                self.index["key"][slot] = key
+                return slot
+        return None
+
+    def _segment(self, slot: int, segment_type: type, create: bool = False) -> Optional[SharedSegment]:
+        segment = self.segments.get(slot)
+        if segment is None:
+            segment = segment_type.open(f"{self.name}-{slot}", segment_type.SIZE, create=create)
+            if segment is not None:
+                self.segments[slot] = segment
+        return segment
+
+    def register(self, key: bytes, count: int = 0) -> None:
+        """쓰기 프로세스가 갱신할 키로 등록"""
+        slot = self._slot(key, claim=True)
+        if slot is None:
+            logging.warning("공유 캐시 인덱스가 가득 찼습니다")
+            return
+        if self.index["count"][slot] < count:
+            self.index["count"][slot] = count
+
+    def read_candles(self, interval: CandleInterval, market_code: str, count: int) -> Optional[Dict[str, np.ndarray]]:
+        """
+        공유 캐시에서 최신 캔들 count개 읽기 (decode_candles 형식)
+
+        없거나, 모자라거나, SHARED_MAX_AGE보다 오래되었으면 None을 반환하고
+        쓰기 프로세스가 갱신하도록 키를 등록합니다.
+        """
+        if count > SHARED_SERIES_CAPACITY:
+            return None
+        key = candle_key(interval, market_code)
+        slot = self._slot(key)
+        segment = self._segment(slot, CandleSegment) if slot is not None else None
+        if segment is not None and segment.age <= SHARED_MAX_AGE:
+            columns = segment.read(count, (*CANDLE_PRICE_FIELDS, *extra_fields(interval)))
+            if columns is not None:
+                return columns
+        self.register(key, count)
+        return None
+
+    def read_ticker(self, market_code: str) -> Optional[dict]:
+        """공유 캐시에서 티커 딕셔너리 읽기 (없거나 오래되었으면 키 등록 후 None)"""
+        key = ticker_key(market_code)
+        slot = self._slot(key)
+        segment = self._segment(slot, TickerSegment) if slot is not None else None
+        if segment is not None and segment.age <= SHARED_MAX_AGE:
+            data = segment.read()
+            if data is not None:
+                return data
+        self.register(key)
+        return None
+
+    def heartbeat(self) -> None:
+        self.index_segment.header[2] = _now_ms()
+
+    async def _claim_writer(self) -> bool:
+        """쓰기 프로세스가 없거나 멈췄으면 넘겨받음"""
+        if self.is_writer:
+            return True
+        if self.index_segment.age <= WRITER_TIMEOUT:
+            return False
+        self.index_segment.header[0] = os.getpid()
+        self.heartbeat()
+        # 여러 워커가 동시에 넘겨받으려 했다면 마지막에 쓴 워커만 남음
+        await asyncio.sleep(SHARED_REFRESH_INTERVAL / 2)
+        if self.is_writer:
+            logging.info(f"공유 캐시 쓰기 프로세스: pid {os.getpid()}")
+        return self.is_writer
+
+    def _entries(self) -> List[Tuple[int, str, int]]:
+        """인덱스에 등록된 (슬롯, 키, 캔들 수)"""
+        return [
+            (slot, key.decode(errors="replace"), int(count))
+            for slot, (key, count) in enumerate(self.index.tolist()) if key
+        ]
+
+    async def refresh(self) -> None:
+        """등록된 모든 키 갱신 (쓰기 프로세스에서만 호출)"""
+        from app.tools.market.columnar import decode_candles
+
+        entries = self._entries()
+        tickers = {key.split("|", 1)[1]: slot for slot, key, _ in entries if key.startswith("ticker|")}
+        if tickers:
+            for market_code, ticker in (await fetch_tickers(list(tickers))).items():
+                self._segment(tickers[market_code], TickerSegment, create=True).write(asdict(ticker))
+
+        for slot, key, count in entries:
+            if not key.startswith("candles|"):
+                continue
+            segment = self._segment(slot, CandleSegment, create=True)
+            if segment.age < LIVE_CANDLE_TTL:
+                continue
+            try:
+                _, market_code, interval_name = key.split("|")
+                interval = interval_by_name(interval_name)
+            except ValueError:
+                logging.warning(f"공유 캐시 인덱스의 잘못된 키 무시: {key}")
+                continue
+            data = await get_candle_cache().get(interval, market_code, min(max(count, 1), SHARED_SERIES_CAPACITY))
+            segment.write(decode_candles(data, extra_fields(interval)))
+
+    def start(self) -> None:
+        """백그라운드 갱신 시작 (이미 실행 중이면 무시)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if await self._claim_writer():
+                    self.heartbeat()
+                    await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"공유 캐시 갱신 실패: {e}")
+            await asyncio.sleep(SHARED_REFRESH_INTERVAL)
+
+    def close(self) -> None:
+        """세그먼트 매핑 해제 (세그먼트는 다음 프로세스를 위해 남겨 둠)"""
+        for segment in self.segments.values():
+            segment.close()
+        self.segments.clear()
+        del self.index
+        self.index_segment.close()
+
+    def unlink(self) -> None:
+        """모든 공유 메모리 세그먼트 삭제"""
+        for slot in range(INDEX_SLOTS):
+            try:
+                SharedMemory(f"{self.name}-{slot}", track=False).unlink()
+            except FileNotFoundError:
+                pass
+        self.index_segment.shm.unlink()
+
+def create_shared_cache() -> Optional[SharedCache]:
+    """SHARED_CACHE_NAME 환경 변수가 있으면 그 이름으로 공유 캐시 연결"""
+    name = os.getenv("SHARED_CACHE_NAME", "")
+    if not name:
+        return None
+    try:
+        return SharedCache(name)
+    except OSError as e:
+        logging.error(f"공유 캐시 열기 실패 ({name}): {e}")
+        return None
+
+def get_shared_cache() -> Optional[SharedCache]:
+    """프로세스 전역 공유 캐시 반환 (사용하지 않으면 None)"""
+    return loop_local("shared_cache", create_shared_cache)
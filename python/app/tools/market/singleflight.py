@@ -0,0 +1,29 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+class SingleFlight:
+    """
+    동일한 키의 동시 요청을 하나의 업스트림 호출로 병합
+
+    같은 키로 진행 중인 호출이 있으면 새로 호출하지 않고 그 결과를 함께 기다립니다.
+    결과 객체는 모든 호출자가 공유하므로 수정하지 않아야 합니다.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # 한 호출자가 취소되어도 다른 호출자의 요청은 계속 진행
+        return await asyncio.shield(task)
+
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+def request_key(url: str, params: Optional[dict] = None) -> Hashable:
+    """엔드포인트와 파라미터로 만든 요청 키"""
+    return (url, tuple(sorted((params or {}).items())))
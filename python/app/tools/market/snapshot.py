@@ -0,0 +1,142 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import asdict
+from typing import Optional
+
+from app.schemas.ticker import Ticker
+from app.tools.market.cache import CandleCache, get_candle_cache
+from app.tools.market.catalog import MarketCatalog, get_market_catalog
+from app.tools.market.client import loop_local
+from app.tools.market.stream import TickerStream, get_ticker_stream
+from app.tools.market.swr import SWR_MAX_STALE_ON_ERROR, StaleWhileRevalidate, get_swr_cache, ticker_key
+
+# 캐시 스냅샷 파일 경로 (기본값은 빈 값: 사용 안 함, CACHE_SNAPSHOT_PATH로 켬)
+DEFAULT_SNAPSHOT_PATH = ""
+# 주기적 스냅샷 간격(초)
+SNAPSHOT_INTERVAL = 5 * 60
+SNAPSHOT_VERSION = 1
+
+class CacheSnapshotter:
+    """
+    메모리 캐시(캔들, 티커, 마켓 목록) 디스크 스냅샷
+
+    종료 시와 주기적으로 저장하고, 시작 시 복원합니다.
+    복원한 캔들은 진행 중이던 캔들만 만료된 상태이므로 첫 조회는 그 이후 구간만 받아오고,
+    티커는 저장 시점만큼 나이를 먹은 값으로 복원되어 업비트 응답 전까지 마지막 값으로 응답할 수 있습니다.
+    """
+
+    def __init__(self, path: str, interval: float = SNAPSHOT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.restored = False
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def collect(swr: StaleWhileRevalidate, cache: CandleCache, catalog: MarketCatalog,
+                stream: Optional[TickerStream]) -> dict:
+        """
+        스냅샷 내용 구성 (캐시가 크면 오래 걸리므로 스레드에서 호출)
+
+        이벤트 루프가 계속 고치는 딕셔너리는 list()/dict()로 한 번에 복사한 뒤 읽습니다.
+        """
+        tickers = {
+            entry.value.market: entry.value
+            for entry in list(swr.entries.values()) if isinstance(entry.value, Ticker)
+        }
+        if stream is not None:
+            tickers.update(dict(stream.tickers))
+
+        return {
+            "version": SNAPSHOT_VERSION,
+            "saved_at": time.time(),
+            "markets": catalog.export(),
+            "candles": cache.export(),
+            "tickers": [asdict(ticker) for ticker in tickers.values()],
+        }
+
+    def _write(self, snapshot: dict) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # 쓰는 도중 종료되어도 이전 스냅샷이 남도록 임시 파일에 쓴 뒤 교체
+        # (워커마다 다른 임시 파일을 써서 동시에 저장해도 서로의 파일을 덮어쓰지 않음)
+        temp = tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, suffix=".tmp", delete=False)
+        try:
+            with temp:
+                json.dump(snapshot, temp, ensure_ascii=False, separators=(",", ":"))
+            os.replace(temp.name, self.path)
+        except BaseException:
+            os.unlink(temp.name)
+            raise
+
+    def _read(self) -> Optional[dict]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    async def save(self) -> None:
+        snapshot = await asyncio.to_thread(
+            self.collect, get_swr_cache(), get_candle_cache(), get_market_catalog(), get_ticker_stream()
+        )
+        await asyncio.to_thread(self._write, snapshot)
+        logging.info(f"캐시 스냅샷 저장: 캔들 {len(snapshot['candles'])}개 시리즈, 티커 {len(snapshot['tickers'])}개")
+
+    async def restore(self) -> None:
+        """스냅샷으로 비어 있는 캐시 채우기 (프로세스당 1번)"""
+        if self.restored:
+            return
+        self.restored = True
+        try:
+            snapshot = await asyncio.to_thread(self._read)
+        except (OSError, ValueError) as e:
+            logging.error(f"캐시 스냅샷 읽기 실패 ({self.path}): {e}")
+            return
+        if not snapshot or snapshot.get("version") != SNAPSHOT_VERSION:
+            return
+
+        age = max(0.0, time.time() - snapshot["saved_at"])
+        catalog = get_market_catalog()
+        if not catalog.loaded and snapshot["markets"]:
+            catalog.index(snapshot["markets"], loaded_at=snapshot["saved_at"])
+        get_candle_cache().restore(snapshot["candles"])
+        if age <= SWR_MAX_STALE_ON_ERROR:
+            swr = get_swr_cache()
+            for data in snapshot["tickers"]:
+                swr.put(ticker_key(data["market"]), Ticker.from_upbit(data), age)
+        logging.info(f"캐시 스냅샷 복원: {age:.0f}초 전, 캔들 {len(snapshot['candles'])}개 시리즈")
+
+    def start(self) -> None:
+        """주기적 저장 시작 (이미 실행 중이면 무시)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.save()
+            except Exception as e:
+                logging.error(f"캐시 스냅샷 저장 실패: {e}")
+
+def create_cache_snapshotter() -> Optional[CacheSnapshotter]:
+    """CACHE_SNAPSHOT_PATH 환경 변수 경로로 스냅샷 관리자 생성 (빈 값이면 None)"""
+    path = os.getenv("CACHE_SNAPSHOT_PATH", DEFAULT_SNAPSHOT_PATH)
+    return CacheSnapshotter(path) if path else None
+
+def get_cache_snapshotter() -> Optional[CacheSnapshotter]:
+    """프로세스 전역 캐시 스냅샷 관리자 반환 (사용하지 않으면 None)"""
+    return loop_local("cache_snapshotter", create_cache_snapshotter)
@@ -0,0 +1,232 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.tools.market.cache import LIVE_CANDLE_TTL
+from app.tools.market.candles import CANDLE_PRICE_FIELDS, DAILY_EXTRA_FIELDS, CandleInterval, fetch_candle_history
+from app.tools.market.client import loop_local
+
+# 캔들 저장소 파일 경로 (기본값은 빈 값: 저장소 사용 안 함, CANDLE_STORE_PATH로 켬)
+DEFAULT_CANDLE_STORE_PATH = ""
+
+STORED_FIELDS = (*CANDLE_PRICE_FIELDS, *DAILY_EXTRA_FIELDS)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS candles (
+    market TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    candle_time INTEGER NOT NULL,
+    candle_date_time_utc TEXT NOT NULL,
+    candle_date_time_kst TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    {", ".join(f"{field} REAL" for field in STORED_FIELDS)},
+    PRIMARY KEY (market, interval, candle_time)
+) WITHOUT ROWID;
+
+-- 업비트에 확인해 거래가 없었음을 확인한 구간 [start, end)
+CREATE TABLE IF NOT EXISTS verified_ranges (
+    market TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    PRIMARY KEY (market, interval, start)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    market TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    exhausted INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (market, interval)
+) WITHOUT ROWID;
+"""
+
+class CandleStore:
+    """
+    SQLite 기반 로컬 캔들 저장소
+
+    (마켓, 캔들 단위, 캔들 시작 시각)을 키로 캔들을 보관하고,
+    마지막으로 저장된 캔들 이후의 구간만 업비트에서 받아 증분 동기화합니다.
+    SQLite 호출은 블로킹이므로 비동기 메서드는 스레드에서 실행합니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._db_lock = threading.Lock()
+        # (마켓, 캔들 단위) → (동기화한 캔들 시작 시각, 만료 시각(monotonic), 동기화한 개수)
+        self._fresh: Dict[Tuple[str, str], Tuple[int, float, int]] = {}
+        self._sync_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+    def close(self) -> None:
+        with self._db_lock:
+            self._conn.close()
+
+    def upsert(self, interval: CandleInterval, market_code: str, data: List[dict]) -> None:
+        """업비트 캔들 응답 저장 (같은 캔들은 최신 값으로 교체)"""
+        if not data:
+            return
+        candle_times = np.fromiter(
+            (row["candle_date_time_utc"] for row in data), dtype="datetime64[ms]", count=len(data)
+        ).view(np.int64)
+        rows = [
+            (
+                market_code, interval.name, int(candle_time),
+                row["candle_date_time_utc"], row.get("candle_date_time_kst", ""), int(row.get("timestamp") or 0),
+                *(row.get(field) for field in STORED_FIELDS)
+            )
+            for candle_time, row in zip(candle_times, data)
+        ]
+        placeholders = ", ".join("?" * len(rows[0]))
+        with self._db_lock, self._conn:
+            self._conn.executemany(f"INSERT OR REPLACE INTO candles VALUES ({placeholders})", rows)
+
+    def latest_time(self, interval: CandleInterval, market_code: str) -> Optional[int]:
+        """가장 최근 저장된 캔들 시작 시각 (epoch 밀리초)"""
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT MAX(candle_time) FROM candles WHERE market = ? AND interval = ?",
+                (market_code, interval.name)
+            ).fetchone()
+        return row[0]
+
+    def count(self, interval: CandleInterval, market_code: str) -> int:
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM candles WHERE market = ? AND interval = ?",
+                (market_code, interval.name)
+            ).fetchone()
+        return row[0]
+
+    def is_exhausted(self, interval: CandleInterval, market_code: str) -> bool:
+        """상장 시점까지 모두 저장했는지 여부"""
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT exhausted FROM sync_state WHERE market = ? AND interval = ?",
+                (market_code, interval.name)
+            ).fetchone()
+        return bool(row and row[0])
+
+    def mark_exhausted(self, interval: CandleInterval, market_code: str) -> None:
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (market, interval, exhausted) VALUES (?, ?, 1)",
+                (market_code, interval.name)
+            )
+
+    def series(self) -> List[Tuple[str, str]]:
+        """저장된 (마켓, 캔들 단위 이름) 목록"""
+        with self._db_lock:
+            return self._conn.execute("SELECT DISTINCT market, interval FROM candles").fetchall()
+
+    def read_times(self, interval: CandleInterval, market_code: str) -> np.ndarray:
+        """저장된 모든 캔들 시작 시각 (epoch 밀리초, 시간순)"""
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT candle_time FROM candles WHERE market = ? AND interval = ? ORDER BY candle_time",
+                (market_code, interval.name)
+            ).fetchall()
+        return np.array([row[0] for row in rows], dtype=np.int64)
+
+    def verified_ranges(self, interval: CandleInterval, market_code: str) -> List[Tuple[int, int]]:
+        with self._db_lock:
+            return self._conn.execute(
+                "SELECT start, end FROM verified_ranges WHERE market = ? AND interval = ? ORDER BY start",
+                (market_code, interval.name)
+            ).fetchall()
+
+    def mark_verified(self, interval: CandleInterval, market_code: str, start: int, end: int) -> None:
+        """[start, end) 구간은 업비트에 있는 캔들을 모두 저장했음을 기록"""
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO verified_ranges VALUES (?, ?, ?, ?)",
+                (market_code, interval.name, start, end)
+            )
+
+    def read_columns(self, interval: CandleInterval, market_code: str, count: int,
+                     extra_fields: Sequence[str] = ()) -> Dict[str, np.ndarray]:
+        """
+        최신 캔들 count개를 NumPy 컬럼(시간순)으로 읽기
+
+        Returns:
+            decode_candles()와 같은 형식의 컬럼 딕셔너리
+        """
+        fields = (*CANDLE_PRICE_FIELDS, *extra_fields)
+        with self._db_lock:
+            rows = self._conn.execute(
+                f"SELECT candle_time, {', '.join(fields)} FROM candles "
+                "WHERE market = ? AND interval = ? ORDER BY candle_time DESC LIMIT ?",
+                (market_code, interval.name, count)
+            ).fetchall()
+
+        # 최신순으로 읽었으므로 뒤집어 시간순으로 정렬
+        table = np.array(rows[::-1], dtype=np.float64).reshape(len(rows), len(fields) + 1)
+        columns = {"candle_time": np.ascontiguousarray(table[:, 0]).astype(np.int64)}
+        for index, field in enumerate(fields, start=1):
+            columns[field] = np.nan_to_num(np.ascontiguousarray(table[:, index]))
+        return columns
+
+    async def sync(self, interval: CandleInterval, market_code: str, count: int) -> None:
+        """
+        최신 캔들 count개가 저장소에 있도록 증분 동기화
+
+        - 저장된 캔들이 없거나 모자라면 count개 전체 조회
+        - 그 밖에는 마지막 저장 캔들(진행 중이었을 수 있음)부터 현재 캔들까지만 조회
+        - 진행 중인 캔들은 LIVE_CANDLE_TTL 또는 캔들 경계까지만 유효
+        """
+        key = (market_code, interval.name)
+        lock = self._sync_locks.setdefault(key, asyncio.Lock())
+
+        async with lock:
+            current_start = interval.floor(time.time())
+            fresh = self._fresh.get(key)
+            if fresh and fresh[0] == current_start and time.monotonic() < fresh[1] and fresh[2] >= count:
+                return
+
+            latest = await asyncio.to_thread(self.latest_time, interval, market_code)
+            stored = await asyncio.to_thread(self.count, interval, market_code)
+            exhausted = await asyncio.to_thread(self.is_exhausted, interval, market_code)
+
+            missing = count
+            if latest is not None and (stored >= count or exhausted):
+                missing = (current_start - latest // 1000) // interval.seconds + 1
+
+            # 저장된 이력보다 적게 벌어졌으면 count가 작아도 마감된 캔들까지 받아 이력을 이어 감
+            data = await fetch_candle_history(interval, market_code, min(missing, max(count, stored)))
+            await asyncio.to_thread(self.upsert, interval, market_code, data)
+            if missing >= count and len(data) < count:
+                await asyncio.to_thread(self.mark_exhausted, interval, market_code)
+            logging.debug(f"캔들 동기화: {market_code} {interval.name} {len(data)}개")
+
+            until_boundary = current_start + interval.seconds - time.time()
+            self._fresh[key] = (current_start, time.monotonic() + max(0.0, min(LIVE_CANDLE_TTL, until_boundary)), count)
+
+    async def load_columns(self, interval: CandleInterval, market_code: str, count: int,
+                           extra_fields: Sequence[str] = ()) -> Dict[str, np.ndarray]:
+        """동기화 후 최신 캔들 count개를 NumPy 컬럼(시간순)으로 반환"""
+        await self.sync(interval, market_code, count)
+        return await asyncio.to_thread(self.read_columns, interval, market_code, count, extra_fields)
+
+def create_candle_store() -> Optional[CandleStore]:
+    """CANDLE_STORE_PATH 환경 변수 경로로 저장소 생성 (빈 값이면 None)"""
+    path = os.getenv("CANDLE_STORE_PATH", DEFAULT_CANDLE_STORE_PATH)
+    if not path:
+        return None
+    try:
+        return CandleStore(path)
+    except sqlite3.Error as e:
+        logging.error(f"캔들 저장소 열기 실패 ({path}): {e}")
+        return None
+
+def get_candle_store() -> Optional[CandleStore]:
+    """프로세스 전역 캔들 저장소 반환 (사용하지 않으면 None)"""
+    return loop_local("candle_store", create_candle_store)
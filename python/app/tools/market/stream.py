@@ -0,0 +1,168 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from app.schemas.ticker import Ticker
+from app.tools.market.client import loop_local
+from app.tools.market.ringbuffer import get_ring_registry
+
+UPBIT_WEBSOCKET_URL = "wss://api.upbit.com/websocket/v1"
+
+# 이 시간(초) 안에 갱신된 티커만 메모리에서 응답
+STREAM_MAX_AGE = 10.0
+# 재연결 대기 시간 상한(초)
+MAX_RECONNECT_DELAY = 30.0
+
+KST = timezone(timedelta(hours=9))
+
+def ticker_from_stream(message: dict) -> Ticker:
+    """웹소켓 ticker 메시지 → Ticker (REST 응답과 같은 필드 구성)"""
+    data = dict(message)
+    data["market"] = message.get("code", "")
+    # 웹소켓은 UTC 거래 일시만 주므로 KST 값은 거래 시각으로 계산
+    trade_kst = datetime.fromtimestamp(message.get("trade_timestamp", 0) / 1000, KST)
+    data["trade_date_kst"] = trade_kst.strftime("%Y%m%d")
+    data["trade_time_kst"] = trade_kst.strftime("%H%M%S")
+    return Ticker.from_upbit(data)
+
+def apply_trade(ticker: Ticker, message: dict) -> Ticker:
+    """웹소켓 trade 메시지로 최신 Ticker의 체결 정보 갱신"""
+    price = float(message.get("trade_price", ticker.trade_price))
+    volume = float(message.get("trade_volume", 0))
+    change_price = price - ticker.prev_closing_price
+    change_rate = change_price / ticker.prev_closing_price if ticker.prev_closing_price else 0.0
+    trade_kst = datetime.fromtimestamp(message.get("trade_timestamp", ticker.trade_timestamp) / 1000, KST)
+
+    return replace(
+        ticker,
+        trade_date=message.get("trade_date", ticker.trade_date).replace("-", ""),
+        trade_time=message.get("trade_time", ticker.trade_time).replace(":", ""),
+        trade_date_kst=trade_kst.strftime("%Y%m%d"),
+        trade_time_kst=trade_kst.strftime("%H%M%S"),
+        trade_timestamp=int(message.get("trade_timestamp", ticker.trade_timestamp)),
+        trade_price=price,
+        high_price=max(ticker.high_price, price),
+        low_price=min(ticker.low_price, price) if ticker.low_price else price,
+        change="RISE" if change_price > 0 else "FALL" if change_price < 0 else "EVEN",
+        change_price=abs(change_price),
+        change_rate=abs(change_rate),
+        signed_change_price=change_price,
+        signed_change_rate=change_rate,
+        trade_volume=volume,
+        acc_trade_volume=ticker.acc_trade_volume + volume,
+        acc_trade_volume_24h=ticker.acc_trade_volume_24h + volume,
+        acc_trade_price=ticker.acc_trade_price + price * volume,
+        acc_trade_price_24h=ticker.acc_trade_price_24h + price * volume,
+        timestamp=int(message.get("timestamp", ticker.timestamp))
+    )
+
+class TickerStream:
+    """
+    업비트 웹소켓 ticker/trade 스트림 수집기
+
+    구독한 마켓의 최신 Ticker를 메모리에 유지하며, 연결이 끊기면 지수 백오프로 재연결합니다.
+    websockets 패키지가 필요합니다 (pip install 'python[stream]').
+    """
+
+    def __init__(self, markets: List[str], url: str = UPBIT_WEBSOCKET_URL, max_age: float = STREAM_MAX_AGE):
+        self.markets = list(markets)
+        self.url = url
+        self.max_age = max_age
+        self.tickers: Dict[str, Ticker] = {}
+        self.updated_at: Dict[str, float] = {}
+        self.connected = False
+        self.connected_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def latest(self, market_code: str) -> Optional[Ticker]:
+        """max_age 안에 갱신된 최신 Ticker (없거나 오래되었으면 None)"""
+        if not self.connected:
+            return None
+        updated_at = self.updated_at.get(market_code)
+        if updated_at is None or time.monotonic() - updated_at > self.max_age:
+            return None
+        return self.tickers.get(market_code)
+
+    def handle_message(self, raw) -> None:
+        """수신 메시지 1개 반영"""
+        message = json.loads(raw)
+        market = message.get("code")
+        kind = message.get("type")
+
+        if kind == "ticker":
+            self.tickers[market] = ticker_from_stream(message)
+        elif kind == "trade":
+            # 링 버퍼의 진행 중인 캔들에 체결 누적
+            get_ring_registry().feed_trade(
+                market, int(message.get("trade_timestamp", 0)),
+                float(message.get("trade_price", 0)), float(message.get("trade_volume", 0))
+            )
+            if market not in self.tickers:
+                return
+            self.tickers[market] = apply_trade(self.tickers[market], message)
+        else:
+            return
+        self.updated_at[market] = time.monotonic()
+
+    def subscription(self) -> str:
+        return json.dumps([
+            {"ticket": str(uuid.uuid4())},
+            {"type": "ticker", "codes": self.markets},
+            {"type": "trade", "codes": self.markets},
+            {"format": "DEFAULT"}
+        ])
+
+    def start(self) -> None:
+        """백그라운드 수집 시작 (이미 실행 중이면 무시)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.connected = False
+
+    async def _run(self) -> None:
+        from websockets.asyncio.client import connect
+
+        delay = 1.0
+        while True:
+            try:
+                async with connect(self.url) as websocket:
+                    await websocket.send(self.subscription())
+                    self.connected = True
+                    self.connected_at = time.monotonic()
+                    delay = 1.0
+                    logging.info(f"업비트 웹소켓 연결: {', '.join(self.markets)}")
+                    async for raw in websocket:
+                        self.handle_message(raw)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"업비트 웹소켓 연결 끊김: {e}, {delay:.0f}초 후 재연결")
+            finally:
+                self.connected = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+def create_ticker_stream() -> Optional[TickerStream]:
+    """UPBIT_STREAM_MARKETS 환경 변수(콤마 구분)가 있으면 스트림 수집기 생성"""
+    markets = [code.strip() for code in os.getenv("UPBIT_STREAM_MARKETS", "").split(",") if code.strip()]
+    if not markets:
+        return None
+    return TickerStream(markets, url=os.getenv("UPBIT_WEBSOCKET_URL", UPBIT_WEBSOCKET_URL))
+
+def get_ticker_stream() -> Optional[TickerStream]:
+    """프로세스 전역 스트림 수집기 반환 (설정되지 않았으면 None)"""
+    return loop_local("ticker_stream", create_ticker_stream)
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from app.tools.market.cache import LIVE_CANDLE_TTL
+from app.tools.market.client import loop_local
+
+# 이 시간(초) 안의 데이터는 그대로 응답
+SWR_FRESH_TTL = LIVE_CANDLE_TTL
+# 이 시간(초)까지는 마지막 데이터로 바로 응답하고 백그라운드에서 갱신
+SWR_MAX_STALE = 60.0
+# 업비트 오류 시 이 시간(초)까지의 마지막 정상 데이터로 응답
+SWR_MAX_STALE_ON_ERROR = 60 * 60.0
+MAX_SWR_ENTRIES = 256
+
+@dataclass
+class Revalidated:
+    value: Any
+    fetched_at: float
+
+def ticker_key(market_code: str) -> Tuple[str, str]:
+    """티커 항목의 캐시 키"""
+    return (market_code, "ticker")
+
+class StaleWhileRevalidate:
+    """
+    stale-while-revalidate 응답 정책
+
+    - fresh_ttl 이내: 저장된 값으로 응답
+    - max_stale 이내: 저장된 값으로 바로 응답하고 백그라운드에서 갱신
+    - 그보다 오래되었거나 없음: 갱신을 기다림. 갱신이 실패하면 max_stale_on_error 이내의 값으로 응답
+
+    업비트가 느리거나 장애일 때도 응답 지연이 늘지 않도록 하며, 모든 응답에 데이터 나이(초)를 함께 돌려줍니다.
+    """
+
+    def __init__(self, fresh_ttl: float = SWR_FRESH_TTL, max_stale: float = SWR_MAX_STALE,
+                 max_stale_on_error: float = SWR_MAX_STALE_ON_ERROR, max_entries: int = MAX_SWR_ENTRIES):
+        self.fresh_ttl = fresh_ttl
+        self.max_stale = max_stale
+        self.max_stale_on_error = max_stale_on_error
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Hashable, Revalidated]" = OrderedDict()
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Tuple[Any, float]:
+        """
+        key의 값과 나이(초) 반환
+
+        Raises:
+            fetch()의 예외: 갱신이 실패했고 응답할 수 있는 이전 값도 없을 때
+        """
+        entry = self.entries.get(key)
+        age = time.monotonic() - entry.fetched_at if entry is not None else None
+        if entry is not None:
+            self.entries.move_to_end(key)
+            if age <= self.fresh_ttl:
+                return entry.value, age
+            if age <= self.max_stale:
+                self._refresh(key, fetch).add_done_callback(self._log_failure)
+                return entry.value, age
+
+        try:
+            return await asyncio.shield(self._refresh(key, fetch)), 0.0
+        except Exception as e:
+            if entry is not None and age <= self.max_stale_on_error:
+                logging.warning(f"업비트 조회 실패, {age:.0f}초 전 데이터로 응답: {e!r}")
+                return entry.value, age
+            raise
+
+    def put(self, key: Hashable, value: Any, age: float = 0.0) -> None:
+        """age초 전에 받은 값으로 항목 채우기 (이미 있으면 무시)"""
+        if key not in self.entries:
+            self.entries[key] = Revalidated(value, time.monotonic() - age)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def _refresh(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """key 갱신 작업 (진행 중이면 그 작업을 공유)"""
+        task = self._refreshing.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, fetch))
+            self._refreshing[key] = task
+        return task
+
+    async def _fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await fetch()
+            self.entries[key] = Revalidated(value, time.monotonic())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            return value
+        finally:
+            self._refreshing.pop(key, None)
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logging.warning(f"백그라운드 갱신 실패: {task.exception()!r}")
+
+def get_swr_cache() -> StaleWhileRevalidate:
+    """프로세스 전역 stale-while-revalidate 캐시 반환 (이벤트 루프별로 1개)"""
+    return loop_local("swr_cache", StaleWhileRevalidate)
@@ -0,0 +1,113 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import pytest
+
+import app.tools.market.client as client
+from app.tools.market.candles import CandleInterval, interval_by_name
+
+# 대체 서버가 상장된 것으로 알려 주는 마켓
+MARKETS = ("KRW-BTC", "KRW-ETH", "KRW-XRP")
+
+def candle_row(market_code: str, interval: CandleInterval, start: int, price: float = 100.0) -> dict:
+    """업비트 캔들 응답 1개 (start: 캔들 시작 시각, epoch 초)"""
+    utc = datetime.fromtimestamp(start, timezone.utc)
+    kst = datetime.fromtimestamp(start + 9 * 3600, timezone.utc)
+    return {
+        "market": market_code,
+        "candle_date_time_utc": utc.strftime("%Y-%m-%dT%H:%M:%S"),
+        "candle_date_time_kst": kst.strftime("%Y-%m-%dT%H:%M:%S"),
+        "opening_price": price,
+        "high_price": price + 2,
+        "low_price": price - 2,
+        "trade_price": price + 1,
+        "timestamp": (start + interval.seconds - 1) * 1000,
+        "candle_acc_trade_price": 10.0 * price,
+        "candle_acc_trade_volume": 10.0,
+        "unit": interval.seconds // 60,
+        "prev_closing_price": price,
+        "change_price": 1.0,
+        "change_rate": 0.01,
+    }
+
+def candle_rows(market_code: str, interval: CandleInterval, count: int, end: Optional[int] = None,
+                skip: Tuple[int, ...] = ()) -> List[dict]:
+    """end(기본: 진행 중인 캔들)부터 거슬러 count개 (최신순, skip 위치의 캔들은 거래가 없던 것으로 뺌)"""
+    end = interval.floor(time.time()) if end is None else end
+    return [
+        candle_row(market_code, interval, end - i * interval.seconds, 100.0 + i)
+        for i in range(count) if i not in skip
+    ]
+
+class FakeUpbit:
+    """
+    업비트 REST API 대체 (httpx.MockTransport)
+
+    - candles: (마켓, 캔들 단위 이름) → 최신순 캔들 (없으면 진행 중인 캔들부터 3000개를 만듦)
+    - errors: 마켓 → 돌려줄 오류 상태 코드
+    - delay: 요청마다 기다릴 시간(초)
+    - calls: 받은 요청 (경로, 쿼리 파라미터)
+    """
+
+    def __init__(self):
+        self.candles: Dict[Tuple[str, str], List[dict]] = {}
+        self.errors: Dict[str, int] = {}
+        self.delay = 0.0
+        self.calls: List[Tuple[str, dict]] = []
+
+    def install(self) -> None:
+        """현재 이벤트 루프의 전역 HTTP 클라이언트를 대체 (이벤트 루프 안에서 호출)"""
+        client._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(self.handle), base_url=client.UPBIT_API_URL
+        )
+        client._client_loop = asyncio.get_running_loop()
+
+    def candle_calls(self) -> List[dict]:
+        return [params for path, params in self.calls if path.startswith("/v1/candles/")]
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        self.calls.append((request.url.path, params))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+
+        markets = params.get("market", params.get("markets", "")).split(",")
+        status = next((self.errors[market] for market in markets if market in self.errors), None)
+        if status is not None:
+            return httpx.Response(status, json={"error": {"name": "fake"}})
+
+        path = request.url.path
+        if path.startswith("/v1/candles/"):
+            name = path[len("/v1/candles/"):]
+            key = (params["market"], name)
+            if key not in self.candles:
+                self.candles[key] = candle_rows(params["market"], interval_by_name(name), 3000)
+            rows = self.candles[key]
+            if "to" in params:
+                to = params["to"].rstrip("Z")
+                rows = [row for row in rows if row["candle_date_time_utc"] < to]
+            return httpx.Response(200, json=rows[:int(params["count"])])
+        if path == "/v1/ticker":
+            now = int(time.time() * 1000)
+            return httpx.Response(200, json=[
+                {"market": market, "trade_price": 100.0, "timestamp": now} for market in markets
+            ])
+        if path == "/v1/market/all":
+            return httpx.Response(200, json=[
+                {"market": market, "korean_name": market, "english_name": market} for market in MARKETS
+            ])
+        return httpx.Response(404)
+
+@pytest.fixture(autouse=True)
+def isolated_environment(monkeypatch):
+    """테스트마다 파일·공유 메모리 캐시를 끄고 메모리 캐시 백엔드만 사용"""
+    for name in ("CANDLE_STORE_PATH", "CACHE_SNAPSHOT_PATH", "CANDLE_ARCHIVE_PATH", "SHARED_CACHE_NAME",
+                 "CANDLE_COMPACT_CANDLES", "UPBIT_STREAM_MARKETS", "CACHE_BACKEND_URL"):
+        monkeypatch.setenv(name, "")
+
+@pytest.fixture
+def upbit() -> FakeUpbit:
+    return FakeUpbit()
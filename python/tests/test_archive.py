@@ -0,0 +1,43 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.tools.market.archive import CandleArchive
+from app.tools.market.candles import MAX_CANDLE_COUNT, minute_interval
+from conftest import candle_rows
+
+INTERVAL = minute_interval(1)
+STEP = INTERVAL.seconds * 1000
+
+def test_sync_fetches_the_whole_gap_since_last_candle(tmp_path, upbit):
+    archive = CandleArchive(str(tmp_path))
+    rows = candle_rows("KRW-BTC", INTERVAL, 500)
+    # 마지막 동기화 이후 300분이 지난 상태
+    upbit.candles[("KRW-BTC", INTERVAL.name)] = rows[300:]
+
+    async def main():
+        upbit.install()
+        await archive.sync(INTERVAL, "KRW-BTC", 100)
+        upbit.candles[("KRW-BTC", INTERVAL.name)] = rows
+        return await archive.sync(INTERVAL, "KRW-BTC", 100)
+
+    added = asyncio.run(main())
+    assert added == 300
+    times = archive.read(INTERVAL, "KRW-BTC")["candle_time"]
+    assert len(times) == 400
+    assert (np.diff(times) == STEP).all()
+
+def test_sync_refuses_gap_longer_than_one_history_call(tmp_path, upbit):
+    archive = CandleArchive(str(tmp_path))
+    rows = candle_rows("KRW-BTC", INTERVAL, 10, end=INTERVAL.floor(0) + INTERVAL.seconds * 10)
+    upbit.candles[("KRW-BTC", INTERVAL.name)] = rows
+
+    async def main():
+        upbit.install()
+        await archive.sync(INTERVAL, "KRW-BTC", 10)
+        with pytest.raises(ValueError):
+            await archive.sync(INTERVAL, "KRW-BTC", MAX_CANDLE_COUNT)
+
+    asyncio.run(main())
+    assert archive.length(INTERVAL, "KRW-BTC") == 10
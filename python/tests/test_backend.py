@@ -0,0 +1,162 @@
+import asyncio
+import threading
+import time
+import uuid
+
+import numpy as np
+import pytest
+
+import app.tools.market.columnar as columnar
+from app.tools.analyze import analyze_blockchain_mareket, json_default
+from app.tools.market.backend import (
+    RespBackend, SharedMemoryBackend, candle_cache_key, decode_columns, get_cache_backend
+)
+from app.tools.market.candles import minute_interval
+from app.tools.market.columnar import fetch_candle_columns
+from app.tools.market.respserver import RespServer
+
+INTERVAL = minute_interval(1)
+
+@pytest.fixture
+def resp_server():
+    """별도 스레드의 이벤트 루프에서 RespServer를 임의 포트로 실행 (여러 asyncio.run이 함께 씀)"""
+    server = RespServer()
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    listener = asyncio.run_coroutine_threadsafe(server.serve("127.0.0.1", 0), loop).result(5)
+    server.port = listener.sockets[0].getsockname()[1]
+    yield server
+
+    async def close():
+        listener.close()
+        await listener.wait_closed()
+
+    asyncio.run_coroutine_threadsafe(close(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+def test_resp_backend_round_trip_and_ttl(resp_server):
+    async def main():
+        backend = RespBackend("127.0.0.1", resp_server.port)
+        assert await backend.get("missing") is None
+        await backend.set("key", b"\x00value\r\n", 60)
+        assert await backend.get("key") == b"\x00value\r\n"
+        await backend.set("short", b"x", 0.05)
+        await asyncio.sleep(0.1)
+        assert await backend.get("short") is None
+        await backend.close()
+
+    asyncio.run(main())
+
+def test_resp_backend_skips_unreachable_server(monkeypatch):
+    async def main():
+        # 닫힌 포트
+        server = await asyncio.start_server(lambda reader, writer: None, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        server.close()
+        await server.wait_closed()
+
+        backend = RespBackend("127.0.0.1", port)
+        assert await backend.get("key") is None
+        assert backend._down_until > time.monotonic()
+
+        attempts = []
+        monkeypatch.setattr(backend, "execute", lambda *args: attempts.append(args))
+        await backend.set("key", b"value", 60)
+        assert await backend.get("key") is None
+        assert attempts == []
+
+    asyncio.run(main())
+
+def test_shared_memory_backend_slots():
+    backend = SharedMemoryBackend(f"bitscope-test-{uuid.uuid4().hex[:8]}", slots=1, value_size=64)
+
+    async def main():
+        assert await backend.get("a") is None
+        await backend.set("a", b"first", 60)
+        assert await backend.get("a") == b"first"
+        # 슬롯이 1개이므로 다른 키가 덮어씀
+        await backend.set("b", b"second", 60)
+        assert await backend.get("a") is None
+        assert await backend.get("b") == b"second"
+        # 슬롯보다 큰 값은 저장하지 않음
+        await backend.set("b", b"x" * 100, 60)
+        assert await backend.get("b") == b"second"
+        await backend.set("c", b"expired", -1)
+        assert await backend.get("c") is None
+
+    try:
+        asyncio.run(main())
+    finally:
+        for segment in backend.segments.values():
+            segment.shm.unlink()
+        asyncio.run(backend.close())
+
+def test_candle_columns_split_closed_and_live_keys(resp_server, upbit, monkeypatch):
+    monkeypatch.setenv("CACHE_BACKEND_URL", f"redis://127.0.0.1:{resp_server.port}")
+    monkeypatch.setattr(columnar, "LIVE_CANDLE_TTL", 0.2)
+
+    async def instance():
+        upbit.install()
+        columns = await fetch_candle_columns(INTERVAL, "KRW-BTC", 10)
+        await get_cache_backend().close()
+        return columns
+
+    first = asyncio.run(instance())
+    assert [call["count"] for call in upbit.candle_calls()] == ["10"]
+    live_start = INTERVAL.floor(time.time())
+    keys = {key.decode() for key in resp_server.data}
+    assert candle_cache_key(INTERVAL, "KRW-BTC", live_start - INTERVAL.seconds, 10) in keys
+    assert candle_cache_key(INTERVAL, "KRW-BTC", live_start, "live") in keys
+    live = decode_columns(resp_server.data[candle_cache_key(INTERVAL, "KRW-BTC", live_start, "live").encode()][0])
+    assert live["candle_time"].tolist() == [live_start * 1000]
+
+    # 다른 서버 인스턴스: 확정 캔들은 백엔드에서, 만료된 진행 중인 캔들만 업비트에서
+    time.sleep(0.3)
+    upbit.calls.clear()
+    second = asyncio.run(instance())
+    assert [call["count"] for call in upbit.candle_calls()] == ["1"]
+    for name, values in first.items():
+        assert np.array_equal(values, second[name])
+
+def test_analysis_result_is_shared_through_backend(resp_server, upbit, monkeypatch):
+    monkeypatch.setenv("CACHE_BACKEND_URL", f"redis://127.0.0.1:{resp_server.port}")
+
+    async def instance():
+        upbit.install()
+        result = await analyze_blockchain_mareket()
+        await get_cache_backend().close()
+        return result
+
+    first = asyncio.run(instance())
+    assert upbit.calls
+    upbit.calls.clear()
+    second = asyncio.run(instance())
+    assert upbit.calls == []
+    assert second["market_info"] == first["market_info"]
+    assert any(b":analysis:KRW-BTC:" in key for key in resp_server.data)
+
+def test_analysis_cache_write_failure_is_a_miss(upbit, monkeypatch):
+    async def main():
+        upbit.install()
+
+        backend = get_cache_backend()
+        set_value = backend.set
+
+        async def fail_analysis(key, value, ttl):
+            if ":analysis:" in key:
+                raise OSError("disk full")
+            await set_value(key, value, ttl)
+
+        monkeypatch.setattr(backend, "set", fail_analysis)
+        return await analyze_blockchain_mareket()
+
+    assert "market_info" in asyncio.run(main())
+
+def test_json_default_handles_numpy_and_other_values():
+    assert json_default(np.float64(1.5)) == 1.5
+    assert json_default(np.int64(3)) == 3
+    assert json_default(np.array([1, 2])) == [1, 2]
+    assert json_default(object()).startswith("<object")
@@ -0,0 +1,76 @@
+import asyncio
+
+import httpx
+import pytest
+
+import app.tools.market.client as client
+from app.tools.market.breaker import CircuitBreaker, UpstreamUnavailable
+from app.tools.market.client import fetch_json, get_circuit_breaker
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert 0 < breaker.retry_after <= 30
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.failures == 1
+
+def test_half_open_allows_one_probe(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.tools.market.breaker.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] += 30
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    # 시험 요청이 끝나기 전에는 다른 요청을 보내지 않음
+    assert not breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    now[0] += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+@pytest.mark.parametrize("status, failures", [(429, 2), (500, 3), (404, 0)])
+def test_status_codes_update_breaker(upbit, monkeypatch, status, failures):
+    # 재시도 없이 한 번의 응답으로 판정
+    monkeypatch.setattr(client, "MAX_RETRIES", 0)
+    upbit.errors["KRW-BTC"] = status
+
+    async def main():
+        upbit.install()
+        breaker = get_circuit_breaker()
+        breaker.failures = 2
+        with pytest.raises(httpx.HTTPStatusError):
+            await fetch_json("candles", "/v1/candles/days", {"market": "KRW-BTC", "count": 1})
+        return breaker
+
+    breaker = asyncio.run(main())
+    assert breaker.failures == failures
+    assert breaker.state == "closed"
+
+def test_open_breaker_rejects_requests(upbit):
+    async def main():
+        upbit.install()
+        breaker = get_circuit_breaker()
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        with pytest.raises(UpstreamUnavailable):
+            await fetch_json("candles", "/v1/candles/days", {"market": "KRW-BTC", "count": 1})
+
+    asyncio.run(main())
+    assert upbit.calls == []
@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+from app.tools.market.cache import CandleCache, CandleSeries
+from app.tools.market.candles import minute_interval
+from conftest import candle_rows
+
+def test_merge_does_not_modify_shared_response():
+    market = "".join(["KRW-", "BTC"])
+    data = [
+        {"market": market, "candle_date_time_utc": "2025-01-01T00:01:00", "trade_price": 2.0},
+        {"market": market, "candle_date_time_utc": "2025-01-01T00:00:00", "trade_price": 1.0},
+    ]
+    snapshot = [dict(item) for item in data]
+
+    series = CandleSeries()
+    series.merge(data)
+
+    assert data == snapshot
+    assert all(item["market"] is market for item in data)
+    assert [item["trade_price"] for item in series.newest(2)] == [2.0, 1.0]
+    assert series.newest(1)[0]["market"] == "KRW-BTC"
+
+INTERVAL = minute_interval(60)
+
+def run_gets(upbit, cache: CandleCache, *steps):
+    """steps: 캔들 개수 또는 캐시 항목을 받는 함수 (조회 사이에 상태를 바꿈)"""
+    async def main():
+        upbit.install()
+        results = []
+        for step in steps:
+            if callable(step):
+                step(cache._entries[("KRW-BTC", INTERVAL.name)])
+            else:
+                results.append(await cache.get(INTERVAL, "KRW-BTC", step))
+        return results
+
+    return asyncio.run(main())
+
+def test_live_candle_is_served_from_cache_until_ttl(upbit):
+    cache = CandleCache(live_ttl=0.05)
+
+    def wait(entry):
+        time.sleep(0.1)
+
+    first, second, third = run_gets(upbit, cache, 10, 10, wait, 10)
+    assert [call["count"] for call in upbit.candle_calls()] == ["10", "1"]
+    assert second == first
+    assert len(third) == 10
+
+def test_crossed_boundaries_fetch_only_new_candles(upbit):
+    cache = CandleCache()
+
+    def two_boundaries_ago(entry):
+        # 마지막 조회 뒤 캔들 경계를 두 번 넘은 상태
+        entry.final_before -= 2 * INTERVAL.seconds
+        entry.live_expires_at = float("inf")
+
+    first, second = run_gets(upbit, cache, 10, two_boundaries_ago, 10)
+    assert [call["count"] for call in upbit.candle_calls()] == ["10", "3"]
+    assert second == first
+
+def test_live_expiry_is_capped_at_candle_boundary(upbit, monkeypatch):
+    cache = CandleCache(live_ttl=5.0)
+    boundary = INTERVAL.floor(time.time()) + INTERVAL.seconds
+    upbit.candles[("KRW-BTC", INTERVAL.name)] = candle_rows("KRW-BTC", INTERVAL, 10, boundary - INTERVAL.seconds)
+    # 캔들 경계 1초 전
+    monkeypatch.setattr(time, "time", lambda: boundary - 1.0)
+
+    def check(entry):
+        assert entry.live_expires_at - time.monotonic() <= 1.0
+
+    run_gets(upbit, cache, 10, check)
+
+def test_larger_count_tops_up_and_smaller_count_is_a_hit(upbit):
+    cache = CandleCache()
+    small, large, again = run_gets(upbit, cache, 10, 30, 20)
+    assert [call["count"] for call in upbit.candle_calls()] == ["10", "30"]
+    assert large[:10] == small
+    assert again == large[:20]
+
+def test_short_history_is_not_refetched(upbit):
+    upbit.candles[("KRW-BTC", INTERVAL.name)] = candle_rows("KRW-BTC", INTERVAL, 5)
+    cache = CandleCache()
+    first, second = run_gets(upbit, cache, 10, 10)
+    assert len(first) == len(second) == 5
+    assert len(upbit.candle_calls()) == 1
+
+def test_merge_sorts_when_an_older_candle_arrives_late():
+    rows = candle_rows("KRW-BTC", INTERVAL, 5)
+    series = CandleSeries()
+    series.merge(rows[:2])
+    series.merge(rows[3:])
+    # 이미 보관 중인 최신 캔들보다 오래된 캔들이 섞인 응답
+    series.merge([rows[2]])
+    assert series.newest(5) == rows
+    assert list(series.candles) == sorted(series.candles)
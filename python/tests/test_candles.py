@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+import httpx
+
+from app.tools.market.candles import (
+    CANDLE_PAGE_SIZE, extend_descending, fetch_candle_history, format_to, minute_interval, parse_utc
+)
+from conftest import candle_rows
+
+INTERVAL = minute_interval(60)
+
+def fetch(upbit, count: int):
+    async def main():
+        upbit.install()
+        return await fetch_candle_history(INTERVAL, "KRW-BTC", count)
+
+    return asyncio.run(main())
+
+def candle_times(candles):
+    return [parse_utc(item["candle_date_time_utc"]) for item in candles]
+
+def test_pages_are_anchored_from_the_live_candle_end(upbit):
+    end = INTERVAL.floor(time.time())
+    upbit.candles[("KRW-BTC", INTERVAL.name)] = candle_rows("KRW-BTC", INTERVAL, 1000, end)
+    candles = fetch(upbit, 450)
+
+    anchor = end + INTERVAL.seconds
+    span = CANDLE_PAGE_SIZE * INTERVAL.seconds
+    calls = upbit.candle_calls()
+    assert sorted(call["to"] for call in calls) == sorted(format_to(anchor - i * span) for i in range(3))
+    assert all(call["count"] == str(CANDLE_PAGE_SIZE) for call in calls)
+    assert candle_times(candles) == [end - i * INTERVAL.seconds for i in range(450)]
+
+def test_small_count_is_a_single_request(upbit):
+    assert len(fetch(upbit, 50)) == 50
+    assert [call["count"] for call in upbit.candle_calls()] == ["50"]
+    assert "to" not in upbit.candle_calls()[0]
+
+def test_overlap_is_skipped_and_short_result_continues_from_oldest(upbit):
+    end = INTERVAL.floor(time.time())
+    # 거래 없는 캔들 500개: 뒤쪽 두 페이지가 같은 캔들을 받아 합쳐도 개수가 모자람
+    rows = candle_rows("KRW-BTC", INTERVAL, 1500, end, skip=tuple(range(100, 600)))
+    upbit.candles[("KRW-BTC", INTERVAL.name)] = rows
+    candles = fetch(upbit, 450)
+
+    assert candles == rows[:450]
+    # 병렬 3페이지 뒤, 그때까지 모은 가장 오래된 캔들부터 이어서 조회
+    calls = upbit.candle_calls()
+    assert len(calls) == 4
+    assert calls[-1]["to"] == format_to(parse_utc(rows[299]["candle_date_time_utc"]))
+
+def test_short_page_stops_at_start_of_history(upbit):
+    # 상장 직후라 300개뿐인 마켓
+    upbit.candles[("KRW-BTC", INTERVAL.name)] = candle_rows("KRW-BTC", INTERVAL, 300)
+    candles = fetch(upbit, 1000)
+
+    assert len(candles) == 300
+    assert len(upbit.candle_calls()) == 5
+
+def test_extend_descending_skips_boundary_overlap():
+    rows = candle_rows("KRW-BTC", INTERVAL, 10)
+    series = rows[:5]
+    assert extend_descending(series, rows[3:])
+    assert series == rows
+
+def test_extend_descending_rejects_out_of_order_page():
+    rows = candle_rows("KRW-BTC", INTERVAL, 10)
+    series = rows[:5]
+    assert not extend_descending(series, [rows[6], rows[5], rows[7]])
+    assert series == rows[:5]
+
+def test_out_of_order_pages_fall_back_to_sorting(upbit):
+    rows = candle_rows("KRW-BTC", INTERVAL, 1000)
+    handle = upbit.handle
+
+    async def ascending_pages(request):
+        # 페이지 안의 순서가 뒤집힌 응답
+        response = await handle(request)
+        return httpx.Response(200, json=response.json()[::-1])
+
+    upbit.handle = ascending_pages
+    upbit.candles[("KRW-BTC", INTERVAL.name)] = rows
+    assert fetch(upbit, 450) == rows[:450]
@@ -0,0 +1,76 @@
+import numpy as np
+
+from app.tools.market.compact import CompactSeries, decode_column, encode_column, price_codec
+
+MINUTE_MS = 60_000
+
+def tick_prices(ticks, exponent: int) -> np.ndarray:
+    """호가 단위 위의 가격 (업비트 JSON의 10진 문자열을 파싱한 것과 같은 float64)"""
+    return np.array([float(f"{tick}e{exponent}") for tick in ticks])
+
+def candle_columns(start: int, prices: np.ndarray) -> dict:
+    size = len(prices)
+    return {
+        "candle_time": (start + np.arange(size, dtype=np.int64)) * MINUTE_MS,
+        "opening_price": prices,
+        "high_price": prices,
+        "low_price": prices,
+        "trade_price": prices,
+        "candle_acc_trade_volume": tick_prices(range(size), -8),
+    }
+
+def test_price_codec_round_trips_tick_grid_bit_for_bit():
+    rng = np.random.default_rng(0)
+    for exponent in (3, 0, -1, -4, -8):
+        prices = tick_prices(rng.integers(1, 2 ** 24, 500), exponent)
+        codec = price_codec(prices)
+        assert codec[0] == "price"
+        decoded = decode_column(encode_column(prices, codec), codec)
+        assert np.array_equal(decoded.view(np.int64), prices.view(np.int64))
+
+def test_lossy_fallback_stays_within_float32_precision():
+    rng = np.random.default_rng(1)
+    # 10^e 배율로 2^24 안에 들어가지 않는 가격 (배율을 찾지 못한 마켓)
+    prices = rng.uniform(1e-3, 1e9, 500)
+    codec = price_codec(prices)
+    assert codec == ("lossy", None)
+    decoded = decode_column(encode_column(prices, codec), codec)
+    assert np.max(np.abs(decoded - prices) / prices) <= 2.0 ** -24
+
+def test_merge_trims_to_limit_and_replaces_live_candle():
+    series = CompactSeries.encode(candle_columns(0, tick_prices(range(100, 110), 3)))
+    # 진행 중이던 마지막 캔들(9)부터 새로 받은 5개
+    update = candle_columns(9, tick_prices(range(200, 205), 3))
+    merged = series.merge(update, limit=12)
+
+    assert len(merged) == 12
+    assert merged.codecs == series.codecs
+    decoded = merged.decode()
+    assert np.array_equal(decoded["candle_time"], np.arange(2, 14) * MINUTE_MS)
+    assert np.array_equal(decoded["trade_price"][-5:], update["trade_price"])
+    assert np.array_equal(decoded["trade_price"][:7], tick_prices(range(102, 109), 3))
+
+def test_merge_re_encodes_when_new_values_do_not_fit():
+    history = tick_prices(range(100, 110), 3)
+    series = CompactSeries.encode(candle_columns(0, history))
+    assert series.codecs["trade_price"] == ("price", 3)
+
+    # 호가 단위가 바뀌어 10^3 배율로 나누어떨어지지 않는 가격
+    update = candle_columns(10, tick_prices(range(1_000_005, 1_000_008), 2))
+    merged = series.merge(update, limit=12)
+
+    assert len(merged) == 12
+    assert merged.codecs["trade_price"] == ("price", 2)
+    decoded = merged.decode()
+    assert np.array_equal(decoded["candle_time"], np.arange(1, 13) * MINUTE_MS)
+    assert np.array_equal(decoded["trade_price"], np.concatenate((history[1:], update["trade_price"])))
+
+def test_minute_candle_takes_32_to_40_bytes():
+    prices = tick_prices(range(100, 200), 3)
+    # 거래대금·거래량이 모두 int32에 들어가는 경우
+    columns = dict(candle_columns(0, prices), candle_acc_trade_price=tick_prices(range(100), -2))
+    assert CompactSeries.encode(columns).nbytes == 32 * 100
+    # 둘 다 고정소수점으로 나타낼 수 없어 float64로 남는 경우
+    noise = np.random.default_rng(2).uniform(1, 1e9, 100)
+    columns = dict(columns, candle_acc_trade_price=noise, candle_acc_trade_volume=noise / 7)
+    assert CompactSeries.encode(columns).nbytes == 40 * 100
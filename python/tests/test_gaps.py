@@ -0,0 +1,57 @@
+import asyncio
+
+import numpy as np
+
+from app.tools.market.candles import minute_interval
+from app.tools.market.client import get_scheduler
+from app.tools.market.gaps import CandleGap, GapBackfiller, find_gaps
+from app.tools.market.store import CandleStore
+from conftest import candle_rows
+
+INTERVAL = minute_interval(1)
+STEP = INTERVAL.seconds * 1000
+
+def test_find_gaps_reports_missing_ranges():
+    times = np.array([0, 1, 2, 5, 6, 9], dtype=np.int64) * STEP
+    gaps = find_gaps(times, INTERVAL)
+    assert gaps == [CandleGap(3 * STEP, 5 * STEP, STEP), CandleGap(7 * STEP, 9 * STEP, STEP)]
+    assert [gap.missing for gap in gaps] == [2, 2]
+    assert find_gaps(np.arange(5, dtype=np.int64) * STEP, INTERVAL) == []
+
+def test_find_gaps_subtracts_verified_ranges():
+    times = np.array([0, 10, 20], dtype=np.int64) * STEP
+    # 첫 구멍은 끝 쪽 절반만 확인, 두 번째 구멍은 모두 확인
+    verified = [(6 * STEP, 10 * STEP), (11 * STEP, 20 * STEP)]
+    assert find_gaps(times, INTERVAL, verified) == [CandleGap(STEP, 6 * STEP, STEP)]
+
+def seed_store(store: CandleStore, upbit, market_code: str) -> None:
+    rows = candle_rows(market_code, INTERVAL, 20)
+    upbit.candles[(market_code, INTERVAL.name)] = rows
+    store.upsert(INTERVAL, market_code, [row for index, row in enumerate(rows) if index not in (5, 6, 7)])
+
+def test_failing_series_does_not_block_others(upbit):
+    store = CandleStore(":memory:")
+    seed_store(store, upbit, "KRW-BTC")
+    seed_store(store, upbit, "KRW-ETH")
+    # 상장 폐지 등으로 한 마켓만 오류 응답
+    upbit.errors["KRW-BTC"] = 404
+
+    async def main():
+        upbit.install()
+        return await GapBackfiller(store).run_once()
+
+    assert asyncio.run(main()) == 1
+    assert len(find_gaps(store.read_times(INTERVAL, "KRW-ETH"), INTERVAL)) == 0
+    assert len(find_gaps(store.read_times(INTERVAL, "KRW-BTC"), INTERVAL)) == 1
+
+def test_scan_moves_on_when_budget_is_exhausted(upbit, monkeypatch):
+    store = CandleStore(":memory:")
+    seed_store(store, upbit, "KRW-BTC")
+
+    async def main():
+        upbit.install()
+        monkeypatch.setattr(get_scheduler(), "try_acquire", lambda group, reserve=0.0: False)
+        return await asyncio.wait_for(GapBackfiller(store).run_once(), 1.0)
+
+    assert asyncio.run(main()) == 0
+    assert upbit.calls == []
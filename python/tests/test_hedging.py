@@ -0,0 +1,82 @@
+import asyncio
+
+import httpx
+import pytest
+
+import app.tools.market.client as client
+from app.tools.market.client import fetch_json, get_latency_tracker, get_scheduler
+from app.tools.market.hedging import HedgePolicy, LatencyTracker
+
+PARAMS = {"market": "KRW-BTC", "count": 1}
+
+def test_hedge_delay_needs_samples_and_is_clamped():
+    tracker = LatencyTracker()
+    policy = HedgePolicy(min_samples=3, min_delay=0.05, max_delay=2.0)
+    tracker.record("candles", 0.01)
+    tracker.record("candles", 0.01)
+    assert tracker.hedge_delay("candles", policy) is None
+    tracker.record("candles", 0.01)
+    assert tracker.hedge_delay("candles", policy) == 0.05
+    for _ in range(100):
+        tracker.record("candles", 10.0)
+    assert tracker.hedge_delay("candles", policy) == 2.0
+    assert tracker.hedge_delay("candles", HedgePolicy(enabled=False)) is None
+
+def fetch_slowly(upbit, monkeypatch, tokens: bool):
+    upbit.delay = 0.2
+
+    async def main():
+        upbit.install()
+        # 평소 응답은 빠름 → 헤지 대기 시간은 min_delay
+        for _ in range(HedgePolicy().min_samples):
+            get_latency_tracker().record("candles", 0.001)
+        monkeypatch.setattr(get_scheduler(), "try_acquire", lambda group, reserve=0.0: tokens)
+        return await fetch_json("candles", "/v1/candles/minutes/1", PARAMS)
+
+    return asyncio.run(main())
+
+def test_slow_request_is_hedged_when_a_token_is_free(upbit, monkeypatch):
+    assert len(fetch_slowly(upbit, monkeypatch, tokens=True)) == 1
+    assert len(upbit.candle_calls()) == 2
+
+def test_no_hedge_without_a_free_token(upbit, monkeypatch):
+    assert len(fetch_slowly(upbit, monkeypatch, tokens=False)) == 1
+    assert len(upbit.candle_calls()) == 1
+
+def respond_with(upbit, monkeypatch, statuses):
+    """statuses 순서대로 오류를 돌려준 뒤 정상 응답"""
+    handle = upbit.handle
+
+    async def flaky(request):
+        if statuses:
+            upbit.calls.append((request.url.path, dict(request.url.params)))
+            return httpx.Response(statuses.pop(0))
+        return await handle(request)
+
+    monkeypatch.setattr(upbit, "handle", flaky)
+    monkeypatch.setattr(client, "backoff_delay", lambda attempt: 0.0)
+
+def fetch(upbit):
+    async def main():
+        upbit.install()
+        return await fetch_json("candles", "/v1/candles/minutes/1", PARAMS)
+
+    return asyncio.run(main())
+
+def test_transient_errors_are_retried(upbit, monkeypatch):
+    respond_with(upbit, monkeypatch, [503, 429])
+    assert len(fetch(upbit)) == 1
+    assert len(upbit.candle_calls()) == 3
+
+def test_retries_are_bounded(upbit, monkeypatch):
+    monkeypatch.setattr(client, "MAX_RETRIES", 2)
+    respond_with(upbit, monkeypatch, [503] * 10)
+    with pytest.raises(httpx.HTTPStatusError):
+        fetch(upbit)
+    assert len(upbit.candle_calls()) == 3
+
+def test_client_errors_are_not_retried(upbit, monkeypatch):
+    respond_with(upbit, monkeypatch, [404])
+    with pytest.raises(httpx.HTTPStatusError):
+        fetch(upbit)
+    assert len(upbit.candle_calls()) == 1
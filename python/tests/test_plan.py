@@ -0,0 +1,33 @@
+import asyncio
+
+from app.tools.analyze import AnalysisConfig, FetchPlan, analyze_blockchain_mareket, plan_fetch
+from app.tools.market.candles import MAX_CANDLE_COUNT
+
+def test_default_config_plan():
+    assert plan_fetch(AnalysisConfig()) == FetchPlan(daily_count=200, minute_count=48, weekly_count=8, derive_weekly=True)
+
+def test_longer_indicator_window_grows_daily_count():
+    assert plan_fetch(AnalysisConfig(ma_long=400)).daily_count == 400
+
+def test_explicit_counts_are_used_as_is():
+    plan = plan_fetch(AnalysisConfig(daily_count=100, minute_count=10, weekly_count=3))
+    assert (plan.daily_count, plan.minute_count, plan.weekly_count) == (100, 10, 3)
+    assert plan.derive_weekly
+    assert plan_fetch(AnalysisConfig(daily_count=10 ** 6)).daily_count == MAX_CANDLE_COUNT
+
+def test_weekly_is_fetched_when_daily_does_not_cover_it():
+    # 지정한 일봉 개수가 8주를 덮지 못함
+    assert not plan_fetch(AnalysisConfig(daily_count=30)).derive_weekly
+    # 40주를 덮으려면 일봉 페이지가 늘어남
+    plan = plan_fetch(AnalysisConfig(weekly_count=40))
+    assert not plan.derive_weekly
+    assert plan.daily_count == 200
+
+def test_analysis_fetches_planned_counts(upbit):
+    async def main():
+        upbit.install()
+        await analyze_blockchain_mareket(AnalysisConfig(minute_count=20))
+
+    asyncio.run(main())
+    counts = {path: params["count"] for path, params in upbit.calls if path.startswith("/v1/candles/")}
+    assert counts == {"/v1/candles/days": "200", "/v1/candles/minutes/30": "20"}
@@ -0,0 +1,106 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.tools.market.candles import CANDLE_PRICE_FIELDS, DAY_INTERVAL, WEEK_INTERVAL, minute_interval
+from app.tools.market.resample import (
+    KST_DAY_INTERVAL, KST_WEEK_INTERVAL, base_interval, custom_interval, resample_columns
+)
+
+HOUR = minute_interval(60)
+
+def utc(text: str) -> int:
+    return int(datetime.fromisoformat(text).replace(tzinfo=timezone.utc).timestamp())
+
+def random_columns(start: int, step: int, size: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    opening = rng.uniform(90, 110, size)
+    closing = rng.uniform(90, 110, size)
+    columns = {
+        "candle_time": (start + np.arange(size, dtype=np.int64) * step) * 1000,
+        "opening_price": opening,
+        "high_price": np.maximum(opening, closing) + rng.uniform(0, 5, size),
+        "low_price": np.minimum(opening, closing) - rng.uniform(0, 5, size),
+        "trade_price": closing,
+        "candle_acc_trade_price": rng.uniform(1e6, 1e7, size),
+        "candle_acc_trade_volume": rng.uniform(1, 10, size),
+    }
+    return columns
+
+def test_kst_intervals_start_at_kst_midnight_and_monday():
+    # 2024-01-01(월) 00:00 KST = 2023-12-31 15:00 UTC
+    monday = utc("2023-12-31T15:00:00")
+    assert KST_DAY_INTERVAL.floor(monday + 86399) == monday
+    assert KST_DAY_INTERVAL.floor(monday - 1) == monday - 86400
+    assert KST_WEEK_INTERVAL.floor(monday + 6 * 86400) == monday
+    assert KST_WEEK_INTERVAL.floor(monday - 1) == monday - 7 * 86400
+    for spec, interval in (("1d", KST_DAY_INTERVAL), ("1w", KST_WEEK_INTERVAL)):
+        assert custom_interval(spec, kst=True).offset == interval.offset
+    # 4시간봉은 00, 04, 08 ... KST (15, 19, 23 ... UTC)
+    assert custom_interval("4h", kst=True).floor(utc("2024-01-01T16:30:00")) == utc("2024-01-01T15:00:00")
+    # UTC 주봉은 업비트 주봉과 같은 월요일 00:00 UTC 경계
+    assert custom_interval("1w").offset == WEEK_INTERVAL.offset
+
+@pytest.mark.parametrize("spec", ["0h", "2x", "h", ""])
+def test_custom_interval_rejects_bad_spec(spec):
+    with pytest.raises(ValueError):
+        custom_interval(spec)
+
+def test_hourly_to_kst_four_hours_drops_partial_head():
+    target = custom_interval("4h", kst=True)
+    assert base_interval(target) == HOUR
+    # 14:00 UTC(23:00 KST)부터: 첫 1시간은 구간 중간이라 버림
+    start = utc("2024-01-01T14:00:00")
+    columns = random_columns(start, 3600, 1 + 4 * 3)
+    result = resample_columns(columns, HOUR, target)
+
+    assert result["candle_time"].tolist() == [(start + 3600 + i * 4 * 3600) * 1000 for i in range(3)]
+    group = slice(1, 5)
+    assert result["opening_price"][0] == columns["opening_price"][1]
+    assert result["trade_price"][0] == columns["trade_price"][4]
+    assert result["high_price"][0] == columns["high_price"][group].max()
+    assert result["low_price"][0] == columns["low_price"][group].min()
+    assert result["candle_acc_trade_volume"][0] == pytest.approx(columns["candle_acc_trade_volume"][group].sum())
+
+    kept = resample_columns(columns, HOUR, target, drop_partial_head=False)
+    assert kept["candle_time"][0] == utc("2024-01-01T11:00:00") * 1000
+    assert len(resample_columns(columns, HOUR, target, count=2)["candle_time"]) == 2
+
+def test_daily_to_weekly_matches_pandas():
+    # 2024-01-03(수)부터 10주: 첫 주는 월요일부터가 아니라 버림
+    start = utc("2024-01-03T00:00:00")
+    columns = random_columns(start, 86400, 70, seed=1)
+    result = resample_columns(columns, DAY_INTERVAL, WEEK_INTERVAL)
+
+    frame = pd.DataFrame(
+        {name: columns[name] for name in CANDLE_PRICE_FIELDS},
+        index=pd.to_datetime(columns["candle_time"], unit="ms"),
+    )
+    frame = frame[frame.index >= pd.Timestamp("2024-01-08")]
+    expected = frame.resample("W-MON", label="left", closed="left").agg({
+        "opening_price": "first", "high_price": "max", "low_price": "min", "trade_price": "last",
+        "candle_acc_trade_price": "sum", "candle_acc_trade_volume": "sum",
+    })
+    assert result["candle_time"].tolist() == [int(ts.timestamp()) * 1000 for ts in expected.index]
+    for name in CANDLE_PRICE_FIELDS:
+        np.testing.assert_allclose(result[name], expected[name].to_numpy())
+
+def test_resampling_to_days_fills_previous_close():
+    columns = random_columns(utc("2024-01-01T00:00:00"), 3600, 72, seed=2)
+    result = resample_columns(columns, HOUR, DAY_INTERVAL)
+    close = result["trade_price"]
+    # 입력 첫 구간의 전일 종가는 알 수 없으므로 시가로 둠
+    assert result["prev_closing_price"].tolist() == [result["opening_price"][0], close[0], close[1]]
+    np.testing.assert_allclose(result["change_price"], close - result["prev_closing_price"])
+
+def test_misaligned_target_is_rejected():
+    with pytest.raises(ValueError):
+        resample_columns(random_columns(0, 86400, 3), DAY_INTERVAL, custom_interval("2h"))
+
+def test_base_interval_respects_kst_boundaries():
+    assert base_interval(custom_interval("3d")) == DAY_INTERVAL
+    # KST 자정(15:00 UTC)은 4시간봉 경계가 아니므로 1시간봉에서 묶음
+    assert base_interval(KST_DAY_INTERVAL) == HOUR
+    assert base_interval(custom_interval("7m")) == minute_interval(1)
@@ -0,0 +1,99 @@
+import asyncio
+
+import numpy as np
+
+from app.tools.market.candles import CANDLE_PRICE_FIELDS, minute_interval
+from app.tools.market.ringbuffer import CandleRing, get_ring_registry
+
+INTERVAL = minute_interval(1)
+STEP = INTERVAL.seconds * 1000
+
+def candle(price: float) -> dict:
+    return {field: price for field in CANDLE_PRICE_FIELDS}
+
+def seed_columns(count: int) -> dict:
+    columns = {"candle_time": np.arange(count, dtype=np.int64) * STEP}
+    for field in CANDLE_PRICE_FIELDS:
+        columns[field] = np.arange(count, dtype=np.float64)
+    return columns
+
+def test_view_is_contiguous_after_wraparound():
+    ring = CandleRing(INTERVAL, capacity=4)
+    for i in range(10):
+        ring.update(i * STEP, candle(float(i)))
+        for count in range(1, len(ring) + 1):
+            view = ring.view(count)
+            assert view["candle_time"].flags["C_CONTIGUOUS"]
+            # 최근 count개가 시간순
+            assert view["candle_time"].tolist() == [t * STEP for t in range(i + 1 - count, i + 1)]
+            assert view["trade_price"].tolist() == [float(t) for t in range(i + 1 - count, i + 1)]
+    assert len(ring) == 4
+    assert ring.view(10)["candle_time"].tolist() == [6 * STEP, 7 * STEP, 8 * STEP, 9 * STEP]
+
+def test_update_overwrites_live_candle_and_ignores_older():
+    ring = CandleRing(INTERVAL, capacity=3)
+    ring.update(0, candle(1.0))
+    ring.update(STEP, candle(2.0))
+    ring.update(STEP, candle(3.0))
+    ring.update(0, candle(9.0))
+    assert len(ring) == 2
+    assert ring.view()["trade_price"].tolist() == [1.0, 3.0]
+
+def test_trades_accumulate_then_roll_over():
+    ring = CandleRing(INTERVAL, capacity=3)
+    ring.load(seed_columns(3))
+    # 진행 중인 캔들(2) 갱신
+    ring.apply_trade(2 * STEP + 10, 5.0, 1.0)
+    ring.apply_trade(2 * STEP + 20, 1.0, 2.0)
+    view = ring.view()
+    assert view["high_price"][-1] == 5.0
+    assert view["low_price"][-1] == 1.0
+    assert view["trade_price"][-1] == 1.0
+    assert view["candle_acc_trade_volume"][-1] == 2.0 + 3.0
+    assert view["candle_acc_trade_price"][-1] == 2.0 + 5.0 + 2.0
+
+    # 다음 분의 체결: 가장 오래된 캔들(0)을 밀어내고 새 캔들 시작
+    ring.apply_trade(3 * STEP, 7.0, 0.5)
+    view = ring.view()
+    assert view["candle_time"].tolist() == [STEP, 2 * STEP, 3 * STEP]
+    assert view["opening_price"][-1] == 7.0
+    assert view["candle_acc_trade_volume"][-1] == 0.5
+    # 이미 넘어간 캔들의 늦은 체결은 무시
+    ring.apply_trade(STEP + 5, 100.0, 1.0)
+    assert ring.view()["high_price"].max() == 7.0
+
+def test_trades_during_seed_are_replayed_after_load():
+    ring = CandleRing(INTERVAL, capacity=4)
+    trades = ring.begin_seed()
+    # REST 조회 중에 들어온 체결 (진행 중인 캔들 2와 다음 캔들 3)
+    ring.apply_trade(2 * STEP + 1, 10.0, 1.0)
+    ring.apply_trade(3 * STEP + 1, 11.0, 1.0)
+    ring.load(seed_columns(3), trades)
+
+    view = ring.view()
+    assert view["candle_time"].tolist() == [0, STEP, 2 * STEP, 3 * STEP]
+    assert view["high_price"][2] == 10.0
+    assert view["candle_acc_trade_volume"][2] == 2.0 + 1.0
+    assert view["opening_price"][3] == 11.0
+
+    # 적재가 끝난 뒤에는 더 모으지 않음
+    ring.apply_trade(3 * STEP + 2, 12.0, 1.0)
+    assert trades == [(2 * STEP + 1, 10.0, 1.0), (3 * STEP + 1, 11.0, 1.0)]
+
+def test_abandoned_seed_stops_collecting():
+    ring = CandleRing(INTERVAL, capacity=4)
+    trades = ring.begin_seed()
+    ring.end_seed(trades)
+    ring.apply_trade(STEP, 1.0, 1.0)
+    assert trades == []
+
+def test_registry_is_per_event_loop():
+    async def main():
+        registry = get_ring_registry()
+        assert get_ring_registry() is registry
+        registry.track(INTERVAL, "KRW-BTC")
+        return registry
+
+    first = asyncio.run(main())
+    second = asyncio.run(main())
+    assert first is not second
@@ -0,0 +1,80 @@
+from dataclasses import FrozenInstanceError, asdict
+
+import numpy as np
+import pytest
+
+from app.schemas.candle import CandleBatch, DailyCandleStick, MinuteCandleStick, WeeklyCandleStick, is_ascending
+from app.schemas.ticker import Ticker
+from app.tools.market.candles import DAY_INTERVAL
+from conftest import candle_row, candle_rows
+
+SCHEMAS = (MinuteCandleStick, DailyCandleStick, WeeklyCandleStick, Ticker)
+
+def full_row(cls) -> dict:
+    """모든 필드가 알맞은 타입으로 채워진 업비트 응답"""
+    row = candle_row("KRW-BTC", DAY_INTERVAL, 1735689600, 100000000.0)
+    row.update(first_day_of_period="2025-01-01", trade_price=100500000.0, change="RISE",
+               trade_date="20250101", trade_time="000000", trade_timestamp=1735689600000)
+    return asdict(cls.from_dict(row))
+
+@pytest.mark.parametrize("cls", SCHEMAS)
+def test_fast_path_matches_from_dict_on_full_rows(cls, monkeypatch):
+    row = full_row(cls)
+    expected = cls.from_dict(row)
+    # 모든 필드가 있으면 from_dict를 거치지 않음
+    monkeypatch.setattr(cls, "from_dict", classmethod(lambda cls, data: pytest.fail("from_dict called")))
+    built = cls.from_upbit(row)
+    assert type(built) is cls
+    assert built == expected
+    assert hash(built) == hash(expected)
+    with pytest.raises(FrozenInstanceError):
+        built.market = "KRW-ETH"
+
+@pytest.mark.parametrize("cls", SCHEMAS)
+@pytest.mark.parametrize("change", [
+    {"trade_price": None},
+    {"trade_price": "100.5"},
+    {"timestamp": True},
+    {"timestamp": 1.5},
+    {"market": None},
+])
+def test_partial_or_mistyped_rows_go_through_from_dict(cls, change):
+    row = {**full_row(cls), **change}
+    try:
+        expected = cls.from_dict(row)
+    except (TypeError, ValueError) as e:
+        # 변환할 수 없는 값은 from_dict와 같은 예외
+        with pytest.raises(type(e)):
+            cls.from_upbit(row)
+        return
+    built = cls.from_upbit(row)
+    assert built == expected
+    assert all(type(value) is not bool for value in asdict(built).values())
+
+@pytest.mark.parametrize("cls", SCHEMAS)
+def test_missing_field_goes_through_from_dict(cls):
+    row = full_row(cls)
+    del row["trade_price"]
+    assert cls.from_upbit(row) == cls.from_dict(row)
+
+def test_integer_json_numbers_are_accepted_for_float_fields():
+    row = {**full_row(MinuteCandleStick), "trade_price": 100}
+    assert MinuteCandleStick.from_upbit(row).trade_price == 100
+
+def test_is_ascending():
+    assert is_ascending(np.array([], dtype=np.int64))
+    assert is_ascending(np.array([1, 2, 2, 3]))
+    assert not is_ascending(np.array([1, 3, 2]))
+
+def test_candle_batch_reads_newest_first_without_sorting():
+    rows = candle_rows("KRW-BTC", DAY_INTERVAL, 5)
+    batch = CandleBatch.from_upbit(rows)
+    assert batch.trade_price.tolist() == [row["trade_price"] for row in reversed(rows)]
+    assert is_ascending(batch.candle_time)
+
+def test_candle_batch_sorts_out_of_order_rows():
+    rows = candle_rows("KRW-BTC", DAY_INTERVAL, 5)
+    shuffled = [rows[i] for i in (2, 0, 4, 1, 3)]
+    batch = CandleBatch.from_upbit(shuffled)
+    assert batch.trade_price.tolist() == [row["trade_price"] for row in reversed(rows)]
+    assert np.array_equal(batch.candle_time, CandleBatch.from_upbit(rows).candle_time)
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from app.tools.market.client import fetch_json
+from app.tools.market.singleflight import SingleFlight, request_key
+
+def test_concurrent_identical_requests_share_one_call():
+    calls = []
+
+    async def main():
+        flight = SingleFlight()
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"value": 1}
+
+        results = await asyncio.gather(*(flight.do("key", fn) for _ in range(5)))
+        assert all(result is results[0] for result in results)
+        assert flight.inflight() == 0
+        # 끝난 뒤의 호출은 새로 요청
+        await flight.do("key", fn)
+
+    asyncio.run(main())
+    assert len(calls) == 2
+
+def test_cancelled_caller_does_not_cancel_shared_request():
+    async def main():
+        flight = SingleFlight()
+        started = asyncio.Event()
+
+        async def fn():
+            started.set()
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.create_task(flight.do("key", fn))
+        second = asyncio.create_task(flight.do("key", fn))
+        await started.wait()
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert await second == "done"
+
+    asyncio.run(main())
+
+def test_errors_propagate_to_every_waiter():
+    async def main():
+        flight = SingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream")
+
+        results = await asyncio.gather(flight.do("key", fn), flight.do("key", fn), return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.inflight() == 0
+
+    asyncio.run(main())
+
+def test_request_key_ignores_parameter_order():
+    assert request_key("/v1/ticker", {"a": 1, "b": 2}) == request_key("/v1/ticker", {"b": 2, "a": 1})
+    assert request_key("/v1/ticker", {"a": 1}) != request_key("/v1/ticker", {"a": 2})
+
+def test_fetch_json_coalesces_upstream_calls(upbit):
+    upbit.delay = 0.02
+
+    async def main():
+        upbit.install()
+        params = {"market": "KRW-BTC", "count": 10}
+        return await asyncio.gather(*(fetch_json("candles", "/v1/candles/minutes/1", params) for _ in range(3)))
+
+    results = asyncio.run(main())
+    assert len(upbit.candle_calls()) == 1
+    assert results[0] is results[1] is results[2]
@@ -0,0 +1,50 @@
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from app.tools.market.cache import get_candle_cache
+from app.tools.market.candles import minute_interval
+from app.tools.market.snapshot import CacheSnapshotter, create_cache_snapshotter
+
+INTERVAL = minute_interval(1)
+
+def test_snapshots_are_opt_in(monkeypatch):
+    monkeypatch.delenv("CACHE_SNAPSHOT_PATH")
+    assert create_cache_snapshotter() is None
+
+def test_concurrent_writers_do_not_share_a_temp_file(tmp_path):
+    path = str(tmp_path / "snapshot.json")
+    writers = [CacheSnapshotter(path) for _ in range(4)]
+
+    def write(index):
+        for round in range(20):
+            writers[index]._write({"writer": index, "round": round, "padding": "x" * 10000})
+
+    with ThreadPoolExecutor(len(writers)) as pool:
+        list(pool.map(write, range(len(writers))))
+
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["round"] == 19
+    assert os.listdir(tmp_path) == ["snapshot.json"]
+
+def test_save_and_restore_candle_cache(tmp_path, upbit):
+    path = str(tmp_path / "snapshot.json")
+
+    async def first():
+        upbit.install()
+        await get_candle_cache().get(INTERVAL, "KRW-BTC", 50)
+        await CacheSnapshotter(path).save()
+
+    async def second():
+        upbit.install()
+        await CacheSnapshotter(path).restore()
+        upbit.calls.clear()
+        candles = await get_candle_cache().get(INTERVAL, "KRW-BTC", 50)
+        return candles, upbit.candle_calls()
+
+    asyncio.run(first())
+    candles, calls = asyncio.run(second())
+    assert len(candles) == 50
+    # 복원한 뒤에는 진행 중이던 캔들 이후 구간만 받아옴
+    assert all(int(call["count"]) <= 2 for call in calls)
@@ -0,0 +1,152 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("websockets")
+from websockets.asyncio.server import serve
+
+from app.schemas.ticker import Ticker
+from app.tools.market.stream import create_ticker_stream
+
+MARKET = "KRW-BTC"
+
+TICKER_FRAME = {
+    "type": "ticker",
+    "code": MARKET,
+    "opening_price": 100000000.0,
+    "high_price": 101000000.0,
+    "low_price": 99000000.0,
+    "trade_price": 100500000.0,
+    "prev_closing_price": 100000000.0,
+    "change": "RISE",
+    "change_price": 500000.0,
+    "change_rate": 0.005,
+    "signed_change_price": 500000.0,
+    "signed_change_rate": 0.005,
+    "trade_volume": 0.01,
+    "acc_trade_price": 1000000000.0,
+    "acc_trade_price_24h": 2000000000.0,
+    "acc_trade_volume": 10.0,
+    "acc_trade_volume_24h": 20.0,
+    "highest_52_week_price": 150000000.0,
+    "highest_52_week_date": "2025-03-01",
+    "lowest_52_week_price": 50000000.0,
+    "lowest_52_week_date": "2024-08-05",
+    "trade_date": "20250101",
+    "trade_time": "000000",
+    "trade_timestamp": 1735689600000,
+    "timestamp": 1735689600100,
+}
+
+TRADE_FRAME = {
+    "type": "trade",
+    "code": MARKET,
+    "trade_price": 99800000.0,
+    "trade_volume": 0.5,
+    "trade_date": "2025-01-01",
+    "trade_time": "00:00:05",
+    "trade_timestamp": 1735689605000,
+    "timestamp": 1735689605100,
+}
+
+async def wait_for(condition, timeout: float = 5.0) -> None:
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+class StandIn:
+    """업비트 웹소켓 대체 서버 (구독 메시지를 받으면 frames를 보내고 close_event까지 연결 유지)"""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.subscriptions = []
+        self.send_event = asyncio.Event()
+        self.close_event = asyncio.Event()
+
+    async def handler(self, websocket) -> None:
+        self.subscriptions.append(json.loads(await websocket.recv()))
+        for frame in self.frames:
+            await self.send_event.wait()
+            self.send_event.clear()
+            await websocket.send(json.dumps(frame).encode())
+        await self.close_event.wait()
+
+def run_with_stream(monkeypatch, frames, scenario) -> None:
+    async def main():
+        stand_in = StandIn(frames)
+        async with serve(stand_in.handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            monkeypatch.setenv("UPBIT_STREAM_MARKETS", MARKET)
+            monkeypatch.setenv("UPBIT_WEBSOCKET_URL", f"ws://127.0.0.1:{port}")
+            stream = create_ticker_stream()
+            stream.start()
+            try:
+                await scenario(stream, stand_in)
+            finally:
+                stand_in.close_event.set()
+                await stream.stop()
+
+    asyncio.run(main())
+
+def test_ticker_frame_produces_ticker(monkeypatch):
+    async def scenario(stream, stand_in):
+        await wait_for(lambda: stream.connected and stand_in.subscriptions)
+        assert stand_in.subscriptions[0][1] == {"type": "ticker", "codes": [MARKET]}
+        assert stream.latest(MARKET) is None
+
+        stand_in.send_event.set()
+        await wait_for(lambda: MARKET in stream.tickers)
+        ticker = stream.latest(MARKET)
+        assert isinstance(ticker, Ticker)
+        assert ticker.market == MARKET
+        assert ticker.trade_price == 100500000.0
+        # KST 거래 일시는 trade_timestamp로 계산
+        assert (ticker.trade_date_kst, ticker.trade_time_kst) == ("20250101", "090000")
+
+    run_with_stream(monkeypatch, [TICKER_FRAME], scenario)
+
+def test_trade_frame_updates_ticker(monkeypatch):
+    async def scenario(stream, stand_in):
+        stand_in.send_event.set()
+        await wait_for(lambda: MARKET in stream.tickers)
+        before = stream.latest(MARKET)
+
+        stand_in.send_event.set()
+        await wait_for(lambda: stream.tickers[MARKET].trade_price != before.trade_price)
+        ticker = stream.latest(MARKET)
+        assert ticker.trade_price == 99800000.0
+        assert ticker.trade_volume == 0.5
+        assert ticker.acc_trade_volume == before.acc_trade_volume + 0.5
+        assert ticker.low_price == before.low_price
+        assert ticker.change == "FALL"
+        assert ticker.signed_change_price == pytest.approx(-200000.0)
+        assert (ticker.trade_date, ticker.trade_time) == ("20250101", "000005")
+        assert ticker.trade_timestamp == 1735689605000
+
+    run_with_stream(monkeypatch, [TICKER_FRAME, TRADE_FRAME], scenario)
+
+def test_latest_expires_after_max_age(monkeypatch):
+    async def scenario(stream, stand_in):
+        stand_in.send_event.set()
+        await wait_for(lambda: MARKET in stream.tickers)
+        assert stream.latest(MARKET) is not None
+
+        stream.updated_at[MARKET] -= stream.max_age + 1
+        assert stream.latest(MARKET) is None
+
+    run_with_stream(monkeypatch, [TICKER_FRAME], scenario)
+
+def test_latest_is_none_after_disconnect(monkeypatch):
+    async def scenario(stream, stand_in):
+        stand_in.send_event.set()
+        await wait_for(lambda: MARKET in stream.tickers)
+        assert stream.latest(MARKET) is not None
+
+        # 대체 서버가 연결을 끊으면 재연결 전까지 메모리 값으로 응답하지 않음
+        stand_in.close_event.set()
+        await wait_for(lambda: not stream.connected)
+        assert stream.latest(MARKET) is None
+
+    run_with_stream(monkeypatch, [TICKER_FRAME], scenario)
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from app.tools.analyze import data_freshness
+from app.tools.market.swr import SWR_MAX_STALE, StaleWhileRevalidate
+
+class Fetcher:
+    def __init__(self, *values):
+        self.values = list(values)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        value = self.values.pop(0)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+def test_fresh_value_is_served_without_fetching():
+    async def main():
+        swr = StaleWhileRevalidate(fresh_ttl=5, max_stale=60, max_stale_on_error=3600)
+        fetch = Fetcher("first")
+        assert await swr.get("key", fetch) == ("first", 0.0)
+        value, age = await swr.get("key", fetch)
+        assert value == "first" and age < 5
+        assert fetch.calls == 1
+
+    run(main())
+
+def test_stale_value_is_served_while_revalidating():
+    async def main():
+        swr = StaleWhileRevalidate(fresh_ttl=5, max_stale=60, max_stale_on_error=3600)
+        swr.put("key", "old", age=10)
+        fetch = Fetcher("new")
+        value, age = await swr.get("key", fetch)
+        assert value == "old" and age >= 10
+        # 백그라운드 갱신이 끝나면 새 값
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert fetch.calls == 1
+        assert (await swr.get("key", fetch))[0] == "new"
+
+    run(main())
+
+def test_expired_value_waits_for_refresh():
+    async def main():
+        swr = StaleWhileRevalidate(fresh_ttl=5, max_stale=60, max_stale_on_error=3600)
+        swr.put("key", "old", age=120)
+        assert await swr.get("key", Fetcher("new")) == ("new", 0.0)
+
+    run(main())
+
+def test_error_falls_back_to_last_value_within_limit():
+    async def main():
+        swr = StaleWhileRevalidate(fresh_ttl=5, max_stale=60, max_stale_on_error=3600)
+        swr.put("key", "old", age=120)
+        value, age = await swr.get("key", Fetcher(RuntimeError("down")))
+        assert value == "old" and age >= 120
+
+        swr.entries.clear()
+        swr.put("key", "ancient", age=7200)
+        with pytest.raises(RuntimeError):
+            await swr.get("key", Fetcher(RuntimeError("down")))
+
+    run(main())
+
+def test_concurrent_refreshes_are_shared():
+    async def main():
+        swr = StaleWhileRevalidate(fresh_ttl=5, max_stale=60, max_stale_on_error=3600)
+        fetch = Fetcher("value")
+
+        async def slow():
+            await asyncio.sleep(0.01)
+            return await fetch()
+
+        results = await asyncio.gather(*(swr.get("key", slow) for _ in range(5)))
+        assert [value for value, _ in results] == ["value"] * 5
+        assert fetch.calls == 1
+
+    run(main())
+
+def test_data_freshness_marks_only_fallback_data_stale():
+    async def main():
+        return data_freshness(10.0), data_freshness(SWR_MAX_STALE + 1)
+
+    revalidating, fallback = run(main())
+    assert revalidating["stale"] is False
+    assert fallback["stale"] is True
+    assert revalidating["max_age_seconds"] >= revalidating["age_seconds"]